@@ -7,6 +7,8 @@ import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from helpers.indicators import compute_rsi
+
 def load_data(path):
     df = pd.read_csv(path, thousands=',')
     df.columns = df.columns.str.strip()
@@ -19,14 +21,8 @@ def compute_indicators(df, fast, slow, rsi_period):
     # SMAs
     df['SMA_fast'] = df['Close'].rolling(window=fast, min_periods=1).mean()
     df['SMA_slow'] = df['Close'].rolling(window=slow, min_periods=1).mean()
-    # RSI
-    delta = df['Close'].diff()
-    gain  = delta.clip(lower=0)
-    loss  = -delta.clip(upper=0)
-    avg_gain = gain.rolling(window=rsi_period, min_periods=rsi_period).mean()
-    avg_loss = loss.rolling(window=rsi_period, min_periods=rsi_period).mean()
-    rs = avg_gain / avg_loss
-    df['RSI'] = 100 - (100 / (1 + rs))
+    # RSI (Cutler's: plain mean of gains and losses)
+    df['RSI'] = compute_rsi(df['Close'], rsi_period, method='cutler')
     return df
 
 def generate_signals(df, rsi_oversold, rsi_overbought):
@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
+import argparse
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-
-def load_data(path='scrip.csv'):
-    df = pd.read_csv(path, thousands=',')
-    df.columns = df.columns.str.strip()
-    df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%Y')
-    df.set_index('Date', inplace=True)
-    df.rename(columns={'Close Price':'Close'}, inplace=True)
-    return df
+from helpers.indicators import sma_grid
+from helpers.nse_store import load_data
 
 def generate_signals(df, fast=20, slow=50):
     df['SMA_fast'] = df['Close'].rolling(window=fast, min_periods=1).mean()
@@ -69,6 +66,35 @@ def backtest_with_stats(df, initial_capital=100_000):
     trades_df  = pd.DataFrame(trades, columns=cols)
     return equity_df, trades_df
 
+def sweep(df, fasts=range(5, 51), slows=range(20, 251, 5), initial_capital=100_000):
+    """
+    Final equity of the crossover strategy above for every fast < slow
+    pair, from one SMA grid. A pair holds from the close of its first
+    golden cross and then whenever fast > slow, as backtest_with_stats does.
+    """
+    close = df['Close'].to_numpy(dtype=float)
+    windows = sorted(set(fasts) | set(slows))
+    grid = sma_grid(close, windows, min_periods=1)
+    row = {n: i for i, n in enumerate(windows)}
+    pairs = [(f, s) for f in fasts for s in slows if f < s]
+    fast = grid[[row[f] for f, _ in pairs]]
+    slow = grid[[row[s] for _, s in pairs]]
+
+    above = fast > slow
+    below = fast < slow
+    long_sig = above & np.r_['-1', np.zeros((len(pairs), 1), bool), ~above[:, :-1]]
+    short_sig = below & np.r_['-1', np.zeros((len(pairs), 1), bool), ~below[:, :-1]]
+    # position after each bar's close: last signal wins, flat before the first buy
+    state = np.where(long_sig, 1.0, np.where(short_sig, 0.0, np.nan))
+    held = pd.DataFrame(state.T).ffill().fillna(0.0).to_numpy().T
+    growth = np.log(close[1:] / close[:-1])
+    equity = initial_capital * np.exp((held[:, :-1] * growth).sum(axis=1))
+    out = pd.DataFrame(pairs, columns=['fast', 'slow'])
+    out['trades'] = long_sig.sum(axis=1)
+    out['final_equity'] = equity
+    out['return_pct'] = (equity / initial_capital - 1) * 100
+    return out.sort_values('final_equity', ascending=False, kind='mergesort').reset_index(drop=True)
+
 def summarize_and_plot(equity_df, trades_df):
     total_initiated = len(trades_df)
     closed = trades_df['Exit Date'].notna()
@@ -100,8 +126,19 @@ def summarize_and_plot(equity_df, trades_df):
     plt.show()
 
 def main():
-    df = load_data()
-    df = generate_signals(df, fast=50, slow=200)
+    p = argparse.ArgumentParser(description="SMA crossover backtest with trade stats")
+    p.add_argument('--csv', default='scrip.csv')
+    p.add_argument('--fast', type=int, default=50)
+    p.add_argument('--slow', type=int, default=200)
+    p.add_argument('--sweep', action='store_true', help="Rank every fast/slow pair instead")
+    p.add_argument('--top', type=int, default=20)
+    args = p.parse_args()
+
+    df = load_data(args.csv)
+    if args.sweep:
+        print(sweep(df).head(args.top).to_string(index=False, float_format='{:,.2f}'.format))
+        return
+    df = generate_signals(df, fast=args.fast, slow=args.slow)
     #    df = generate_signals(df, fast=10, slow=30) winning strategy for 1 year trent upto 24 jun 2025
     equity_df, trades_df = backtest_with_stats(df, initial_capital=100_000)
     summarize_and_plot(equity_df, trades_df)
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_atr
+
 
 def load_data(path):
     df = pd.read_csv(path, thousands=',')
@@ -22,14 +28,6 @@ def load_data(path):
     return df
 
 
-def compute_atr(df, period):
-    hl = df['High'] - df['Low']
-    hc = (df['High'] - df['Close'].shift(1)).abs()
-    lc = (df['Low']  - df['Close'].shift(1)).abs()
-    tr = pd.concat([hl, hc, lc], axis=1).max(axis=1)
-    return tr.rolling(window=period, min_periods=1).mean()
-
-
 def detect_dynamic_breakouts(df, mode, atr_period, multiplier):
     df = df.copy()
     df['ATR'] = compute_atr(df, atr_period)
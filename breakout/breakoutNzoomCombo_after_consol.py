@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_quantile
+
 def load_data(path):
     df = pd.read_csv(path, thousands=',')
     df.columns = df.columns.str.strip()
@@ -29,9 +35,7 @@ def detect_consolidation(df, cons_window, long_window, percentile):
                   .mean()
     )
     df['Cons_Threshold'] = (
-        df['Avg_Range']
-          .rolling(window=long_window, min_periods=1)
-          .quantile(percentile)
+        compute_quantile(df['Avg_Range'], long_window, percentile)
           .shift(1)
     )
     df['Consolidating'] = df['Avg_Range'] < df['Cons_Threshold']
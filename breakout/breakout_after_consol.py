@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicator_cache import cached_indicator
+from helpers.indicators import compute_quantile
+
 def load_data(path):
     df = pd.read_csv(path, thousands=',')
     df.columns = df.columns.str.strip()
@@ -17,22 +24,15 @@ def load_data(path):
     return df
 
 def detect_resistance_breakouts(df, lookback):
-    df['Resistance'] = df['High'].shift(1) \
-                         .rolling(window=lookback, min_periods=1).max()
+    df['Resistance'] = cached_indicator(df, 'rolling_max', field='High', n=lookback).shift(1)
     df['Price_Breakout'] = df['Close'] > df['Resistance']
     return df
 
 def detect_consolidation(df, cons_window, long_window, percentile):
     df['Range'] = df['High'] - df['Low']
-    df['Avg_Range'] = (
-        df['Range'].shift(1)
-                  .rolling(window=cons_window, min_periods=1)
-                  .mean()
-    )
+    df['Avg_Range'] = cached_indicator(df, 'sma', field='Range', n=cons_window, min_periods=1).shift(1)
     df['Cons_Threshold'] = (
-        df['Avg_Range']
-          .rolling(window=long_window, min_periods=1)
-          .quantile(percentile)
+        compute_quantile(df['Avg_Range'], long_window, percentile)
           .shift(1)
     )
     df['Consolidating'] = df['Avg_Range'] < df['Cons_Threshold']
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.timeindex import TimeIndex
+
 def load_data(path):
     """Load CSV, parse dates, rename and convert columns."""
     df = pd.read_csv(path, thousands=',')
@@ -53,15 +60,32 @@ def check_follow_through(df, dt, follow_days, pct):
     return (not window.empty) and (window['Close'] > res).all()
 
 def backtest(df, bo_dates, follow_days, pct, back_days):
-    ft_dates = []
-    sustain_dates = []
-    for dt in bo_dates:
-        if check_follow_through(df, dt, follow_days, pct):
-            ft_dates.append(dt)
-        b_close = float(df.at[dt, 'Close'])
-        future = df.loc[dt:].iloc[back_days:back_days+1]
-        if not future.empty and float(future['Close'].iat[0]) > b_close:
-            sustain_dates.append(dt)
+    """
+    Follow-through and sustain checks for all breakouts at once: the bars
+    after each breakout come from one TimeIndex lookup instead of a
+    df.loc[dt:] slice per date (same rules as check_follow_through).
+    """
+    ti = TimeIndex.from_frame(df, ['Close'])
+    bo = df.loc[bo_dates]
+    res, high, low, close = (bo[c].to_numpy(dtype=float) for c in ['Resistance', 'High', 'Low', 'Close'])
+
+    q = ti.first_at(bo_dates)
+    ft = np.zeros(len(bo), bool)
+    if follow_days > 0:
+        after = ti.windows_after(bo_dates, follow_days, 'Close')
+        # bars that exist after each breakout; the rest of the row is padding
+        avail = np.minimum(len(ti) - 1 - q, follow_days)
+        pad = np.arange(follow_days) >= avail[:, None]
+        with np.errstate(invalid='ignore'):
+            held = (pad | (after > res[:, None])).all(axis=1)    # a NaN close fails
+        ft = (close >= low + pct * (high - low)) & held & (avail > 0)
+
+    pos = q + back_days
+    closes = ti.columns['Close']
+    sustained = (pos < len(ti)) & (closes[np.minimum(pos, len(ti) - 1)] > close)
+
+    ft_dates = [dt for dt, ok in zip(bo_dates, ft) if ok]
+    sustain_dates = [dt for dt, ok in zip(bo_dates, sustained) if ok]
     return len(bo_dates), ft_dates, sustain_dates
 
 def plot_price_volume(df, bo_dates, ft_dates):
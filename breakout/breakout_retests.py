@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.timeindex import TimeIndex
+
 def load_data(path):
     df = pd.read_csv(path, thousands=',')
     df.columns = df.columns.str.strip()
@@ -38,27 +44,29 @@ def find_retests(df, breakout_dates, buffer_pct, lookahead, require_ft):
       - Look ahead up to `lookahead` days
       - Retest occurs when Low <= Resistance*(1+buffer_pct) and Close > Resistance
     """
-    retests = []
-    for dt in breakout_dates:
-        res = df.at[dt, 'Resistance']
-        if pd.isna(res): 
-            continue
-        # optional follow-through check
-        if require_ft and not check_follow_through(df, dt):
-            continue
-        threshold = res * (1 + buffer_pct)
-        window = df.loc[dt:].iloc[1:lookahead+1]  # next bars
-        for d, row in window.iterrows():
-            if row['Low'] <= threshold and row['Close'] > res:
-                retests.append({
-                    'Breakout Date': dt,
-                    'Retest Date': d,
-                    'Resistance': res,
-                    'Retest Low': row['Low'],
-                    'Retest Close': row['Close']
-                })
-                break
-    return pd.DataFrame(retests)
+    dates = [dt for dt in breakout_dates
+             if pd.notna(df.at[dt, 'Resistance'])
+             and (not require_ft or check_follow_through(df, dt))]
+    if not dates or lookahead < 1:
+        return pd.DataFrame()
+
+    # next `lookahead` bars of every breakout in one lookup
+    ti = TimeIndex.from_frame(df, ['Low', 'Close'])
+    res = df.loc[dates, 'Resistance'].to_numpy(dtype=float)
+    lows = ti.windows_after(dates, lookahead, 'Low')
+    closes = ti.windows_after(dates, lookahead, 'Close')
+    hit = (lows <= res[:, None] * (1 + buffer_pct)) & (closes > res[:, None])
+
+    rows = np.flatnonzero(hit.any(axis=1))
+    first = hit[rows].argmax(axis=1)
+    pos = ti.first_at([dates[i] for i in rows]) + 1 + first
+    return pd.DataFrame({
+        'Breakout Date': [dates[i] for i in rows],
+        'Retest Date':   df.index[pos],
+        'Resistance':    res[rows],
+        'Retest Low':    lows[rows, first],
+        'Retest Close':  closes[rows, first],
+    })
 
 if __name__ == '__main__':
     p = argparse.ArgumentParser(description="Detect breakout retests on TCS")
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 import mplfinance as mpf
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicator_graph import shared
+
 def load_data(path):
     df = pd.read_csv(path, thousands=',')
     df.columns = df.columns.str.strip()
@@ -18,45 +24,24 @@ def load_data(path):
     }, inplace=True)
     return df
 
-def compute_rsi(close, period=14):
-    delta = close.diff()
-    up = delta.clip(lower=0)
-    down = -delta.clip(upper=0)
-    ma_up = up.ewm(com=period-1, adjust=False).mean()
-    ma_down = down.ewm(com=period-1, adjust=False).mean()
-    rs = ma_up / ma_down
-    return 100 - (100 / (1 + rs))
-
-def compute_stoch(high, low, close, k_period=14, d_period=3):
-    low_min  = low.rolling(k_period, min_periods=1).min()
-    high_max = high.rolling(k_period, min_periods=1).max()
-    k = (close - low_min) / (high_max - low_min) * 100
-    d = k.rolling(d_period, min_periods=1).mean()
-    return k, d
-
-def compute_macd(close, fast=12, slow=26, signal=9):
-    ema_fast  = close.ewm(span=fast, adjust=False).mean()
-    ema_slow  = close.ewm(span=slow, adjust=False).mean()
-    macd_line = ema_fast - ema_slow
-    sig_line  = macd_line.ewm(span=signal, adjust=False).mean()
-    hist = macd_line - sig_line
-    return macd_line, sig_line, hist
-
 def main():
     p = argparse.ArgumentParser(description="Overbought Breakout Chart Without pandas_ta")
     p.add_argument('--csv', default='scrip.csv', help="Path to CSV file")
+    p.add_argument('--timings', action='store_true', help="Print per-indicator compute times")
     args = p.parse_args()
 
     df = load_data(args.csv)
 
-    # 1) Indicators
-    df['SMA20'] = df['Close'].rolling(20).mean()
-    df['RSI14'] = compute_rsi(df['Close'], 14)
-    df['STOCHK'], df['STOCHD'] = compute_stoch(df['High'], df['Low'], df['Close'], 14, 3)
-    df['MACD'], df['MACD_SIGNAL'], df['MACD_HIST'] = compute_macd(df['Close'], 12, 26, 9)
+    # 1) Indicators (shared graph: the Close diff, EMAs and rolling extremes are computed once)
+    g = shared(df)
+    df['SMA20'] = g.series(g.sma('Close', 20))
+    df['RSI14'] = g.series(g.rsi(14, method='ema'))
+    k, d = g.stochastic(14, 3)
+    df['STOCHK'], df['STOCHD'] = g.series(k), g.series(d)
+    df['MACD'], df['MACD_SIGNAL'], df['MACD_HIST'] = (g.series(a) for a in g.macd(12, 26, 9))
 
     # 2) Breakout logic
-    df['Resistance20'] = df['High'].shift(1).rolling(20, min_periods=1).max()
+    df['Resistance20'] = g.series(g.rolling_max(('prev', 'High', 1), 20))
     df['Breakout'] = df['Close'] > df['Resistance20']
     df['OverboughtBreakout'] = (
         df['Breakout'] &
@@ -99,5 +84,8 @@ def main():
         tight_layout=True
     )
 
+    if args.timings:
+        print(g.timings().to_string(index=False))
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Corporate-action adjustment applied on read.
+
+The raw store is never rewritten. Splits and dividends are kept per
+symbol as events, turned once into cumulative back-adjustment factors
+and cached next to the store:
+
+    <root>/_actions/<SYMBOL>.parquet   ex-date, kind ('split'|'dividend'), value
+    <root>/_adjust/<SYMBOL>.parquet    ex-date, price_factor, volume_factor (cumulative)
+
+Reading adjusted prices is then one searchsorted per symbol: every bar
+before an ex-date is multiplied by the product of all later factors
+(OHLC and Prev Close by price_factor, volume by volume_factor = the
+inverse of the split part). A new corporate action rewrites only that
+symbol's two small files. Dividend factors also depend on the closes,
+so the factor file records a signature of the symbol's price parts
+(names, sizes, mtimes) and is rebuilt on read once the parts change,
+e.g. when a dividend's prior close is appended after the event.
+
+Split ratio r (2.0 for 2:1): prices x 1/r, volume x r.
+Dividend d with previous close c: prices x (1 - d / c), volume untouched.
+
+The store is expected to hold unadjusted exchange prices: NSE exports
+and bhavcopies are, and helpers/yf_bulk.py undoes Yahoo's split
+adjustment before writing. Rows that are already adjusted would be
+adjusted twice.
+
+    python -m helpers.adjust import INFY --splits previous/splits.csv --dividends previous/dividends.csv
+    python -m helpers.adjust sync          # from the fundamentals table (helpers/fundamentals.py)
+
+    from helpers.adjust import load_adjusted
+    df = load_adjusted('INFY')
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .nse_csv import day_to_date
+from .nse_store import list_parts, load_symbol, store_root
+
+PRICE_COLUMNS = ['Prev Close', 'Open', 'High', 'Low', 'Last', 'Close', 'Average Price']
+VOLUME_COLUMNS = ['Volume', 'Deliverable Qty']
+EVENT_COLUMNS = ['Date', 'kind', 'value']
+PRICES_KEY = b'adjust.prices'       # factor-file metadata: signature of the parts used
+
+
+def actions_path(symbol, root=None):
+    return store_root(root) / '_actions' / f'{symbol}.parquet'
+
+
+def factors_path(symbol, root=None):
+    return store_root(root) / '_adjust' / f'{symbol}.parquet'
+
+
+def read_actions(symbol, root=None):
+    p = actions_path(symbol, root)
+    return pd.read_parquet(p) if p.exists() else pd.DataFrame(columns=EVENT_COLUMNS)
+
+
+def set_actions(symbol, events, root=None):
+    """
+    Replace the stored events of one symbol and rebuild its factor cache.
+    `events` has columns Date, kind ('split' | 'dividend'), value.
+    """
+    events = (events[EVENT_COLUMNS]
+              .assign(Date=pd.to_datetime(events['Date']).astype('datetime64[ns]'))
+              .drop_duplicates(['Date', 'kind'], keep='last')
+              .sort_values(['Date', 'kind'], kind='mergesort')
+              .reset_index(drop=True))
+    p = actions_path(symbol, root)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    events.to_parquet(p, index=False)
+    return build_factors(symbol, root)
+
+
+def add_actions(symbol, events, root=None):
+    """Merge new events into the stored ones (new rows win) and rebuild."""
+    return set_actions(symbol, pd.concat([read_actions(symbol, root), events], ignore_index=True), root)
+
+
+def _naive_dates(s):
+    """yfinance writes exchange-local timestamps with an offset; keep the local date."""
+    s = pd.to_datetime(s.astype(str).str[:10], format='%Y-%m-%d')
+    return s.astype('datetime64[ns]')
+
+
+def _unadjust_dividends(divs, splits):
+    """
+    Yahoo quotes dividends in today's share terms; scale each one back by
+    the splits that came after it so it matches the raw closes.
+    """
+    if divs.empty or splits.empty:
+        return divs
+    s = splits.sort_values('Date')
+    later = np.cumprod(s['value'].to_numpy()[::-1])[::-1]      # product of splits from i on
+    idx = s['Date'].searchsorted(divs['Date'], 'right')
+    return divs.assign(value=divs['value'].to_numpy() * np.r_[later, 1.0][idx])
+
+
+def _events(splits, divs):
+    frames = [splits.assign(kind='split'), _unadjust_dividends(divs, splits).assign(kind='dividend')]
+    return pd.concat(frames, ignore_index=True)[EVENT_COLUMNS]
+
+
+def events_from_yfinance(splits_csv=None, dividends_csv=None):
+    """Events from yfinance's splits.csv / dividends.csv (previous/yfin/yfin_get.py)."""
+    def read(path, column):
+        if not path:
+            return pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'), 'value': pd.Series(dtype=float)})
+        raw = pd.read_csv(path)
+        df = pd.DataFrame({'Date': _naive_dates(raw['Date']), 'value': raw[column].astype(float)})
+        return df[df['value'] > 0]
+    return _events(read(splits_csv, 'Stock Splits'), read(dividends_csv, 'Dividends'))
+
+
+def compute_factors(events, prices=None):
+    """
+    Cumulative factors from events. `prices` (Date-indexed, with Close and
+    optionally Prev Close) is needed for dividends; dividends without a
+    prior close are ignored.
+    """
+    if events.empty:
+        return pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'),
+                             'price_factor': pd.Series(dtype=float),
+                             'volume_factor': pd.Series(dtype=float)})
+    ev = events.sort_values('Date', kind='mergesort')
+    dates = pd.DatetimeIndex(ev['Date'])
+    split = ev['kind'].eq('split').to_numpy()
+    value = ev['value'].to_numpy(dtype=float)
+
+    price_f = np.ones(len(ev))
+    price_f[split] = 1.0 / value[split]
+    if (~split).any():
+        if prices is None or prices.empty:
+            raise ValueError('dividend adjustment needs the symbol\'s prices')
+        close = prices['Close']
+        # close of the last bar strictly before each ex-date
+        pos = close.index.searchsorted(dates[~split], 'left') - 1
+        prior = np.where(pos >= 0, close.to_numpy()[pos.clip(0)], np.nan)
+        ratio = 1.0 - value[~split] / prior
+        price_f[~split] = np.where(np.isfinite(ratio) & (ratio > 0), ratio, 1.0)
+    vol_f = np.where(split, value, 1.0)
+
+    f = pd.DataFrame({'Date': dates, 'price_factor': price_f, 'volume_factor': vol_f})
+    f = f.groupby('Date', sort=True).prod().reset_index()
+    # cumulative from the latest event backwards: factor for bars before Date[i]
+    f['price_factor'] = np.cumprod(f['price_factor'].to_numpy()[::-1])[::-1]
+    f['volume_factor'] = np.cumprod(f['volume_factor'].to_numpy()[::-1])[::-1]
+    return f
+
+
+def prices_signature(symbol, root=None):
+    """Hash of the names, sizes and mtimes of a symbol's price parts."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in list_parts(symbol, root):
+        st = part.stat()
+        h.update(f'{part.name}:{st.st_size}:{st.st_mtime_ns};'.encode())
+    return h.hexdigest()
+
+
+def build_factors(symbol, root=None):
+    """(Re)build and cache one symbol's cumulative factors."""
+    events = read_actions(symbol, root)
+    has_divs = events['kind'].eq('dividend').any()
+    # signature before loading: a concurrent append then only causes another rebuild
+    sig = prices_signature(symbol, root) if has_divs else ''
+    prices = load_symbol(symbol, root, series='EQ') if has_divs else None
+    f = compute_factors(events, prices)
+    table = pa.Table.from_pandas(f, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, PRICES_KEY: sig.encode()})
+    p = factors_path(symbol, root)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix('.tmp')
+    pq.write_table(table, tmp)
+    os.replace(tmp, p)
+    return f
+
+
+def read_factors(symbol, root=None):
+    """
+    Cached factors for a symbol, or None if it never had a corporate
+    action. Rebuilt first if they used dividends and the prices moved.
+    """
+    p = factors_path(symbol, root)
+    if p.exists():
+        sig = (pq.read_schema(p).metadata or {}).get(PRICES_KEY)
+        if sig == b'' or (sig is not None and sig.decode() == prices_signature(symbol, root)):
+            return pd.read_parquet(p)
+        return build_factors(symbol, root)
+    if actions_path(symbol, root).exists():
+        return build_factors(symbol, root)
+    return None
+
+
+def apply_factors(df, factors, dates=None):
+    """
+    Adjust a frame of one symbol. `dates` defaults to df.index. Returns a
+    copy; columns not in PRICE_COLUMNS/VOLUME_COLUMNS are untouched.
+    """
+    if factors is None or factors.empty:
+        return df
+    dates = df.index if dates is None else dates
+    if pd.api.types.is_integer_dtype(dates):
+        dates = day_to_date(dates)      # compact schema
+    idx = pd.DatetimeIndex(factors['Date']).searchsorted(dates, 'right')
+    price = np.r_[factors['price_factor'].to_numpy(), 1.0][idx]
+    vol = np.r_[factors['volume_factor'].to_numpy(), 1.0][idx]
+    out = df.copy()
+    for c in PRICE_COLUMNS:
+        if c in out.columns:
+            out[c] = (out[c].to_numpy(dtype=float) * price).astype(out[c].dtype)
+    for c in VOLUME_COLUMNS:
+        if c in out.columns:
+            out[c] = np.round(out[c].to_numpy(dtype=float) * vol).astype(out[c].dtype)
+    return out
+
+
+def load_adjusted(symbol, root=None, series=None, fields=None, compact=False):
+    """load_symbol() (unadjusted prices) with split/dividend back-adjustment applied."""
+    return apply_factors(load_symbol(symbol, root, series, fields, compact), read_factors(symbol, root))
+
+
+def adjust_universe(df, root=None):
+    """Adjust a long frame (Symbol, Date columns); symbols without actions pass through."""
+    out = df
+    for symbol in pd.unique(df['Symbol']):
+        f = read_factors(symbol, root)
+        if f is None or f.empty:
+            continue
+        mask = (df['Symbol'] == symbol).to_numpy()
+        if out is df:
+            out = df.copy()
+        key = 'Date' if 'Date' in df.columns else 'Day'
+        out.loc[mask] = apply_factors(df.loc[mask], f, df.loc[mask, key].to_numpy())
+    return out
+
+
+def sync_from_fundamentals(root=None, suffix='.NS'):
+    """
+    Refresh events from the chart 'splits' / 'dividends' datasets harvested
+    by helpers/fundamentals.py. Only symbols whose events changed are
+    rebuilt. Returns the rebuilt symbols.
+    """
+    from .fundamentals import load_fundamentals
+    t = load_fundamentals(root, datasets=['splits', 'dividends'])
+    t = t[t['field'].isin(['amount', 'numerator', 'denominator'])]
+    changed = []
+    for ticker, g in t.groupby('ticker'):
+        wide = g.pivot_table(index=['dataset', 'period'], columns='field', values='value', aggfunc='last')
+        wide = wide.reset_index().assign(Date=lambda x: pd.to_datetime(x['period']).astype('datetime64[ns]'))
+        s = wide[wide['dataset'] == 'splits']
+        d = wide[wide['dataset'] == 'dividends']
+        splits = pd.DataFrame({'Date': s['Date'], 'value': s.get('numerator', np.nan) / s.get('denominator', np.nan)})
+        divs = pd.DataFrame({'Date': d['Date'], 'value': d.get('amount', np.nan)})
+        new = _events(splits.dropna(), divs.dropna())
+
+        symbol = ticker[:-len(suffix)] if suffix and ticker.endswith(suffix) else ticker
+        old = read_actions(symbol, root)
+        key = ['Date', 'kind']
+        if old.sort_values(key).reset_index(drop=True).equals(
+                new.sort_values(key).reset_index(drop=True).astype(old.dtypes.to_dict())):
+            continue
+        set_actions(symbol, new, root)
+        changed.append(symbol)
+    return changed
+
+
+def main():
+    p = argparse.ArgumentParser(description="Manage split/dividend adjustment factors")
+    p.add_argument('--root', default=None, help="Store directory")
+    sub = p.add_subparsers(dest='cmd', required=True)
+    imp = sub.add_parser('import', help="Import yfinance splits.csv / dividends.csv for one symbol")
+    imp.add_argument('symbol')
+    imp.add_argument('--splits')
+    imp.add_argument('--dividends')
+    sub.add_parser('sync', help="Import events from the fundamentals table")
+    show = sub.add_parser('show', help="Print a symbol's cumulative factors")
+    show.add_argument('symbol')
+    args = p.parse_args()
+
+    if args.cmd == 'import':
+        f = add_actions(args.symbol, events_from_yfinance(args.splits, args.dividends), args.root)
+        print(f"{args.symbol}: {len(f)} ex-dates")
+    elif args.cmd == 'sync':
+        changed = sync_from_fundamentals(args.root)
+        print(f"Rebuilt factors for {len(changed)} symbols: {', '.join(changed)}")
+    else:
+        f = read_factors(args.symbol, args.root)
+        print("No corporate actions." if f is None else f.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Intraday bar pyramid: 1m -> 5m -> 1h -> 1d -> 1w.
+
+Only the finest level is ingested; every coarser level is aggregated
+from the one below it and cached on disk, one file per symbol and month:
+
+    <root>/_bars/<level>/symbol=<SYMBOL>/<YYYYMM>.parquet    Time, Open, High, Low, Close, Volume
+
+When new bars arrive only the buckets they touch are rebuilt, level by
+level: the new 1m bars re-aggregate the last (partial) 5m bucket
+onwards, those 5m bars the last 1h bucket onwards, and so on. Detectors
+that want hourly or daily bars read the cached level directly instead
+of resampling minute data on every run.
+
+Buckets are labelled by their start in exchange-local time. Hours are
+anchored at the 09:15 open (09:15, 10:15, ... 15:15) and weeks start on
+Monday.
+
+    python -m helpers.bars fetch TRENT TCS --interval 1m --range 7d
+    python -m helpers.bars show TRENT --level 1h --tail 20
+    python -m helpers.bars rebuild TRENT
+
+    from helpers.bars import read_bars
+    hourly = read_bars('TRENT', '1h', start='2025-06-01')
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .fetch import RateLimiter, get_json
+from .nse_store import store_root
+from .yf_bulk import YAHOO_BASE, chart_to_frame, chart_url
+
+LEVELS = ('1m', '5m', '1h', '1d', '1w')
+YAHOO_INTERVAL = {'1m': '1m', '5m': '5m', '1h': '60m'}
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+BAR_COLUMNS = ['Time', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def bucket(times, level):
+    """Start of the `level` bucket each timestamp falls in."""
+    t = pd.DatetimeIndex(times)
+    if level == '1m':
+        return t.floor('min')
+    if level == '5m':
+        return t.floor('5min')
+    if level == '1h':
+        # hours counted from the 09:15 open, not the top of the clock
+        anchor = SESSION_OPEN - SESSION_OPEN.floor('h')
+        return (t - anchor).floor('h') + anchor
+    day = t.normalize()
+    if level == '1d':
+        return day
+    if level == '1w':
+        return day - pd.to_timedelta(day.dayofweek, unit='D')
+    raise ValueError(f'unknown level {level!r}; expected one of {LEVELS}')
+
+
+def resample_bars(df, level):
+    """
+    Aggregate bars sorted by Time into `level` buckets: first Open, max
+    High, min Low, last Close, summed Volume. One reduceat per column.
+    """
+    if df.empty:
+        return df[BAR_COLUMNS].copy()
+    keys = bucket(df['Time'], level)
+    k = keys.asi8
+    starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    return pd.DataFrame({
+        'Time':   keys[starts],
+        'Open':   df['Open'].to_numpy()[starts],
+        'High':   np.maximum.reduceat(df['High'].to_numpy(), starts),
+        'Low':    np.minimum.reduceat(df['Low'].to_numpy(), starts),
+        'Close':  df['Close'].to_numpy()[ends],
+        'Volume': np.add.reduceat(df['Volume'].to_numpy(), starts),
+    })
+
+
+def bars_dir(symbol, level, root=None):
+    return store_root(root) / '_bars' / level / f'symbol={symbol}'
+
+
+def _month_key(t):
+    return pd.Timestamp(t).strftime('%Y%m')
+
+
+def _month_path(symbol, level, key, root=None):
+    return bars_dir(symbol, level, root) / f'{key}.parquet'
+
+
+def _read_month(symbol, level, key, root=None):
+    p = _month_path(symbol, level, key, root)
+    return pd.read_parquet(p) if p.exists() else None
+
+
+def read_bars(symbol, level='1d', start=None, end=None, root=None):
+    """Cached bars for one symbol and level, optionally limited to [start, end]."""
+    d = bars_dir(symbol, level, root)
+    files = sorted(d.glob('*.parquet')) if d.is_dir() else []
+    if start is not None:
+        files = [f for f in files if f.stem >= _month_key(start)]
+    if end is not None:
+        files = [f for f in files if f.stem <= _month_key(end)]
+    if not files:
+        return pd.DataFrame({c: pd.Series(dtype='datetime64[ns]' if c == 'Time' else float)
+                             for c in BAR_COLUMNS})
+    df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+    if start is not None:
+        df = df[df['Time'] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df['Time'] <= pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+def _write(symbol, level, df, root=None):
+    """Write whole months atomically."""
+    d = bars_dir(symbol, level, root)
+    d.mkdir(parents=True, exist_ok=True)
+    keys = df['Time'].dt.strftime('%Y%m').to_numpy()
+    for key in pd.unique(keys):
+        p = d / f'{key}.parquet'
+        tmp = p.with_suffix('.tmp')
+        df[keys == key].to_parquet(tmp, index=False)
+        os.replace(tmp, p)
+
+
+def _replace_from(symbol, level, bars, since, root=None):
+    """Replace every stored bar of `level` at or after `since` with `bars`."""
+    keep = []
+    for key in pd.unique(bars['Time'].dt.strftime('%Y%m')):
+        old = _read_month(symbol, level, key, root)
+        if old is not None:
+            keep.append(old[old['Time'] < since])
+    _write(symbol, level, pd.concat(keep + [bars], ignore_index=True), root)
+
+
+def _coerce(df):
+    df = df[BAR_COLUMNS].copy()
+    df['Time'] = pd.to_datetime(df['Time']).astype('datetime64[ns]')
+    for c in ['Open', 'High', 'Low', 'Close']:
+        df[c] = df[c].astype('float64')
+    df['Volume'] = df['Volume'].fillna(0).astype('int64')
+    return df
+
+
+def append_bars(symbol, df, level='1m', root=None):
+    """
+    Merge new `level` bars into the pyramid and bring every coarser level
+    up to date. Only the buckets from the earliest new bar onwards are
+    recomputed. Returns {level: bars rewritten}.
+    """
+    if level not in LEVELS:
+        raise ValueError(f'unknown level {level!r}; expected one of {LEVELS}')
+    df = _coerce(df).dropna(subset=['Close'])
+    if df.empty:
+        return {}
+    df = df.sort_values('Time', kind='mergesort').drop_duplicates('Time', keep='last')
+    df = resample_bars(df, level)       # no-op unless the source is finer than `level`
+
+    # base level: merge with the months the new bars land in (new rows win)
+    merged = []
+    for key in pd.unique(df['Time'].dt.strftime('%Y%m')):
+        old = _read_month(symbol, level, key, root)
+        new = df[df['Time'].dt.strftime('%Y%m') == key]
+        merged.append(new if old is None else
+                      pd.concat([old[~old['Time'].isin(new['Time'])], new]).sort_values('Time', kind='mergesort'))
+    _write(symbol, level, pd.concat(merged, ignore_index=True), root)
+    written = {level: len(df)}
+
+    since = df['Time'].iloc[0]
+    below = level
+    for upper in LEVELS[LEVELS.index(level) + 1:]:
+        since = bucket([since], upper)[0]
+        bars = resample_bars(read_bars(symbol, below, start=since, root=root), upper)
+        _replace_from(symbol, upper, bars, since, root)
+        written[upper] = len(bars)
+        below = upper
+    return written
+
+
+def rebuild(symbol, base='1m', root=None):
+    """Recompute every level above `base` from scratch."""
+    src = read_bars(symbol, base, root=root)
+    for upper in LEVELS[LEVELS.index(base) + 1:]:
+        d = bars_dir(symbol, upper, root)
+        for f in d.glob('*.parquet') if d.is_dir() else []:
+            f.unlink()
+        src = resample_bars(src, upper)
+        _write(symbol, upper, src, root)
+    return src
+
+
+def fetch_intraday(symbols, interval='1m', period='7d', suffix='.NS', workers=4, rate=2.0,
+                   retries=4, backoff=1.0, root=None, base_url=YAHOO_BASE):
+    """
+    Download intraday bars from Yahoo (1m: last 7 days, 5m: 60 days, 1h: 2 years)
+    and append them to the pyramid. Returns {'ok': {symbol: bars}, 'failed': {symbol: error}}.
+    """
+    if interval not in YAHOO_INTERVAL:
+        raise ValueError(f'intraday interval must be one of {list(YAHOO_INTERVAL)}')
+    limiter = RateLimiter(rate, burst=max(1, int(rate)))
+
+    def one(symbol):
+        payload = get_json(chart_url(symbol + suffix, period, YAHOO_INTERVAL[interval], base_url),
+                           limiter=limiter, retries=retries, backoff=backoff)
+        df = chart_to_frame(payload, symbol, daily=False).rename(columns={'Date': 'Time'})
+        append_bars(symbol, df, interval, root)
+        return len(df)
+
+    ok, failed = {}, {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(one, s): s for s in dict.fromkeys(symbols)}
+        for fut in as_completed(futures):
+            s = futures[fut]
+            try:
+                ok[s] = fut.result()
+                print(f"  {s:<12} {ok[s]:>6} bars")
+            except Exception as e:
+                failed[s] = str(e)
+                print(f"  {s:<12} FAILED: {e}")
+    return {'ok': ok, 'failed': failed}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Intraday bar pyramid (1m -> 5m -> 1h -> 1d -> 1w)")
+    p.add_argument('--root', default=None, help="Store directory")
+    sub = p.add_subparsers(dest='cmd', required=True)
+    f = sub.add_parser('fetch', help="Download intraday bars from Yahoo and update all levels")
+    f.add_argument('symbols', nargs='+')
+    f.add_argument('--interval', default='1m', choices=list(YAHOO_INTERVAL))
+    f.add_argument('--range', default='7d', help="Yahoo range (1m data only goes back 7 days)")
+    f.add_argument('--workers', type=int, default=4)
+    f.add_argument('--rate', type=float, default=2.0, help="Max requests per second")
+    f.add_argument('--base-url', default=YAHOO_BASE)
+    s = sub.add_parser('show', help="Print cached bars")
+    s.add_argument('symbol')
+    s.add_argument('--level', default='1h', choices=LEVELS)
+    s.add_argument('--tail', type=int, default=20)
+    r = sub.add_parser('rebuild', help="Recompute coarser levels from the base level")
+    r.add_argument('symbols', nargs='+')
+    r.add_argument('--base', default='1m', choices=LEVELS[:3])
+    args = p.parse_args()
+
+    if args.cmd == 'fetch':
+        res = fetch_intraday(args.symbols, args.interval, args.range, workers=args.workers,
+                             rate=args.rate, root=args.root, base_url=args.base_url)
+        print(f"\n{len(res['ok'])} ok, {len(res['failed'])} failed")
+    elif args.cmd == 'show':
+        print(read_bars(args.symbol, args.level, root=args.root).tail(args.tail).to_string(index=False))
+    else:
+        for sym in args.symbols:
+            print(f"{sym}: {len(rebuild(sym, args.base, args.root))} weekly bars")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+One-pass splitter for the full-market NSE bhavcopy.
+
+The daily sec_bhavdata_full_DDMMYYYY.csv carries every symbol and series
+in the same 15 fields as the per-symbol exports. It is parsed once (see
+nse_csv.read_nse_table), filtered by Series in Arrow, sorted by
+(Symbol, Date) and cut into contiguous per-symbol slices at the symbol
+boundaries, which are then appended to each symbol's partition. No
+per-symbol re-filtering of the file.
+
+    python -m helpers.bhavcopy sec_bhavdata_full_24062025.csv
+    python -m helpers.bhavcopy sec_bhavdata_full_*.csv --series EQ BE BZ
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .nse_csv import read_nse_table
+from .nse_store import ON_DUPLICATE, append_symbol
+
+DEFAULT_SERIES = ('EQ', 'BE')
+
+
+def read_bhavcopy(paths, series=DEFAULT_SERIES):
+    """
+    Parse one or more bhavcopy files into a single Arrow table holding only
+    `series` (None keeps everything), sorted by (Symbol, Series, Date).
+    """
+    table = pa.concat_tables([read_nse_table(p) for p in paths])
+    if series is not None:
+        table = table.filter(pc.is_in(table['Series'], value_set=pa.array(list(series))))
+    order = pc.sort_indices(table, sort_keys=[('Symbol', 'ascending'),
+                                              ('Series', 'ascending'),
+                                              ('Date', 'ascending')])
+    return table.take(order)
+
+
+def symbol_slices(table):
+    """(symbol, start, length) for each run of equal Symbol in a sorted table."""
+    codes = pc.dictionary_encode(table['Symbol'].combine_chunks())
+    idx = codes.indices.to_numpy(zero_copy_only=False)
+    starts = np.flatnonzero(np.r_[True, idx[1:] != idx[:-1]]) if len(idx) else np.array([], int)
+    lengths = np.diff(np.r_[starts, len(idx)])
+    names = codes.dictionary.to_pylist()
+    return [(names[idx[s]], int(s), int(n)) for s, n in zip(starts, lengths)]
+
+
+def split_bhavcopy(paths, series=DEFAULT_SERIES, root=None, on_duplicate='replace', workers=4):
+    """
+    Scatter bhavcopy rows into per-symbol store partitions.
+    Returns {symbol: rows appended}.
+    """
+    table = read_bhavcopy(paths, series)
+    slices = symbol_slices(table)
+    df = table.to_pandas()      # one conversion; slices below are views by position
+    df['Date'] = df['Date'].astype('datetime64[ns]')
+
+    def write(item):
+        symbol, start, n = item
+        rows = df.iloc[start:start + n]
+        if rows.duplicated(['Series', 'Date']).any():
+            if on_duplicate == 'reject':
+                raise ValueError(f'{symbol}: repeated (series, date) rows in input')
+            rows = rows.drop_duplicates(['Series', 'Date'], keep='last' if on_duplicate == 'replace' else 'first')
+        append_symbol(rows, symbol, root, on_duplicate)
+        return symbol, n
+
+    # each symbol has its own directory, so partitions are written in parallel
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(write, slices))
+
+
+def main():
+    p = argparse.ArgumentParser(description="Split full-market bhavcopy files into the per-symbol store")
+    p.add_argument('csv', nargs='+', help="sec_bhavdata_full_*.csv files")
+    p.add_argument('--series', nargs='+', default=list(DEFAULT_SERIES), help="Series to keep ('ALL' for every series)")
+    p.add_argument('--on-duplicate', choices=ON_DUPLICATE, default='replace')
+    p.add_argument('--workers', type=int, default=4, help="Parallel partition writers")
+    p.add_argument('--root', default=None, help="Store directory")
+    args = p.parse_args()
+
+    series = None if args.series == ['ALL'] else tuple(args.series)
+    written = split_bhavcopy(args.csv, series, args.root, args.on_duplicate, args.workers)
+    print(f"{sum(written.values()):,} rows into {len(written):,} symbols")
+
+
+if __name__ == '__main__':
+    main()
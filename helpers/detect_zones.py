@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 from scipy.signal import argrelextrema
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_quantile
+
 def load_data(path):
     """Load scrip.csv, parse dates, strip commas, and rename OHLC columns."""
     df = pd.read_csv(path, thousands=',')
@@ -37,15 +43,20 @@ def detect_resistance_zone(df, swing_window, lookback):
     )
     return df
 
-def detect_consolidation_zone(df, cons_window, percentile):
+def detect_consolidation_zone(df, cons_window, percentile, threshold_window=250):
     """
     1. Compute daily range (High - Low) and its rolling average over `cons_window` bars.
-    2. Flag consolidation when that rolling average is below the Xth percentile of all such values.
+    2. Flag consolidation when that rolling average is below the Xth percentile of
+       the previous `threshold_window` such values (0 = all values, which uses
+       future bars and is only fit for looking back at a finished chart).
     """
     df = df.copy()
     df['Range']     = df['High'] - df['Low']
     df['Avg_Range'] = df['Range'].rolling(window=cons_window, min_periods=1).mean()
-    threshold = df['Avg_Range'].quantile(percentile)
+    if threshold_window:
+        threshold = compute_quantile(df['Avg_Range'], threshold_window, percentile).shift(1)
+    else:
+        threshold = df['Avg_Range'].quantile(percentile)
     df['Consolidation_Zone'] = df['Avg_Range'] < threshold
     return df
 
@@ -61,12 +72,14 @@ def main():
                         help="Bars for rolling average range (consolidation)")
     parser.add_argument('--percentile',     type=float, default=0.3,
                         help="Percentile (0–1) threshold to flag consolidation")
+    parser.add_argument('--threshold-window', type=int, default=250,
+                        help="Bars of trailing history for the percentile (0 = whole file)")
     args = parser.parse_args()
 
     # Load and detect
     df = load_data(args.csv)
     df = detect_resistance_zone(df, args.swing_window, args.resistance_lookback)
-    df = detect_consolidation_zone(df, args.cons_window, args.percentile)
+    df = detect_consolidation_zone(df, args.cons_window, args.percentile, args.threshold_window)
 
     # Output Swing Highs (Resistance Points)
     swings = df['Swing_High'].dropna()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Small HTTP helpers shared by the downloaders: a thread-safe token-bucket
+rate limiter, a JSON GET with retries and exponential backoff, a pool of
+keep-alive connections to one host and a resumable progress file.
+
+Only the standard library is used, so every client can be pointed at a
+local stub server (pass its URL as base_url) in place of the real
+endpoint.
+"""
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Allow at most `rate` calls per second (bursts up to `burst`) across threads."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+            self.tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+
+
+def backoff_delay(attempt, backoff):
+    """Exponential backoff with jitter: backoff * 2**attempt * [0.5, 1.5)."""
+    return backoff * 2 ** attempt * (0.5 + random.random())
+
+
+def with_retries(fn, retries=4, backoff=1.0, retry_on=(urllib.error.URLError, TimeoutError, ConnectionError)):
+    """
+    Call fn() and retry transient failures. HTTP errors are retried only
+    for the status codes in RETRY_STATUS; a 404 fails immediately.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRY_STATUS or attempt == retries:
+                raise
+        except retry_on:
+            if attempt == retries:
+                raise
+        time.sleep(backoff_delay(attempt, backoff))
+
+
+def get_bytes(url, limiter=None, retries=4, backoff=1.0, timeout=30, headers=None, opener=None):
+    """GET `url` and return the body, rate-limited and retried."""
+    req_headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json, text/plain, */*'}
+    req_headers.update(headers or {})
+    open_ = opener.open if opener is not None else urllib.request.urlopen
+
+    def once():
+        if limiter is not None:
+            limiter.acquire()
+        req = urllib.request.Request(url, headers=req_headers)
+        with open_(req, timeout=timeout) as resp:
+            return resp.read()
+
+    return with_retries(once, retries, backoff)
+
+
+def get_json(url, limiter=None, retries=4, backoff=1.0, timeout=30, headers=None, opener=None):
+    """GET `url` and decode JSON, rate-limited and retried."""
+    return json.loads(get_bytes(url, limiter, retries, backoff, timeout, headers, opener))
+
+
+class HTTPPool:
+    """
+    Up to `size` keep-alive connections to one host, shared by threads.
+    Cookies set by the server are remembered and sent back, which is all
+    the session state sites like nseindia.com need.
+    """
+
+    def __init__(self, base_url, size=4, timeout=30, headers=None):
+        u = urlsplit(base_url)
+        self.https = u.scheme == 'https'
+        self.host, self.port = u.hostname, u.port
+        self.prefix = u.path.rstrip('/')
+        self.timeout = timeout
+        self.headers = {'User-Agent': USER_AGENT, 'Accept': '*/*', 'Connection': 'keep-alive'}
+        self.headers.update(headers or {})
+        self.cookies = {}
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, path, params=None, headers=None):
+        """One GET on a pooled connection; returns the body as bytes."""
+        if params:
+            path = f'{path}?{urlencode(params)}'
+        with self._lock:
+            cookie = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        h = dict(self.headers, **(headers or {}))
+        if cookie:
+            h['Cookie'] = cookie
+
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                conn.request('GET', self.prefix + path, headers=h)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                raise ConnectionError(f'{self.host}{path}: {e}') from e
+            if resp.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+        jar = SimpleCookie()
+        for header in resp.headers.get_all('Set-Cookie') or []:
+            jar.load(header)
+        if jar:
+            with self._lock:
+                self.cookies.update({k: m.value for k, m in jar.items()})
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(self.prefix + path, resp.status, resp.reason, resp.headers, None)
+        return body
+
+    def get_json(self, path, params=None, limiter=None, retries=4, backoff=1.0, headers=None):
+        def once():
+            if limiter is not None:
+                limiter.acquire()
+            return json.loads(self.request(path, params, headers))
+
+        return with_retries(once, retries, backoff)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class Progress:
+    """JSON file of finished keys, rewritten atomically after each one."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        try:
+            self.state = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            self.state = {'done': [], 'failed': {}}
+        self.done = set(self.state['done'])
+
+    def mark(self, key, error=None):
+        with self.lock:
+            if error is None:
+                self.done.add(key)
+                self.state['failed'].pop(key, None)
+            else:
+                self.state['failed'][key] = str(error)
+            self.state['done'] = sorted(self.done)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self.state, indent=1))
+            os.replace(tmp, self.path)
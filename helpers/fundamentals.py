@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Parallel, cached fundamentals harvester (replaces previous/yfin/yfin_get.py).
+
+Fans out over (ticker, dataset) pairs with a bounded thread pool and a
+shared rate limiter. Every raw response is cached on disk per
+(ticker, dataset) with its own TTL, so reruns only refetch what has
+gone stale. Everything parsed lands in ONE long table:
+
+    ticker | dataset | period | item | field | value | text | fetched_at
+
+`period` is the statement/report date (or '' for point-in-time data),
+`item` identifies a row inside list datasets (holder name, option
+contract, news id), numeric values go in `value`, everything else in
+`text`. The table is kept at <store>/_fundamentals/fundamentals.parquet.
+
+    python -m helpers.fundamentals INFY TCS TRENT
+    python -m helpers.fundamentals INFY --datasets income_stmt splits dividends
+
+Point --base-url (and --cookie-url '') at a local fake of the Yahoo
+endpoints to test without the network.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+import pandas as pd
+
+from .fetch import RateLimiter, get_bytes, get_json
+from .load_cache import CACHE_DIR
+from .nse_store import store_root
+
+YAHOO_BASE = 'https://query2.finance.yahoo.com'
+COOKIE_URL = 'https://fc.yahoo.com'
+TABLE_COLUMNS = ['ticker', 'dataset', 'period', 'item', 'field', 'value', 'text', 'fetched_at']
+
+DAY = 86400
+
+# dataset -> (endpoint, quoteSummary modules / chart events, path to the rows,
+#             key giving the period of a row, key identifying a row, ttl seconds)
+DATASETS = {
+    'income_stmt':             ('summary', 'incomeStatementHistory',
+                                ['incomeStatementHistory', 'incomeStatementHistory'], 'endDate', None, 7 * DAY),
+    'income_stmt_quarterly':   ('summary', 'incomeStatementHistoryQuarterly',
+                                ['incomeStatementHistoryQuarterly', 'incomeStatementHistory'], 'endDate', None, 7 * DAY),
+    'balance_sheet':           ('summary', 'balanceSheetHistory',
+                                ['balanceSheetHistory', 'balanceSheetStatements'], 'endDate', None, 7 * DAY),
+    'balance_sheet_quarterly': ('summary', 'balanceSheetHistoryQuarterly',
+                                ['balanceSheetHistoryQuarterly', 'balanceSheetStatements'], 'endDate', None, 7 * DAY),
+    'cashflow':                ('summary', 'cashflowStatementHistory',
+                                ['cashflowStatementHistory', 'cashflowStatements'], 'endDate', None, 7 * DAY),
+    'cashflow_quarterly':      ('summary', 'cashflowStatementHistoryQuarterly',
+                                ['cashflowStatementHistoryQuarterly', 'cashflowStatements'], 'endDate', None, 7 * DAY),
+    'earnings':                ('summary', 'earnings',
+                                ['earnings', 'financialsChart', 'yearly'], 'date', None, 7 * DAY),
+    'info':                    ('summary', 'summaryDetail,defaultKeyStatistics,financialData,price',
+                                [], None, None, DAY),
+    'major_holders':           ('summary', 'majorHoldersBreakdown',
+                                ['majorHoldersBreakdown'], None, None, 7 * DAY),
+    'institutional_holders':   ('summary', 'institutionOwnership',
+                                ['institutionOwnership', 'ownershipList'], 'reportDate', 'organization', 7 * DAY),
+    'recommendations':         ('summary', 'recommendationTrend',
+                                ['recommendationTrend', 'trend'], 'period', None, DAY),
+    'sustainability':          ('summary', 'esgScores',
+                                ['esgScores'], None, None, 30 * DAY),
+    'dividends':               ('chart', 'div',
+                                ['events', 'dividends'], 'date', None, DAY),
+    'splits':                  ('chart', 'splits',
+                                ['events', 'splits'], 'date', None, DAY),
+    'options':                 ('options', None,
+                                [], 'expiration', 'contractSymbol', 3600),
+    'news':                    ('news', None,
+                                ['news'], 'providerPublishTime', 'uuid', 3600),
+}
+
+
+class YahooClient:
+    """Cookie/crumb-aware JSON client sharing one rate limiter across threads."""
+
+    def __init__(self, base_url=YAHOO_BASE, cookie_url=COOKIE_URL, rate=4.0, retries=3, backoff=1.0):
+        self.base_url = base_url.rstrip('/')
+        self.cookie_url = cookie_url
+        self.limiter = RateLimiter(rate, burst=max(1, int(rate)))
+        self.retries, self.backoff = retries, backoff
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        self._crumb = None
+        self._lock = threading.Lock()
+
+    def crumb(self):
+        with self._lock:
+            if self._crumb is None:
+                if self.cookie_url:
+                    try:
+                        self.opener.open(self.cookie_url, timeout=10).close()
+                    except Exception:
+                        pass    # fc.yahoo.com answers 404 but still sets the cookie
+                self._crumb = get_bytes(f'{self.base_url}/v1/test/getcrumb', self.limiter,
+                                        self.retries, self.backoff, opener=self.opener).decode().strip()
+            return self._crumb
+
+    def get(self, path, **params):
+        query = urlencode({**params, 'crumb': self.crumb()})
+        return get_json(f'{self.base_url}{path}?{query}', self.limiter,
+                        self.retries, self.backoff, opener=self.opener)
+
+    def fetch(self, ticker, dataset):
+        endpoint, arg = DATASETS[dataset][:2]
+        t = quote(ticker)
+        if endpoint == 'summary':
+            res = self.get(f'/v10/finance/quoteSummary/{t}', modules=arg)['quoteSummary']['result']
+            return res[0] if res else {}
+        if endpoint == 'chart':
+            res = self.get(f'/v8/finance/chart/{t}', range='max', interval='1d', events=arg)['chart']['result']
+            return res[0] if res else {}
+        if endpoint == 'options':
+            res = self.get(f'/v7/finance/options/{t}')['optionChain']['result']
+            return res[0] if res else {}
+        return self.get('/v1/finance/search', q=ticker, quotesCount=0, newsCount=20)
+
+
+class FundamentalsCache:
+    """Raw responses on disk, one JSON file per (ticker, dataset), with TTLs."""
+
+    def __init__(self, cache_dir=None):
+        self.dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR / 'fundamentals'
+
+    def path(self, ticker, dataset):
+        return self.dir / ticker / f'{dataset}.json'
+
+    def get(self, ticker, dataset, ttl=None):
+        """(payload, fetched_at) if cached and younger than ttl, else None."""
+        ttl = DATASETS[dataset][5] if ttl is None else ttl
+        try:
+            entry = json.loads(self.path(ticker, dataset).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - entry['fetched_at'] > ttl:
+            return None
+        return entry['payload'], entry['fetched_at']
+
+    def put(self, ticker, dataset, payload):
+        p = self.path(ticker, dataset)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fetched_at = time.time()
+        tmp = p.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'fetched_at': fetched_at, 'payload': payload}))
+        os.replace(tmp, p)
+        return fetched_at
+
+
+def _scalar(v):
+    """(value, text) for one field; Yahoo wraps numbers as {'raw': .., 'fmt': ..}."""
+    if isinstance(v, dict):
+        v = v.get('raw', v.get('fmt'))
+    if isinstance(v, bool):
+        return float(v), None
+    if isinstance(v, (int, float)):
+        return float(v), None
+    if isinstance(v, str):
+        return None, v
+    return None, None
+
+
+def _period(v):
+    value, text = _scalar(v)
+    if value is not None and value > 1e8:      # epoch seconds
+        return pd.Timestamp(int(value), unit='s').strftime('%Y-%m-%d')
+    return text if text is not None else ('' if value is None else f'{value:g}')
+
+
+def _dig(obj, path):
+    for key in path:
+        obj = obj.get(key, {}) if isinstance(obj, dict) else {}
+    return obj
+
+
+def parse_payload(payload, dataset):
+    """Flatten one raw response into long rows (period, item, field, value, text)."""
+    _, _, path, period_key, item_key, _ = DATASETS[dataset]
+    if dataset == 'options':
+        chains = payload.get('options') or []
+        rows = [dict(r, side=side) for chain in chains
+                for side in ('calls', 'puts') for r in chain.get(side, [])]
+    elif dataset == 'info':
+        rows = [{k: v for module in payload.values() if isinstance(module, dict)
+                 for k, v in module.items()}]
+    else:
+        rows = _dig(payload, path)
+        if isinstance(rows, dict):
+            # chart events are keyed by timestamp; summary modules are one flat record
+            rows = list(rows.values()) if dataset in ('dividends', 'splits') else [rows]
+
+    out = []
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        period = _period(row.get(period_key)) if period_key else ''
+        item = str(_scalar(row.get(item_key))[1] or '') if item_key else ''
+        for field, v in row.items():
+            if field in (period_key, item_key, 'maxAge'):
+                continue
+            value, text = _scalar(v)
+            if value is None and text is None:
+                continue
+            out.append((period, item, field, value, text))
+    return out
+
+
+def table_path(root=None):
+    return store_root(root) / '_fundamentals' / 'fundamentals.parquet'
+
+
+def load_fundamentals(root=None, tickers=None, datasets=None):
+    """Read the consolidated table, optionally filtered."""
+    df = pd.read_parquet(table_path(root))
+    if tickers is not None:
+        df = df[df['ticker'].isin(tickers)]
+    if datasets is not None:
+        df = df[df['dataset'].isin(datasets)]
+    return df.reset_index(drop=True)
+
+
+def statement(df, ticker, dataset):
+    """One statement as a wide frame: fields x periods (like yfinance's tables)."""
+    sub = df[(df['ticker'] == ticker) & (df['dataset'] == dataset)]
+    return sub.pivot_table(index='field', columns='period', values='value', aggfunc='last')
+
+
+def harvest(tickers, datasets=None, workers=8, rate=4.0, retries=3, root=None,
+            cache_dir=None, base_url=YAHOO_BASE, cookie_url=COOKIE_URL, force=False):
+    """
+    Fetch (or reuse cached) datasets for all tickers in parallel, merge them
+    into the consolidated table and return the rows for this run.
+    """
+    datasets = list(DATASETS) if datasets is None else datasets
+    cache = FundamentalsCache(cache_dir)
+    client = YahooClient(base_url, cookie_url, rate, retries)
+
+    def one(ticker, dataset):
+        hit = None if force else cache.get(ticker, dataset)
+        if hit is None:
+            payload = client.fetch(ticker, dataset)
+            hit = payload, cache.put(ticker, dataset, payload)
+        payload, fetched_at = hit
+        rows = parse_payload(payload, dataset)
+        return pd.DataFrame(rows, columns=['period', 'item', 'field', 'value', 'text']).assign(
+            ticker=ticker, dataset=dataset, fetched_at=pd.Timestamp(fetched_at, unit='s'))
+
+    frames, failed = [], {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(one, t, d): (t, d) for t in tickers for d in datasets}
+        for fut in as_completed(futures):
+            try:
+                frames.append(fut.result())
+            except Exception as e:
+                failed[futures[fut]] = str(e)
+    for (t, d), err in sorted(failed.items()):
+        print(f"  {t:<12} {d:<24} FAILED: {err}")
+
+    new = pd.concat(frames, ignore_index=True)[TABLE_COLUMNS] if frames else pd.DataFrame(columns=TABLE_COLUMNS)
+    path = table_path(root)
+    if path.exists():
+        old = pd.read_parquet(path)
+        done = pd.MultiIndex.from_frame(new[['ticker', 'dataset']].drop_duplicates())
+        keep = ~pd.MultiIndex.from_frame(old[['ticker', 'dataset']]).isin(done)
+        table = pd.concat([old[keep], new], ignore_index=True)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = new
+    table = table.astype({'period': str, 'item': str, 'field': str, 'value': 'float64', 'text': object})
+    table.sort_values(['ticker', 'dataset', 'period', 'item', 'field'], kind='mergesort').to_parquet(path, index=False)
+    return new
+
+
+def main():
+    p = argparse.ArgumentParser(description="Harvest Yahoo fundamentals for many tickers into one table")
+    p.add_argument('tickers', nargs='+', help="Tickers, e.g. INFY or INFY.NS")
+    p.add_argument('--suffix',     default='.NS', help="Suffix added to tickers without one")
+    p.add_argument('--datasets',   nargs='+', choices=list(DATASETS), default=None, help="Default: all")
+    p.add_argument('--workers',    type=int, default=8)
+    p.add_argument('--rate',       type=float, default=4.0, help="Max requests per second")
+    p.add_argument('--force',      action='store_true', help="Ignore cached responses")
+    p.add_argument('--root',       default=None, help="Store directory")
+    p.add_argument('--base-url',   default=YAHOO_BASE)
+    p.add_argument('--cookie-url', default=COOKIE_URL, help="'' to skip cookie seeding")
+    args = p.parse_args()
+
+    tickers = [t if '.' in t else t + args.suffix for t in args.tickers]
+    rows = harvest(tickers, args.datasets, args.workers, args.rate, root=args.root,
+                   base_url=args.base_url, cookie_url=args.cookie_url or None, force=args.force)
+    print(f"{len(rows):,} rows for {len(tickers)} tickers -> {table_path(args.root)}")
+    print(rows.groupby(['ticker', 'dataset']).size().unstack(fill_value=0).to_string())
+
+
+if __name__ == '__main__':
+    main()
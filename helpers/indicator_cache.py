@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of computed indicator arrays.
+
+An entry is one indicator with one parameter set for one symbol. It is
+looked up by (symbol, indicator, params) and is valid for the price
+data it was computed from, identified by a content hash of the input
+columns and dates. Values are stored as .npy files and come back
+memory-mapped, so re-running a script with a different threshold only
+maps the old arrays in:
+
+    from helpers.indicator_cache import cached_indicator
+
+    macd, sig, hist = cached_indicator(df, 'macd', fast=12, slow=26, signal=9)
+    atr = cached_indicator(df, 'atr', n=14)
+
+When the store gains new days the stored rows hash the same, so the
+entry is extended rather than rebuilt: indicators with a streaming form
+(helpers/streaming.py) run over the new bars only, from the state saved
+by the previous extension (warmed over the cached bars the first time an
+entry is extended, so a plain miss costs one batch pass); the rest are
+recomputed. Any change to already-cached rows
+(a corrected print, a replaced day) changes the hash and the entry is
+rebuilt. Total size is capped; least recently used entries go first.
+
+    <cache>/indicators/<key>.npy      values, [bars] or [outputs x bars]
+    <cache>/indicators/<key>.state    pickled streaming state after the last bar,
+                                      once the entry has been extended
+    <cache>/indicators/index.json
+
+    python -m helpers.indicator_cache info
+    python -m helpers.indicator_cache clear [--symbol TRENT]
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import indicators as ind
+from . import streaming
+from .load_cache import CACHE_DIR
+
+MAX_BYTES = int(os.environ.get('NSE_INDICATOR_CACHE_MAX_BYTES', 1024 * 2**20))
+INDEX = 'index.json'
+VERSION = 3         # part of every key; bump when a kernel's output changes
+
+
+class Spec:
+    """How to compute one indicator: batch kernel, streaming factory, input fields."""
+
+    def __init__(self, batch, stream=None, inputs=None):
+        self.batch = batch
+        self.stream = stream
+        self.inputs = inputs            # None: a single `field` parameter (default Close)
+        args = list(inspect.signature(batch).parameters.values())[len(inputs or (None,)):]
+        self.params = [a.name for a in args]
+        self.defaults = {a.name: a.default for a in args if a.default is not inspect.Parameter.empty}
+
+
+HLC = ('High', 'Low', 'Close')
+INDICATORS = {
+    'sma':              Spec(ind.sma, streaming.SMA),
+    'ema':              Spec(ind.ema, streaming.EMA),
+    'roc':              Spec(ind.roc),
+    'rolling_max':      Spec(ind.rolling_max, streaming.RollingMax),
+    'rolling_min':      Spec(ind.rolling_min, streaming.RollingMin),
+    'rolling_quantile': Spec(ind.rolling_quantile, streaming.RollingQuantile),
+    'rsi':              Spec(ind.rsi, streaming.RSI),
+    'macd':             Spec(ind.macd, streaming.MACD),
+    'kama':             Spec(ind.kama, streaming.KAMA),
+    'vidya':            Spec(ind.vidya, streaming.VIDYA),
+    'true_range':       Spec(ind.true_range, streaming.TrueRange, HLC),
+    'atr':              Spec(ind.atr, streaming.ATR, HLC),
+    'stochastic':       Spec(ind.stochastic, streaming.Stochastic, HLC),
+}
+
+
+def _hash_columns(dates, cols, rows=None):
+    h = hashlib.blake2b(digest_size=16)
+    for a in [dates] + cols:
+        h.update(np.ascontiguousarray(a[:rows]).tobytes())
+    return h.hexdigest()
+
+
+class IndicatorCache:
+    """Indicator arrays keyed by (symbol, indicator, params), validated by data hash."""
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR / 'indicators'
+        self.max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.dir / INDEX
+        self.index = self._read_index()
+
+    def _read_index(self):
+        try:
+            return json.loads(self._index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {'entries': {}}
+
+    def _write_index(self):
+        tmp = self._index_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.index))
+        os.replace(tmp, self._index_path)
+
+    @staticmethod
+    def entry_key(symbol, name, params):
+        text = json.dumps([VERSION, symbol, name, params], sort_keys=True, default=str)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _save(self, key, values, state):
+        tmp = self.dir / f'{key}.tmp.npy'
+        np.save(tmp, values)
+        os.replace(tmp, self.dir / f'{key}.npy')
+        if state is not None:
+            tmp = self.dir / f'{key}.state.tmp'
+            tmp.write_bytes(pickle.dumps(state))
+            os.replace(tmp, self.dir / f'{key}.state')
+        else:
+            (self.dir / f'{key}.state').unlink(missing_ok=True)
+
+    def get(self, symbol, df, name, **params):
+        """
+        Indicator `name` over the Date-indexed frame `df` for `symbol`.
+        Returns a read-only array (memory-mapped when served from disk), or
+        a tuple of arrays for multi-output indicators (macd, stochastic).
+        """
+        spec = INDICATORS[name]
+        field = params.pop('field', 'Close')
+        unknown = set(params) - set(spec.params)
+        missing = set(spec.params) - set(params) - set(spec.defaults)
+        if unknown or missing:
+            raise TypeError(f'{name}(): unexpected {sorted(unknown)}, missing {sorted(missing)}')
+        params = {**spec.defaults, **params}
+        fields = list(spec.inputs or (field,))
+        dates = np.asarray(df.index)
+        cols = [df[f].to_numpy(dtype=np.float64) for f in fields]
+
+        key = self.entry_key(symbol, name, {**params, 'fields': fields})
+        meta = self.index['entries'].get(key)
+        path = self.dir / f'{key}.npy'
+        rows = len(dates)
+        values = None
+        if meta is not None and path.exists() and meta['rows'] <= rows \
+                and meta['hash'] == _hash_columns(dates, cols, meta['rows']):
+            if meta['rows'] == rows:
+                values = np.load(path, mmap_mode='r')
+            else:
+                values = self._extend(key, meta, np.load(path), spec, params, cols)
+        if values is None:
+            values = self._compute(key, spec, params, cols)
+        self.index['entries'][key] = {'symbol': symbol, 'indicator': name, 'rows': rows,
+                                      'hash': _hash_columns(dates, cols),
+                                      'bytes': path.stat().st_size, 'used': time.time()}
+        self.evict(keep=key)
+        self._write_index()
+        return tuple(values) if values.ndim == 2 else values
+
+    def _compute(self, key, spec, params, cols):
+        out = spec.batch(*cols, **params)
+        values = np.stack(out) if isinstance(out, tuple) else np.asarray(out)
+        self._save(key, values, None)
+        return np.load(self.dir / f'{key}.npy', mmap_mode='r')
+
+    def _extend(self, key, meta, old, spec, params, cols):
+        """Append values for the bars after meta['rows']; None if not resumable."""
+        state_path = self.dir / f'{key}.state'
+        if spec.stream is None:
+            return None
+        stream = spec.stream(**params)
+        n = meta['rows']
+        if state_path.exists():
+            stream.restore(pickle.loads(state_path.read_bytes()))
+        else:
+            stream.warm(*(c[:n] for c in cols))
+        tail = []
+        for t in range(n, len(cols[0])):
+            v = stream.update(*(c[t] for c in cols))
+            tail.append(np.stack(v) if isinstance(v, tuple) else v)
+        values = np.concatenate([old, np.stack(tail, axis=-1)], axis=-1)
+        self._save(key, values, stream.snapshot())
+        return np.load(self.dir / f'{key}.npy', mmap_mode='r')
+
+    def evict(self, keep=None):
+        """Drop least recently used entries (other than `keep`) until under max_bytes."""
+        entries = self.index['entries']
+        total = sum(e['bytes'] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._remove(key)
+            total -= entries.pop(key)['bytes']
+
+    def _remove(self, key):
+        (self.dir / f'{key}.npy').unlink(missing_ok=True)
+        (self.dir / f'{key}.state').unlink(missing_ok=True)
+
+    def invalidate(self, symbol=None):
+        """Forget every entry of `symbol` (all entries if None)."""
+        for key in [k for k, e in self.index['entries'].items() if symbol is None or e['symbol'] == symbol]:
+            self._remove(key)
+            del self.index['entries'][key]
+        self._write_index()
+
+
+def cached_indicator(df, name, symbol=None, cache_dir=None, **params):
+    """
+    IndicatorCache.get() returning pandas objects on df's index. `symbol`
+    defaults to the frame's Symbol column.
+    """
+    if symbol is None:
+        symbol = str(df['Symbol'].iloc[0]) if 'Symbol' in df.columns else 'unknown'
+    out = IndicatorCache(cache_dir).get(symbol, df, name, **params)
+    if isinstance(out, tuple):
+        return tuple(pd.Series(a, index=df.index) for a in out)
+    return pd.Series(out, index=df.index)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Inspect or clear the indicator cache")
+    p.add_argument('cmd', choices=['info', 'clear'])
+    p.add_argument('--symbol', default=None, help="Only this symbol (clear)")
+    p.add_argument('--dir', default=None, help=f"Cache directory (default {CACHE_DIR / 'indicators'})")
+    args = p.parse_args()
+
+    cache = IndicatorCache(args.dir)
+    if args.cmd == 'clear':
+        cache.invalidate(args.symbol)
+        print(f"Cleared {args.symbol or 'all symbols'} in {cache.dir}")
+        return
+    entries = cache.index['entries']
+    total = sum(e['bytes'] for e in entries.values())
+    print(f"{len(entries)} entries, {total / 2**20:.1f} MB of {cache.max_bytes / 2**20:.0f} MB in {cache.dir}")
+    if entries:
+        print(pd.DataFrame(entries.values())[['symbol', 'indicator', 'rows', 'bytes']]
+                .groupby(['symbol', 'indicator']).sum().to_string())
+
+
+if __name__ == '__main__':
+    main()
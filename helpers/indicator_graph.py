@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Indicator dependency graph with shared intermediates.
+
+Indicators are built from smaller nodes: true range feeds ATR, the
+close-to-close change feeds RSI gains/losses, EMA(12) and EMA(26) feed
+every MACD. Each node is a method whose result is memoized on its
+arguments, so a strategy that asks for ATR, Stochastic, RSI and MACD
+computes the true range, the price change and each EMA exactly once.
+
+    from helpers.indicator_graph import IndicatorGraph
+
+    g = IndicatorGraph(df)                      # one symbol (Date-indexed frame)
+    rsi = g.rsi(14)
+    k, d = g.stochastic(14, 3)
+    line, sig, hist = g.macd(12, 26, 9)
+    res = g.rolling_max(('prev', 'High', 1), 20)   # High.shift(1).rolling(20, min_periods=1).max()
+    print(g.timings())
+
+Sources are an input field ('Close'), a node name ('true_range') or a
+node with arguments as a tuple (('ema', 'Close', 12)). Inputs can also
+be [symbols x bars] arrays, e.g. IndicatorGraph.from_panel(open_panel()),
+and every node then covers all symbols in one call.
+
+Detectors running over the same frame in one process share a graph
+through shared(df), so the second detector reuses what the first built.
+Values are the kernels in helpers/indicators.py. Node results are
+read-only: every caller gets the same memoized array, so copy before
+editing one in place.
+"""
+import inspect
+import time
+import weakref
+from collections import Counter
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+from . import indicators as ind
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def node(fn):
+    """Memoize a graph method on its (default-filled) arguments and time it; results are read-only."""
+    sig = inspect.signature(fn)
+
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        bound = sig.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (fn.__name__,) + tuple(bound.arguments.values())[1:]
+        if key in self._memo:
+            self._hits[key] += 1
+            return self._memo[key]
+        self._stack.append(0.0)
+        t0 = time.perf_counter()
+        try:
+            out = fn(self, *args, **kwargs)
+        finally:
+            total = time.perf_counter() - t0
+            inner = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+        for a in out if isinstance(out, tuple) else (out,):
+            if isinstance(a, np.ndarray):
+                a.flags.writeable = False
+        self._memo[key] = out
+        self._seconds[key] = total - inner     # exclusive of the nodes it called
+        return out
+    return wrapper
+
+
+class IndicatorGraph:
+    """Memoized indicator nodes over one set of price arrays."""
+
+    def __init__(self, data, index=None):
+        if isinstance(data, pd.DataFrame):
+            index = data.index if index is None else index
+            data = {c: data[c].to_numpy(dtype=np.float64) for c in PRICE_FIELDS if c in data.columns}
+        self.inputs = {k: np.asarray(v) for k, v in data.items()}
+        self.index = index
+        self._memo = {}
+        self._seconds = {}
+        self._hits = Counter()
+        self._stack = []
+
+    @classmethod
+    def from_panel(cls, panel, fields=('High', 'Low', 'Close'), cols=slice(None)):
+        """[symbols x days] graph over a nse_panel.Panel (float32 stays float32)."""
+        return cls({f: panel.field(f)[:, cols] for f in fields}, index=panel.dates[cols])
+
+    # -- plumbing ----------------------------------------------------------
+
+    def src(self, source):
+        """Resolve a source: input field, zero-argument node name, or (node, *args) tuple."""
+        if isinstance(source, tuple):
+            return getattr(self, source[0])(*source[1:])
+        if source in self.inputs:
+            return self.field(source)
+        return getattr(self, source)()
+
+    def series(self, arr, name=None):
+        """Wrap a 1-D result back into a Series on the input index."""
+        return pd.Series(arr, index=self.index, name=name)
+
+    def timings(self):
+        """Per-node exclusive seconds and memo hits, slowest first."""
+        rows = [{'node': _label(k), 'seconds': s, 'hits': self._hits[k]} for k, s in self._seconds.items()]
+        return pd.DataFrame(rows, columns=['node', 'seconds', 'hits']) \
+                 .sort_values('seconds', ascending=False, kind='mergesort').reset_index(drop=True)
+
+    # -- nodes -------------------------------------------------------------
+
+    @node
+    def field(self, name):
+        return self.inputs[name]
+
+    @node
+    def prev(self, source, n=1):
+        return ind.shift(self.src(source), n)
+
+    @node
+    def diff(self, source='Close', n=1):
+        return self.src(source) - self.prev(source, n)
+
+    @node
+    def gain(self, source='Close'):
+        return np.clip(self.diff(source), 0, None)
+
+    @node
+    def loss(self, source='Close'):
+        return np.clip(-self.diff(source), 0, None)
+
+    @node
+    def true_range(self):
+        return ind.true_range(self.field('High'), self.field('Low'), self.field('Close'))
+
+    @node
+    def sma(self, source, n, min_periods=None):
+        return ind.sma(self.src(source), n, min_periods)
+
+    @node
+    def ema(self, source, span):
+        return ind.ema(self.src(source), span)
+
+    @node
+    def ema_alpha(self, source, n):
+        return ind.ema_alpha(self.src(source), n)
+
+    @node
+    def rma(self, source, n):
+        return ind.rma(self.src(source), n)
+
+    @node
+    def rolling_max(self, source, n, min_periods=1):
+        return ind.rolling_max(self.src(source), n, min_periods)
+
+    @node
+    def rolling_min(self, source, n, min_periods=1):
+        return ind.rolling_min(self.src(source), n, min_periods)
+
+    @node
+    def atr(self, n=14, method='sma', min_periods=1):
+        if method == 'sma':
+            return self.sma('true_range', n, min_periods)
+        if method == 'wilder':
+            return self.rma('true_range', n)
+        raise ValueError(f"method must be 'sma' or 'wilder', not {method!r}")
+
+    @node
+    def rsi(self, n=14, method='wilder', source='Close'):
+        avg = {'wilder': self.rma, 'tradingview': self.rma, 'ema': self.ema_alpha,
+               'cutler': self.sma, 'sma': self.sma}.get(method)
+        if avg is None:
+            raise ValueError(f"method must be one of {ind.RSI_METHODS}, not {method!r}")
+        up, down = avg(('gain', source), n), avg(('loss', source), n)
+        out = ind.rsi_from_averages(up, down, method)
+        return np.where(np.isnan(self.diff(source)), np.nan, out)
+
+    @node
+    def roc(self, n=14, source='Close'):
+        prev = self.prev(source, n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (self.src(source) - prev) / prev * 100.0
+
+    @node
+    def macd_line(self, fast=12, slow=26, source='Close'):
+        return self.ema(source, fast) - self.ema(source, slow)
+
+    @node
+    def macd(self, fast=12, slow=26, signal=9, source='Close'):
+        """(line, signal, histogram)."""
+        line = self.macd_line(fast, slow, source)
+        sig = self.ema(('macd_line', fast, slow, source), signal)
+        return line, sig, line - sig
+
+    @node
+    def stoch_k(self, k=14, min_periods=1):
+        hh, ll = self.rolling_max('High', k, min_periods), self.rolling_min('Low', k, min_periods)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (self.field('Close') - ll) / (hh - ll) * 100.0
+
+    @node
+    def stochastic(self, k=14, d=3, min_periods=1):
+        """(%K, %D)."""
+        return self.stoch_k(k, min_periods), self.sma(('stoch_k', k, min_periods), d, min_periods)
+
+
+def _label(key):
+    name, *args = key
+    return f"{name}({', '.join(repr(a) for a in args)})"
+
+
+_SHARED = {}
+
+
+def shared(data):
+    """
+    The graph for this data object, created on first use and dropped
+    when the object is garbage collected. Detectors given the same frame
+    in one run reuse each other's nodes.
+
+    The graph is keyed on id(data) and memoizes each node the first time
+    it is asked for, so it goes stale if the frame's price columns are
+    edited in place afterwards (adding new columns is fine): build a
+    fresh IndicatorGraph(df) after changing prices.
+    """
+    entry = _SHARED.get(id(data))
+    if entry is not None and entry[0]() is data:
+        return entry[1]
+    g = IndicatorGraph(data)
+    key = id(data)
+    _SHARED[key] = (weakref.ref(data, lambda _: _SHARED.pop(key, None)), g)
+    return g
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Indicator kernels over [symbols x bars] arrays, with pandas wrappers.
+
+Every kernel takes 1-D (one symbol) or 2-D arrays shaped
+[symbols x bars] and computes all rows in one call:
+
+    from helpers.indicators import atr
+    from helpers.nse_panel import open_panel
+
+    p = open_panel()
+    a = atr(p.field('High'), p.field('Low'), p.field('Close'), 14)   # [symbols x days]
+
+Conventions, chosen to match what the scripts already compute:
+
+* NaN bars (a symbol not yet listed, a missing day) are skipped: rolling
+  windows count them as empty slots, recursive averages hold their state
+  across them and repeat it.
+* ema() is pandas' ewm(adjust=False): seeded with the first value;
+  rma() is Wilder's smoothing seeded with an n-bar SMA, as in TA-Lib.
+* Rolling outputs need `min_periods` valid values (default: the window).
+* float32 input gives float32 output; sums and recursions run in float64.
+
+The compute_* functions take and return pandas objects (a Series, or a
+wide frame with one column per symbol) and are drop-in replacements
+for the per-script copies:
+
+    df['ATR'] = compute_atr(df, 14)                      # SMA of true range, min_periods=1
+    df['RSI'] = compute_rsi(df['Close'], 14)             # Wilder (TA-Lib); see rsi() for methods
+    macd, sig, hist = compute_macd(df['Close'])
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _prep(x):
+    """(float64 2-D view/copy, original ndim, output dtype)."""
+    a = np.asarray(x)
+    out = np.result_type(a.dtype, np.float32) if a.dtype.kind == 'f' else np.float64
+    return np.atleast_2d(a).astype(np.float64, copy=False), a.ndim, out
+
+
+def _done(res, ndim, dtype):
+    res = res.astype(dtype, copy=False)
+    return res[0] if ndim == 1 else res
+
+
+def shift(x, n=1):
+    """Shift along bars, NaN-filled (pandas .shift(n))."""
+    a, ndim, dtype = _prep(x)
+    out = np.full_like(a, np.nan)
+    if n >= 0:
+        out[:, n:] = a[:, :a.shape[1] - n]
+    else:
+        out[:, :n] = a[:, -n:]
+    return _done(out, ndim, dtype)
+
+
+def _windows(a, n):
+    """[rows x bars x n] view of the n bars ending at each bar, NaN-padded at the start."""
+    pad = np.full((a.shape[0], n - 1), np.nan)
+    return sliding_window_view(np.concatenate([pad, a], axis=1), n, axis=1)
+
+
+def _window_sums(a, n):
+    """Rolling sum and count of non-NaN values over the last n bars."""
+    valid = ~np.isnan(a)
+    zero = np.zeros((a.shape[0], 1))
+    cs = np.concatenate([zero, np.cumsum(np.where(valid, a, 0.0), axis=1)], axis=1)
+    cn = np.concatenate([zero, np.cumsum(valid, axis=1)], axis=1)
+    lag = np.maximum(np.arange(1, a.shape[1] + 1) - n, 0)
+    return cs[:, 1:] - cs[:, lag], cn[:, 1:] - cn[:, lag]
+
+
+def sma(x, n, min_periods=None):
+    """Simple moving average (rolling(n, min_periods).mean())."""
+    a, ndim, dtype = _prep(x)
+    total, count = _window_sums(a, n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = total / count
+    out[count < (n if min_periods is None else min_periods)] = np.nan
+    return _done(out, ndim, dtype)
+
+
+def _recursive(a, alpha):
+    """y = alpha*x + (1-alpha)*y_prev per row, seeded with the first value; NaN holds state."""
+    out = np.empty_like(a)
+    state = np.full(a.shape[0], np.nan)
+    for t in range(a.shape[1]):
+        v = a[:, t]
+        upd = alpha * v + (1.0 - alpha) * state
+        state = np.where(np.isnan(v), state, np.where(np.isnan(state), v, upd))
+        out[:, t] = state
+    return out
+
+
+def ema(x, span=None, alpha=None):
+    """Exponential moving average, pandas ewm(span|alpha, adjust=False).mean()."""
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+    a, ndim, dtype = _prep(x)
+    return _done(_recursive(a, alpha), ndim, dtype)
+
+
+def sma_grid(x, windows, min_periods=None):
+    """
+    Every SMA in `windows` (e.g. range(5, 251)) from one cumulative sum,
+    as one contiguous [windows x bars] array ([windows x symbols x bars]
+    for 2-D input). min_periods=None means each window's own length.
+    Crossover sweeps index rows instead of recomputing:
+
+        g = sma_grid(close, range(5, 251))
+        fast_above_slow = g[10 - 5] > g[30 - 5]
+    """
+    a, ndim, dtype = _prep(x)
+    windows = [int(n) for n in windows]
+    valid = ~np.isnan(a)
+    zero = np.zeros((a.shape[0], 1))
+    cs = np.concatenate([zero, np.cumsum(np.where(valid, a, 0.0), axis=1)], axis=1)
+    cn = np.concatenate([zero, np.cumsum(valid, axis=1)], axis=1)
+    end = np.arange(1, a.shape[1] + 1)
+    out = np.empty((len(windows),) + a.shape, dtype=dtype)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for i, n in enumerate(windows):
+            lag = np.maximum(end - n, 0)
+            count = cn[:, 1:] - cn[:, lag]
+            m = (cs[:, 1:] - cs[:, lag]) / count
+            m[count < (n if min_periods is None else min_periods)] = np.nan
+            out[i] = m
+    return out[:, 0] if ndim == 1 else out
+
+
+def ema_grid(x, spans):
+    """
+    EMAs for many spans in one recursion over bars, each row seeded like
+    ema(): [spans x bars] or [spans x symbols x bars].
+    """
+    a, ndim, dtype = _prep(x)
+    spans = np.asarray(spans, dtype=np.float64)
+    alpha = np.repeat(2.0 / (spans + 1.0), a.shape[0])              # one per (span, symbol) row
+    stacked = np.broadcast_to(a, (len(spans),) + a.shape).reshape(-1, a.shape[1])
+    out = _recursive(stacked, alpha).reshape((len(spans),) + a.shape).astype(dtype, copy=False)
+    return out[:, 0] if ndim == 1 else out
+
+
+def ema_alpha(x, n):
+    """ema() with alpha = 1/n, seeded with the first value (ewm(com=n-1, adjust=False)); see rma()."""
+    return ema(x, alpha=1.0 / n)
+
+
+def roc(x, n):
+    """Rate of change in percent over n bars."""
+    a, ndim, dtype = _prep(x)
+    prev = shift(a, n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _done((a - prev) / prev * 100.0, ndim, dtype)
+
+
+RSI_METHODS = ('wilder', 'tradingview', 'cutler', 'sma', 'ema')
+
+
+def _seeded(a, alpha, base):
+    """
+    y = alpha*x + (1-alpha)*y_prev per row, started from base[:, t] on the
+    first bar where base is valid; NaN holds state.
+    """
+    out = np.empty_like(a)
+    state = np.full(a.shape[0], np.nan)
+    for t in range(a.shape[1]):
+        v = a[:, t]
+        upd = alpha * v + (1.0 - alpha) * state
+        state = np.where(np.isnan(v), state, np.where(np.isnan(state), base[:, t], upd))
+        out[:, t] = state
+    return out
+
+
+def rma(x, n):
+    """
+    Wilder's smoothing as TA-Lib and TradingView run it: the first value
+    is the n-bar SMA, then alpha = 1/n. ema_alpha() is the same recursion
+    seeded with the first value instead.
+    """
+    a, ndim, dtype = _prep(x)
+    return _done(_seeded(a, 1.0 / n, sma(a, n)), ndim, dtype)
+
+
+def rsi_from_averages(up, down, method='wilder'):
+    """
+    100 * up / (up + down) from average gain and loss, with each method's
+    answer for a zero average loss: 'wilder' (TA-Lib) gives 0 when both
+    are zero, 'tradingview' gives 100 whenever the loss is zero, the others
+    leave 0/0 as NaN like the pandas formula in the scripts.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = 100.0 * up / (up + down)
+    if method == 'wilder':
+        out = np.where((up == 0) & (down == 0), 0.0, out)
+    elif method == 'tradingview':
+        out = np.where(down == 0, 100.0, out)
+    return out
+
+
+def rsi(close, n=14, method='wilder'):
+    """
+    Relative Strength Index; rsi_grid() for several periods at once.
+
+    method:
+      'wilder'       TA-Lib RSI: gains/losses averaged with rma() (SMA of the
+                     first n changes, then alpha=1/n); first value on bar n
+      'tradingview'  Pine's ta.rsi(): the same averages, 100 on a zero loss
+      'cutler'/'sma' plain n-bar mean of gains and losses (momentum.py)
+      'ema'          ema_alpha(): ewm(com=n-1, adjust=False) from the first
+                     change (breakout/overbought.py)
+    """
+    return rsi_grid(close, [n], method)[0]
+
+
+def rsi_grid(close, periods, method='wilder'):
+    """
+    RSI for every period in `periods` from one price change, as
+    [periods x bars] or [periods x symbols x bars]. The smoothing
+    recursion runs over all (period, symbol) rows together.
+    """
+    if method not in RSI_METHODS:
+        raise ValueError(f"method must be one of {RSI_METHODS}, not {method!r}")
+    a, ndim, dtype = _prep(close)
+    periods = [int(n) for n in periods]
+    delta = a - shift(a, 1)
+    rows = (len(periods),) + a.shape
+    avgs = []
+    for g in (np.clip(delta, 0, None), np.clip(-delta, 0, None)):
+        if method in ('cutler', 'sma'):
+            avgs.append(sma_grid(g, periods))
+            continue
+        alpha = np.repeat(1.0 / np.asarray(periods, dtype=np.float64), a.shape[0])
+        x = np.broadcast_to(g, rows).reshape(-1, a.shape[1])
+        if method == 'ema':
+            avg = _recursive(x, alpha)
+        else:
+            avg = _seeded(x, alpha, sma_grid(g, periods).reshape(-1, a.shape[1]))
+        avgs.append(avg.reshape(rows))
+    out = rsi_from_averages(*avgs, method)
+    out[:, np.isnan(delta)] = np.nan
+    out = out.astype(dtype, copy=False)
+    return out[:, 0] if ndim == 1 else out
+
+
+def true_range(high, low, close):
+    """max(H-L, |H-prevC|, |L-prevC|); the first bar is H-L."""
+    h, ndim, dtype = _prep(high)
+    l, c = _prep(low)[0], _prep(close)[0]
+    pc = shift(c, 1)
+    with np.errstate(invalid='ignore'):
+        tr = np.fmax(h - l, np.fmax(np.abs(h - pc), np.abs(l - pc)))
+    tr[np.isnan(h - l)] = np.nan
+    return _done(tr, ndim, dtype)
+
+
+def atr(high, low, close, n=14, method='sma', min_periods=1):
+    """
+    Average True Range. method='sma' is the rolling mean the scripts use
+    (min_periods=1 by default, as most of them do); method='wilder' is
+    Wilder's smoothing, rma(): the SMA of the first n true ranges, then
+    alpha = 1/n (TradingView's ta.atr).
+    """
+    tr = true_range(high, low, close)
+    if method == 'sma':
+        return sma(tr, n, min_periods)
+    if method == 'wilder':
+        return rma(tr, n)
+    raise ValueError(f"method must be 'sma' or 'wilder', not {method!r}")
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """(MACD line, signal line, histogram) from EMAs with adjust=False."""
+    line = ema(close, fast) - ema(close, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+def rolling_max(x, n, min_periods=1):
+    """Max over the last n bars (NaNs ignored)."""
+    return rolling_extremes(x, [n], 'max', min_periods)[0]
+
+
+def rolling_min(x, n, min_periods=1):
+    """Min over the last n bars (NaNs ignored)."""
+    return rolling_extremes(x, [n], 'min', min_periods)[0]
+
+
+def rolling_extremes(x, lookbacks, how='max', min_periods=1, index=False):
+    """
+    Rolling max (or min) for several lookbacks at once, stacked as
+    [lookbacks x symbols x bars] ([lookbacks x bars] for 1-D input).
+    With index=True also returns the bar position of each extreme
+    (earliest one on ties, -1 where the window has < min_periods values).
+
+    Sparse table: level k holds the extreme of the 2**k bars ending at
+    each bar, built by doubling. A window of n bars is the overlap of two
+    level-floor(log2 n) blocks, so every lookback costs O(bars) once its
+    level exists and the whole call is O(bars * log2(max lookback)).
+    Resistance as the scripts use it is the window before today:
+
+        res = rolling_extremes(shift(high, 1), [10, 20, 55, 252])
+    """
+    if how not in ('max', 'min'):
+        raise ValueError(f"how must be 'max' or 'min', not {how!r}")
+    lookbacks = [int(n) for n in np.atleast_1d(lookbacks)]
+    if min(lookbacks) < 1:
+        raise ValueError('lookbacks must be >= 1')
+    ndim, dtype = _prep(x)[1:]
+    # comparisons are exact, so stay in the input precision
+    a = np.atleast_2d(np.asarray(x)).astype(dtype, copy=False)
+    fill, op, better = (-np.inf, np.maximum, np.greater) if how == 'max' else (np.inf, np.minimum, np.less)
+    bars = a.shape[1]
+    valid = np.concatenate([np.zeros((a.shape[0], 1), np.int64), np.cumsum(~np.isnan(a), axis=1)], axis=1)
+
+    def pick(lv, li, rv, ri):
+        if li is None:
+            return op(lv, rv), None
+        left = ~better(rv, lv)          # ties keep the earlier bar
+        return np.where(left, lv, rv), np.where(left, li, ri)
+
+    vals = np.empty((len(lookbacks),) + a.shape, dtype=dtype)
+    idxs = np.empty((len(lookbacks),) + a.shape, dtype=np.int64) if index else None
+    level_v = np.where(np.isnan(a), fill, a).astype(dtype, copy=False)
+    level_i = np.broadcast_to(np.arange(bars), a.shape).copy() if index else None
+    k = 0
+    for j in np.argsort(lookbacks, kind='stable'):
+        n = lookbacks[j]
+        while (2 << k) <= n:
+            h = 1 << k
+            nv = level_v.copy()
+            ni = level_i.copy() if index else None
+            hv, hi = pick(level_v[:, :-h], level_i[:, :-h] if index else None, level_v[:, h:],
+                          level_i[:, h:] if index else None)
+            nv[:, h:] = hv
+            if index:
+                ni[:, h:] = hi
+            level_v, level_i, k = nv, ni, k + 1
+        # [t-n+1, t] = block ending at t-n+2**k  +  block ending at t
+        w = min(n - (1 << k), bars)
+        lv, li = level_v.copy(), level_i.copy() if index else None
+        lv[:, w:], lv[:, :w] = level_v[:, :bars - w], fill
+        if index:
+            li[:, w:] = level_i[:, :bars - w]
+        v, i = pick(lv, li, level_v, level_i)
+        count = valid[:, 1:] - valid[:, np.maximum(np.arange(1, bars + 1) - n, 0)]
+        bad = (count < min_periods) | np.isinf(v)
+        vals[j] = np.where(bad, np.nan, v)
+        if index:
+            idxs[j] = np.where(bad, -1, i)
+    if ndim == 1:
+        vals = vals[:, 0]
+        idxs = idxs[:, 0] if index else None
+    return (vals, idxs) if index else vals
+
+
+def donchian(high, low, lookbacks, exclude_current=True):
+    """
+    Donchian channels (upper, lower) for several lookbacks, each
+    [lookbacks x symbols x bars]. exclude_current uses the bars before
+    today, i.e. high.shift(1).rolling(n).max(), the breakout convention.
+    """
+    if exclude_current:
+        high, low = shift(high, 1), shift(low, 1)
+    return (rolling_extremes(high, lookbacks, 'max', min_periods=1),
+            rolling_extremes(low, lookbacks, 'min', min_periods=1))
+
+
+def rolling_quantile(x, n, q, min_periods=1):
+    """
+    Rolling quantile(s) with linear interpolation, as pandas
+    rolling(n, min_periods).quantile(q), NaNs ignored. A list of q gives
+    [len(q) x symbols x bars]; every percentile comes from the same sort.
+    Windows are sorted in chunks of bars to bound memory; use
+    streaming.RollingQuantile for bar-by-bar updates.
+    """
+    a, ndim, dtype = _prep(x)
+    qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+    if ((qs < 0) | (qs > 1)).any():
+        raise ValueError('quantiles must be in [0, 1]')
+    rows, bars = a.shape
+    view = _windows(a, n)
+    out = np.empty((len(qs), rows, bars))
+    step = max(1, (1 << 22) // max(rows * n, 1))
+    for lo in range(0, bars, step):
+        w = np.sort(view[:, lo:lo + step], axis=-1)         # NaNs sort last
+        count = (~np.isnan(w)).sum(axis=-1)
+        for j, qj in enumerate(qs):
+            pos = qj * np.maximum(count - 1, 0)
+            below = np.floor(pos).astype(np.int64)
+            frac = pos - below
+            v0 = np.take_along_axis(w, below[..., None], axis=-1)[..., 0]
+            v1 = np.take_along_axis(w, np.minimum(below + 1, n - 1)[..., None], axis=-1)[..., 0]
+            val = np.where(frac > 0, v0 + (v1 - v0) * frac, v0)
+            out[j, :, lo:lo + step] = np.where(count >= max(min_periods, 1), val, np.nan)
+    out = out.astype(dtype, copy=False)
+    if ndim == 1:
+        out = out[:, 0]
+    return out if np.ndim(q) else out[0]
+
+
+def vidya(close, period=20, vol_period=10):
+    """
+    Chande's VIDYA as trend-following/adapative_ema_vidya.py defines it:
+    an EMA whose alpha is clip(kc * vol / avg(vol), 0, 1), kc = 2/(period+1),
+    vol the population standard deviation over vol_period bars (backtrader
+    StdDev) and avg(vol) its vol_period SMA. Seeded with the close on the
+    first bar where avg(vol) exists (bar 2*vol_period - 1); NaN bars hold.
+    """
+    a, ndim, dtype = _prep(close)
+    w = _windows(a, vol_period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vol = np.sqrt(np.abs((w * w).mean(axis=-1) - w.mean(axis=-1) ** 2))
+        avol = _windows(vol, vol_period).mean(axis=-1)
+        alpha = np.clip(np.where(avol != 0, vol / avol, 0.0) * (2.0 / (period + 1.0)), 0.0, 1.0)
+    out = np.empty_like(a)
+    state = np.full(a.shape[0], np.nan)
+    for t in range(a.shape[1]):
+        x, k = a[:, t], alpha[:, t]
+        upd = k * x + (1.0 - k) * state
+        state = np.where(np.isnan(x) | np.isnan(k), state, np.where(np.isnan(state), x, upd))
+        out[:, t] = state
+    return _done(out, ndim, dtype)
+
+
+def efficiency_ratio(close, n=10):
+    """
+    Kaufman's efficiency ratio |x - x[n bars ago]| / sum of |bar changes|
+    over those n bars; 0 when the window did not move at all.
+    """
+    a, ndim, dtype = _prep(close)
+    return _done(_efficiency(a, n), ndim, dtype)
+
+
+def _efficiency(a, n):
+    direction = np.abs(a - shift(a, n))
+    total, count = _window_sums(np.abs(a - shift(a, 1)), n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        er = np.where(total > 0, direction / total, 0.0)
+    er[(count < n) | np.isnan(direction)] = np.nan
+    return er
+
+
+def kama(close, period=10, fast=2, slow=30):
+    """Kaufman's adaptive moving average, as backtrader's KAMA."""
+    return kama_grid(close, [(period, fast, slow)])[0]
+
+
+def kama_grid(close, params):
+    """
+    KAMA for several (period, fast, slow) triples in one pass, stacked as
+    [len(params) x symbols x bars]. Same definition as bt.indicators.KAMA:
+    sc = (er * (2/(fast+1) - 2/(slow+1)) + 2/(slow+1))**2, seeded with the
+    period-bar SMA on the first bar the efficiency ratio exists (bar
+    period + 1), then kama = kama_prev * (1 - sc) + close * sc. The ratio
+    and seed are computed once per distinct period; the recursion runs
+    over all triples and symbols together. NaN bars hold the last value.
+    """
+    a, ndim, dtype = _prep(close)
+    params = [tuple(p) for p in params]
+    er, seed = {}, {}
+    for n in {p[0] for p in params}:
+        er[n], seed[n] = _efficiency(a, n), sma(a, n)
+    sc = np.stack([(er[n] * (2.0 / (f + 1.0) - 2.0 / (s + 1.0)) + 2.0 / (s + 1.0)) ** 2
+                   for n, f, s in params]).reshape(-1, a.shape[1])
+    base = np.stack([seed[n] for n, _, _ in params]).reshape(-1, a.shape[1])
+    x = np.broadcast_to(a, (len(params),) + a.shape).reshape(-1, a.shape[1])
+
+    out = np.empty_like(sc)
+    state = np.full(sc.shape[0], np.nan)
+    for t in range(sc.shape[1]):
+        k = sc[:, t]
+        upd = state * (1.0 - k) + x[:, t] * k
+        state = np.where(np.isnan(k), state, np.where(np.isnan(state), base[:, t], upd))
+        out[:, t] = state
+    out = out.reshape((len(params),) + a.shape).astype(dtype, copy=False)
+    return out[:, 0] if ndim == 1 else out
+
+
+def stochastic(high, low, close, k=14, d=3, min_periods=1):
+    """(%K, %D): close within the k-bar high/low range, %D its d-bar mean."""
+    hh = rolling_max(high, k, min_periods)
+    ll = rolling_min(low, k, min_periods)
+    c, ndim, dtype = _prep(close)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pk = (c - _prep(ll)[0]) / (_prep(hh)[0] - _prep(ll)[0]) * 100.0
+    pk = _done(pk, ndim, dtype)
+    return pk, sma(pk, d, min_periods)
+
+
+# ---------------------------------------------------------------------------
+# pandas wrappers
+# ---------------------------------------------------------------------------
+
+def _values(obj):
+    """Series -> 1-D, wide DataFrame (dates x symbols) -> [symbols x dates]."""
+    return obj.to_numpy().T if isinstance(obj, pd.DataFrame) else obj.to_numpy()
+
+
+def _like(obj, arr):
+    if isinstance(obj, pd.DataFrame):
+        return pd.DataFrame(arr.T, index=obj.index, columns=obj.columns)
+    return pd.Series(arr, index=obj.index)
+
+
+def compute_sma(series, period, min_periods=None):
+    return _like(series, sma(_values(series), period, min_periods))
+
+
+def compute_ema(series, span):
+    return _like(series, ema(_values(series), span))
+
+
+def compute_roc(series, period=14):
+    return _like(series, roc(_values(series), period))
+
+
+def compute_rsi(close, period=14, method='wilder'):
+    return _like(close, rsi(_values(close), period, method))
+
+
+def compute_quantile(series, window, q, min_periods=1):
+    return _like(series, rolling_quantile(_values(series), window, q, min_periods))
+
+
+def compute_vidya(close, period=20, vol_period=10):
+    return _like(close, vidya(_values(close), period, vol_period))
+
+
+def compute_kama(close, period=10, fast=2, slow=30):
+    return _like(close, kama(_values(close), period, fast, slow))
+
+
+def compute_atr(df, period=14, method='sma', min_periods=1, high=None, low=None, close=None):
+    """
+    ATR from a frame with High/Low/Close columns (one symbol), or from
+    wide High/Low/Close frames passed as high=, low=, close=.
+    """
+    if high is None:
+        high, low, close = df['High'], df['Low'], df['Close']
+    return _like(close, atr(_values(high), _values(low), _values(close), period, method, min_periods))
+
+
+def compute_macd(close, fast=12, slow=26, signal=9):
+    """(macd, signal, hist) as Series (or wide frames)."""
+    return tuple(_like(close, a) for a in macd(_values(close), fast, slow, signal))
+
+
+def compute_stoch(high, low, close, k_period=14, d_period=3):
+    k, d = stochastic(_values(high), _values(low), _values(close), k_period, d_period)
+    return _like(close, k), _like(close, d)
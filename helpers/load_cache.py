@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for parsed NSE CSVs.
+
+A CSV is identified by its content hash (BLAKE2b). The hash itself is
+remembered against (path, size, mtime), so an unchanged file is neither
+parsed nor re-hashed: the cleaned frame comes straight back from an
+uncompressed Arrow/Feather file. Edit or replace the CSV and the next
+load re-hashes it, misses and re-parses. Total cache size is capped;
+least recently used entries go first.
+
+    from helpers.load_cache import cached_read
+    df = cached_read('scrip.csv')
+
+    python -m helpers.load_cache info
+    python -m helpers.load_cache clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import pyarrow.feather as feather
+
+from .nse_csv import read_nse_csv, select_fields
+
+CACHE_DIR = Path(os.environ.get(
+    'NSE_CACHE', Path(__file__).resolve().parent.parent / 'data' / 'cache'
+))
+MAX_BYTES = int(os.environ.get('NSE_CACHE_MAX_BYTES', 512 * 2**20))
+INDEX = 'index.json'
+VERSION = 1         # part of every key; bump when read_nse_csv's output changes
+
+
+def content_hash(path, chunk=2**20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while block := f.read(chunk):
+            h.update(block)
+    return h.hexdigest()
+
+
+class LoadCache:
+    """Content-addressed cache of loader results with LRU eviction."""
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+        self.max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.dir / INDEX
+        self.index = self._read_index()
+
+    def _read_index(self):
+        try:
+            return json.loads(self._index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {'files': {}, 'entries': {}}
+
+    def _write_index(self):
+        tmp = self._index_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.index))
+        os.replace(tmp, self._index_path)
+
+    def file_hash(self, path):
+        """Content hash of `path`, re-hashing only if size or mtime moved."""
+        path = str(Path(path).resolve())
+        st = os.stat(path)
+        rec = self.index['files'].get(path)
+        if rec and rec['size'] == st.st_size and rec['mtime_ns'] == st.st_mtime_ns:
+            return rec['hash']
+        digest = content_hash(path)
+        self.index['files'][path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': digest}
+        return digest
+
+    def get(self, path, loader=read_nse_csv, variant='nse', columns=None):
+        """
+        Return loader(path), served from the cache when the file content
+        has been seen before. `variant` separates results of different
+        loaders for the same file. The full result is cached; `columns`
+        only limits what is mapped back in.
+        """
+        key = f'{self.file_hash(path)}-{variant}-v{VERSION}'
+        entry = self.dir / f'{key}.arrow'
+        if entry.exists():
+            df = feather.read_table(entry, columns=columns, memory_map=True).to_pandas()
+        else:
+            df = loader(path)
+            # other runs may be mapping `entry`: publish it whole or not at all
+            tmp = entry.with_suffix(f'.{os.getpid()}.tmp')
+            df.to_feather(tmp, compression='uncompressed')
+            os.replace(tmp, entry)
+            if columns is not None:
+                df = df[columns]
+        self.index['entries'][key] = {'bytes': entry.stat().st_size, 'used': time.time()}
+        self.evict()
+        self._write_index()
+        return df
+
+    def evict(self):
+        """Drop least recently used entries until under max_bytes."""
+        entries = self.index['entries']
+        total = sum(e['bytes'] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['used']):
+            if total <= self.max_bytes:
+                break
+            (self.dir / f'{key}.arrow').unlink(missing_ok=True)
+            total -= entries.pop(key)['bytes']
+
+    def clear(self):
+        for key in list(self.index['entries']):
+            (self.dir / f'{key}.arrow').unlink(missing_ok=True)
+        self.index = {'files': {}, 'entries': {}}
+        self._write_index()
+
+
+def cached_read(path, cache_dir=None, fields=None):
+    """read_nse_csv(path, fields) through the default cache."""
+    return LoadCache(cache_dir).get(path, columns=select_fields(fields))
+
+
+def main():
+    p = argparse.ArgumentParser(description="Inspect or clear the parsed-CSV cache")
+    p.add_argument('cmd', choices=['info', 'clear'])
+    p.add_argument('--dir', default=None, help=f"Cache directory (default {CACHE_DIR})")
+    args = p.parse_args()
+
+    cache = LoadCache(args.dir)
+    if args.cmd == 'clear':
+        cache.clear()
+        print(f"Cleared {cache.dir}")
+        return
+    entries = cache.index['entries']
+    total = sum(e['bytes'] for e in entries.values())
+    print(f"{len(entries)} entries, {total / 2**20:.1f} MB of {cache.max_bytes / 2**20:.0f} MB in {cache.dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Python-native NSE equity history client (replaces nse.js + the CSV hop).
+
+Long ranges are split into date chunks that are fetched concurrently
+over a small pool of keep-alive connections (the session cookies NSE
+hands out on the first request are reused by every connection), then
+put back in date order and appended to the store.
+
+    python -m helpers.nse_client TRENT TCS --start 2010-01-01
+    python -m helpers.nse_client --symbol-file EQUITY_L.csv --start 2015-01-01 --workers 6
+
+Point --base-url at a local stand-in server to test without the network.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from .fetch import HTTPPool, Progress, RateLimiter
+from .nse_store import append_rows, store_root
+from .yf_bulk import read_symbol_list
+
+NSE_BASE = 'https://www.nseindia.com'
+HISTORY_PATH = '/api/historical/cm/equity'
+SEED_PATH = '/get-quotes/equity'
+NSE_DATE = '%d-%m-%Y'
+
+# NSE JSON field -> store column
+FIELDS = {
+    'CH_SYMBOL':             'Symbol',
+    'CH_SERIES':             'Series',
+    'CH_TIMESTAMP':          'Date',
+    'CH_PREVIOUS_CLS_PRICE': 'Prev Close',
+    'CH_OPENING_PRICE':      'Open',
+    'CH_TRADE_HIGH_PRICE':   'High',
+    'CH_TRADE_LOW_PRICE':    'Low',
+    'CH_LAST_TRADED_PRICE':  'Last',
+    'CH_CLOSING_PRICE':      'Close',
+    'VWAP':                  'Average Price',
+    'CH_TOT_TRADED_QTY':     'Volume',
+    'CH_TOT_TRADED_VAL':     'Turnover',
+    'CH_TOTAL_TRADES':       'No. of Trades',
+    'COP_DELIV_QTY':         'Deliverable Qty',
+    'COP_DELIV_PERC':        '% Dly Qt to Traded Qty',
+}
+
+
+def date_chunks(start, end, days=365):
+    """Split [start, end] into consecutive inclusive ranges of at most `days` days."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    chunks = []
+    while start <= end:
+        stop = min(start + pd.Timedelta(days=days - 1), end)
+        chunks.append((start, stop))
+        start = stop + pd.Timedelta(days=1)
+    return chunks
+
+
+def records_to_frame(records):
+    """NSE history records -> store long format."""
+    df = pd.DataFrame.from_records(records)
+    if df.empty:
+        return pd.DataFrame(columns=list(FIELDS.values()))
+    df = df[[c for c in FIELDS if c in df.columns]].rename(columns=FIELDS)
+    df['Date'] = pd.to_datetime(df['Date'].str[:10], format='%Y-%m-%d')
+    for col in df.columns.difference(['Symbol', 'Series', 'Date']):
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+class NseClient:
+    """Pooled keep-alive session against nseindia.com (or a stand-in)."""
+
+    def __init__(self, base_url=NSE_BASE, pool_size=4, rate=3.0, retries=3, backoff=1.0, timeout=30):
+        self.pool = HTTPPool(base_url, pool_size, timeout,
+                             headers={'Referer': f'{base_url.rstrip("/")}{SEED_PATH}'})
+        self.limiter = RateLimiter(rate, burst=max(1, int(rate)))
+        self.retries, self.backoff = retries, backoff
+        self._seeded = False
+
+    def seed(self, symbol='RELIANCE'):
+        """Visit a quote page once so NSE sets its session cookies."""
+        if not self._seeded:
+            self.limiter.acquire()
+            try:
+                self.pool.request(SEED_PATH, {'symbol': symbol})
+            except Exception:
+                pass    # the API call itself will fail loudly if cookies are missing
+            self._seeded = True
+
+    def history_chunk(self, symbol, start, end, series=('EQ',)):
+        """One date chunk for one symbol as a DataFrame."""
+        self.seed(symbol)
+        params = {
+            'symbol': symbol,
+            'series': '[' + ','.join(f'"{s}"' for s in series) + ']',
+            'from':   pd.Timestamp(start).strftime(NSE_DATE),
+            'to':     pd.Timestamp(end).strftime(NSE_DATE),
+        }
+        payload = self.pool.get_json(HISTORY_PATH, params, self.limiter, self.retries, self.backoff)
+        return records_to_frame(payload.get('data') or [])
+
+    def close(self):
+        self.pool.close()
+
+
+def backfill(symbols, start, end=None, chunk_days=365, workers=4, series=('EQ',), root=None,
+             base_url=NSE_BASE, rate=3.0, progress=None, resume=True, on_duplicate='replace'):
+    """
+    Fetch [start, end] for every symbol, chunked and concurrent, and append
+    each symbol to the store once all of its chunks are in. Returns
+    {'ok': {symbol: rows}, 'failed': {symbol: error}}.
+    """
+    end = pd.Timestamp.today().normalize() if end is None else end
+    chunks = date_chunks(start, end, chunk_days)
+    progress = Progress(progress or store_root(root) / '_progress' / 'nse-history.json')
+    todo = [s for s in dict.fromkeys(symbols) if not (resume and s in progress.done)]
+    client = NseClient(base_url, pool_size=workers, rate=rate)
+
+    parts = {s: [None] * len(chunks) for s in todo}
+    remaining = {s: len(chunks) for s in todo}
+    ok, failed = {}, {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(client.history_chunk, s, a, b, series): (s, i)
+                       for s in todo for i, (a, b) in enumerate(chunks)}
+            for fut in as_completed(futures):
+                s, i = futures[fut]
+                if s in failed:
+                    continue
+                try:
+                    parts[s][i] = fut.result()
+                except Exception as e:
+                    failed[s] = str(e)
+                    progress.mark(s, e)
+                    print(f"  {s:<12} FAILED: {e}")
+                    continue
+                remaining[s] -= 1
+                if remaining[s]:
+                    continue
+                # chunks are disjoint and oldest first; NSE lists each chunk newest first
+                df = (pd.concat(parts.pop(s), ignore_index=True)
+                        .sort_values(['Date', 'Series'], kind='mergesort'))
+                if len(df):
+                    append_rows(df.assign(Symbol=s), root, on_duplicate)
+                ok[s] = len(df)
+                progress.mark(s)
+                print(f"  {s:<12} {len(df):>6} rows")
+    finally:
+        client.close()
+    return {'ok': ok, 'failed': failed}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Backfill NSE equity history into the store")
+    p.add_argument('symbols', nargs='*', help="NSE symbols")
+    p.add_argument('--symbol-file', help="EQUITY_L.csv or a one-symbol-per-line file")
+    p.add_argument('--start',      default='2010-01-01')
+    p.add_argument('--end',        default=None, help="Default: today")
+    p.add_argument('--series',     nargs='+', default=['EQ'])
+    p.add_argument('--chunk-days', type=int, default=365, help="Days per request")
+    p.add_argument('--workers',    type=int, default=4, help="Concurrent requests / pooled connections")
+    p.add_argument('--rate',       type=float, default=3.0, help="Max requests per second")
+    p.add_argument('--root',       default=None, help="Store directory")
+    p.add_argument('--restart',    action='store_true', help="Ignore the progress file")
+    p.add_argument('--base-url',   default=NSE_BASE)
+    args = p.parse_args()
+
+    symbols = args.symbols + (read_symbol_list(args.symbol_file) if args.symbol_file else [])
+    if not symbols:
+        p.error("give symbols or --symbol-file")
+    result = backfill(symbols, args.start, args.end, args.chunk_days, args.workers, tuple(args.series),
+                      args.root, args.base_url, args.rate, resume=not args.restart)
+    print(f"\n{len(result['ok'])} ok, {len(result['failed'])} failed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Read NSE "security-wise price volume & deliverable" CSV exports into a
+clean, typed DataFrame.
+
+The NSE export quotes every value, groups digits the Indian way
+("2,90,33,61,753.40"), pads the headers with trailing spaces and starts
+the file with a UTF-8 BOM. Everything in here returns the same canonical
+column names the strategy scripts already rename to (Open/High/Low/Close/
+Volume ...), so callers never see the raw headers.
+
+Parsing is done column-at-a-time in Arrow: every field is read as a
+string, the digit-grouping commas are removed with one vectorised
+replace per column and the result is cast straight to its final dtype.
+Columns are converted in parallel and dates are parsed once per distinct
+day. No per-row Python and no `thousands=` inference.
+
+Benchmark against the approaches the scripts use today:
+
+    python -m helpers.nse_csv scrip.csv --bench --repeat 500
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# raw NSE header (stripped) -> canonical column name
+NSE_COLUMNS = {
+    'Symbol':                 'Symbol',
+    'Series':                 'Series',
+    'Date':                   'Date',
+    'Prev Close':             'Prev Close',
+    'Open Price':             'Open',
+    'High Price':             'High',
+    'Low Price':              'Low',
+    'Last Price':             'Last',
+    'Close Price':            'Close',
+    'Average Price':          'Average Price',
+    'Total Traded Quantity':  'Volume',
+    'Turnover ₹':             'Turnover',
+    'No. of Trades':          'No. of Trades',
+    'Deliverable Qty':        'Deliverable Qty',
+    '% Dly Qt to Traded Qty': '% Dly Qt to Traded Qty',
+    # full-market bhavcopy (sec_bhavdata_full_DDMMYYYY.csv), same 15 fields
+    'SYMBOL':                 'Symbol',
+    'SERIES':                 'Series',
+    'DATE1':                  'Date',
+    'PREV_CLOSE':             'Prev Close',
+    'OPEN_PRICE':             'Open',
+    'HIGH_PRICE':             'High',
+    'LOW_PRICE':              'Low',
+    'LAST_PRICE':             'Last',
+    'CLOSE_PRICE':            'Close',
+    'AVG_PRICE':              'Average Price',
+    'TTL_TRD_QNTY':           'Volume',
+    'TURNOVER_LACS':          'Turnover',
+    'NO_OF_TRADES':           'No. of Trades',
+    'DELIV_QTY':              'Deliverable Qty',
+    'DELIV_PER':              '% Dly Qt to Traded Qty',
+}
+
+# raw header -> factor bringing the column to the units of the per-symbol export
+SCALE = {'TURNOVER_LACS': 1e5}
+
+# always read, whatever fields a caller asks for
+KEY_FIELDS = ['Symbol', 'Series', 'Date']
+
+PRICE_FIELDS = ['Prev Close', 'Open', 'High', 'Low', 'Last', 'Close', 'Average Price']
+COUNT_FIELDS = ['Volume', 'No. of Trades', 'Deliverable Qty']
+
+# canonical column name -> dtype after parsing
+DTYPES = {
+    'Symbol':                 'object',
+    'Series':                 'object',
+    **{c: 'float64' for c in PRICE_FIELDS},
+    'Volume':                 'int64',
+    'Turnover':               'float64',
+    'No. of Trades':          'int64',
+    'Deliverable Qty':        'int64',
+    '% Dly Qt to Traded Qty': 'float64',
+}
+
+DATE_FORMAT = '%d-%b-%Y'
+
+ARROW_TYPES = {
+    'float64': pa.float64(),
+    'int64':   pa.int64(),
+}
+
+
+def canonical_name(raw):
+    """Map a raw (possibly padded) NSE header to its canonical name."""
+    name = raw.strip().lstrip('\ufeff')
+    if name.startswith('Turnover'):
+        return 'Turnover'
+    return NSE_COLUMNS.get(name, name)
+
+
+def read_raw_header(path):
+    """Stripped column names from the first line of an NSE CSV."""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return [c.strip() for c in next(csv.reader(f))]
+
+
+def read_header(path):
+    """Canonical column names from the first line of an NSE CSV."""
+    return [canonical_name(c) for c in read_raw_header(path)]
+
+
+def select_fields(fields):
+    """
+    Canonical columns to read for `fields`: the key columns plus the ones
+    asked for, in file order. `fields` may be a list of names or anything
+    declaring a FIELDS attribute (a strategy class or script module).
+    None means every column.
+    """
+    if fields is None:
+        return None
+    fields = getattr(fields, 'FIELDS', fields)
+    if isinstance(fields, str):
+        fields = [fields]
+    known = list(dict.fromkeys(NSE_COLUMNS.values()))
+    unknown = [f for f in fields if f not in known]
+    if unknown:
+        raise KeyError(f'unknown fields {unknown}; expected some of {known}')
+    return [c for c in known if c in KEY_FIELDS or c in fields]
+
+
+def parse_column(arr, dtype):
+    """Strip digit grouping from a string column and cast it to `dtype`."""
+    if dtype == 'object':
+        return pc.utf8_trim_whitespace(arr)
+    arr = pc.replace_substring(arr, ',', '')
+    try:
+        arr = pc.cast(arr, ARROW_TYPES[dtype])
+    except pa.ArrowInvalid:
+        # bhavcopy pads values (" 2560.20", " -"); trim only when needed
+        arr = pc.utf8_trim_whitespace(arr)
+        arr = pc.cast(pc.if_else(pc.equal(arr, '-'), None, arr), ARROW_TYPES[dtype])
+    return pc.fill_null(arr, 0) if dtype == 'int64' else arr
+
+
+def parse_dates(arr):
+    """
+    Parse '%d-%b-%Y' dates. A file has one distinct date per trading day
+    however many rows it holds, so only the distinct strings are parsed.
+    """
+    enc = pc.dictionary_encode(arr.combine_chunks())
+    days = pc.strptime(pc.utf8_trim_whitespace(enc.dictionary), format=DATE_FORMAT, unit='s')
+    return pc.take(days, enc.indices)
+
+
+def read_nse_table(path, fields=None):
+    """
+    Parse one NSE CSV export into an Arrow table with canonical column
+    names, a timestamp 'Date' column and the dtypes in DTYPES. With
+    `fields` (see select_fields) the other columns are skipped by the
+    CSV reader and never converted.
+    """
+    raw = read_raw_header(path)
+    names = [canonical_name(c) for c in raw]
+    wanted = select_fields(fields)
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(column_names=names, skip_rows=1),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.string() for c in names},
+            include_columns=wanted,
+            null_values=['', '-'],
+            strings_can_be_null=True,
+        ),
+    )
+    if wanted is not None:
+        raw = [r for r, n in zip(raw, names) if n in wanted]
+        names = [n for n in names if n in wanted]
+
+    def convert(name, raw_name):
+        arr = table.column(name)
+        if name == 'Date':
+            return parse_dates(arr)
+        arr = parse_column(arr, DTYPES.get(name, 'object'))
+        return pc.multiply(arr, SCALE[raw_name]) if raw_name in SCALE else arr
+
+    # Arrow kernels release the GIL, so columns convert in parallel
+    with ThreadPoolExecutor() as pool:
+        return pa.table(dict(zip(names, pool.map(convert, names, raw))))
+
+
+def read_nse_csv(path, fields=None):
+    """
+    Parse one NSE CSV export. Returns a DataFrame with a 'Date' column
+    (datetime64), canonical column names and fixed dtypes, sorted by
+    (Symbol, Date). `fields` limits the columns (see select_fields).
+    """
+    df = read_nse_table(path, fields).to_pandas()
+    df['Date'] = df['Date'].astype('datetime64[ns]')
+    return df.sort_values(['Symbol', 'Date'], kind='mergesort').reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------------
+# Compact schema (optional, for holding the whole universe in memory)
+#
+#   Open/High/Low/Close/Last/Prev Close/Average Price, % Dly   float32
+#   Volume, No. of Trades, Deliverable Qty                     int64
+#   Turnover                                                   int64 paise (rupees x TURNOVER_SCALE)
+#   Symbol, Series                                             categorical
+#   Date -> Day                                                int32 days since 1970-01-01
+#
+# float32 keeps 24 significant bits: below Rs 1,31,072 (2**17) the
+# rounding error is at most 2**-8 = 0.0039, under half a paisa, so
+# round(x, 2) gives back the exact printed price. Above it (MRF) the
+# error stays below one paisa. Relative error is always <= 2**-24 (6e-8).
+# A universe row drops from ~128 bytes (pandas, deep) to ~71.
+# ---------------------------------------------------------------------------
+
+TURNOVER_SCALE = 100
+COMPACT_FLOAT_FIELDS = PRICE_FIELDS + ['% Dly Qt to Traded Qty']
+CATEGORY_FIELDS = ['Symbol', 'Series']
+
+
+def compact_table(table):
+    """Cast an Arrow table in the default schema to the compact schema."""
+    cols = {}
+    for name in table.column_names:
+        arr = table.column(name)
+        if name in CATEGORY_FIELDS:
+            arr = pc.dictionary_encode(arr)
+        elif name == 'Date':
+            name, arr = 'Day', pc.cast(pc.cast(arr, pa.date32()), pa.int32())
+        elif name == 'Turnover':
+            arr = pc.fill_null(pc.cast(pc.round(pc.multiply(arr, TURNOVER_SCALE)), pa.int64()), 0)
+        elif name in COMPACT_FLOAT_FIELDS:
+            arr = pc.cast(arr, pa.float32())
+        cols[name] = arr
+    return pa.table(cols)
+
+
+def compact_frame(df):
+    """
+    DataFrame (as read_nse_csv returns it) -> compact schema. Categories
+    are sorted, so sorting by Symbol is still alphabetical.
+    """
+    out = compact_table(pa.Table.from_pandas(df, preserve_index=False)).to_pandas()
+    for c in CATEGORY_FIELDS:
+        if c in out:
+            out[c] = out[c].cat.set_categories(sorted(out[c].cat.categories))
+    return out
+
+
+def day_to_date(days):
+    """int32 day ordinals -> datetime64[ns]."""
+    return pd.DatetimeIndex(np.asarray(days, dtype='int64').astype('datetime64[D]')).as_unit('ns')
+
+
+def date_to_day(dates):
+    """Dates -> int32 day ordinals."""
+    return (pd.DatetimeIndex(dates).as_unit('ns').asi8 // 86_400_000_000_000).astype(np.int32)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark: the loaders the scripts use today vs. read_nse_csv
+# ---------------------------------------------------------------------------
+
+RAW_NUMERIC = ['Prev Close  ', 'Open Price  ', 'High Price  ', 'Low Price  ',
+               'Last Price  ', 'Close Price  ', 'Average Price ',
+               'Total Traded Quantity  ']
+
+
+def _thousands_loader(path):
+    # backtest_sma_stats.py, breakout/*.py, macd/*.py, stoploss/*.py
+    df = pd.read_csv(path, thousands=',')
+    df.columns = df.columns.str.strip()
+    df['Date'] = pd.to_datetime(df['Date'], format=DATE_FORMAT)
+    return df.set_index('Date')
+
+
+def _dtype_str_loader(path):
+    # turtle_classic.py, adapative_ema_*.py, trend_roc.py
+    df = pd.read_csv(path, dtype=str)
+    df['Date  '] = pd.to_datetime(df['Date  '].str.strip(), format=DATE_FORMAT)
+    df.set_index('Date  ', inplace=True)
+    for col in RAW_NUMERIC:
+        df[col] = df[col].str.replace(',', '').astype(float)
+    return df
+
+
+def _astype_str_loader(path):
+    # support_strategy.py
+    df = pd.read_csv(path)
+    df['Date  '] = pd.to_datetime(df['Date  '], format=DATE_FORMAT)
+    df.set_index('Date  ', inplace=True)
+    for col in RAW_NUMERIC:
+        df[col] = df[col].astype(str).str.replace(',', '').astype(float)
+    return df
+
+
+def bench(path, repeat):
+    """Time each loader on `path` with its data rows repeated `repeat` times."""
+    with open(path, encoding='utf-8-sig') as f:
+        header, *rows = [line for line in f.read().splitlines() if line.strip()]
+    fd, big = tempfile.mkstemp(suffix='.csv')
+    with os.fdopen(fd, 'w', encoding='utf-8-sig') as f:
+        f.write(header + '\n')
+        for _ in range(repeat):
+            f.write('\n'.join(rows) + '\n')
+    loaders = [
+        ("read_csv(thousands=',')",      _thousands_loader),
+        ("dtype=str + str.replace",      _dtype_str_loader),
+        ("astype(str).str.replace",      _astype_str_loader),
+        ("read_nse_csv (arrow)",         read_nse_csv),
+    ]
+    try:
+        print(f"{len(rows) * repeat:,} rows, {os.path.getsize(big) / 1e6:.1f} MB\n")
+        for name, fn in loaders:
+            t0 = time.perf_counter()
+            fn(big)
+            print(f"  {name:<28} {time.perf_counter() - t0:8.3f} s")
+    finally:
+        os.remove(big)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Parse an NSE CSV export (or benchmark the parsers)")
+    p.add_argument('csv', help="NSE CSV export")
+    p.add_argument('--bench',  action='store_true', help="Benchmark against the current loaders")
+    p.add_argument('--repeat', type=int, default=200, help="Rows are repeated this many times for --bench")
+    args = p.parse_args()
+
+    if args.bench:
+        bench(args.csv, args.repeat)
+    else:
+        df = read_nse_csv(args.csv)
+        print(df.dtypes.to_string())
+        print(df.tail().to_string())
+
+
+if __name__ == '__main__':
+    main()
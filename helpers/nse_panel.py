@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped [symbol x trading-day x field] panel built from the store.
+
+Two flat binary files plus a JSON metadata file:
+
+    <root>/_panel/prices.f32       float32  Open/High/Low/Close/Last/Average Price
+    <root>/_panel/quantities.i64   int64    Volume/Turnover/No. of Trades/Deliverable Qty
+    <root>/_panel/meta.json        symbols, dates, field names, shapes
+
+Missing bars are NaN in prices and -1 in quantities. Turnover is kept in
+paise (rupees x 100) so it fits the int64 block exactly.
+
+    python -m helpers.nse_panel build --series EQ
+
+    from helpers.nse_panel import open_panel
+    p = open_panel()
+    close = p.field('Close')            # [symbols x days] view, nothing read yet
+    vol   = p.field('Volume')[p.rows(['TRENT', 'BSE'])]
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .nse_csv import TURNOVER_SCALE
+from .nse_store import load_universe, store_root
+
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Last', 'Average Price']
+QTY_FIELDS = ['Volume', 'Turnover', 'No. of Trades', 'Deliverable Qty']
+QTY_MISSING = -1
+# with series=None, the row kept when a symbol prints in several series on one day
+SERIES_PRIORITY = ['EQ', 'BE', 'BZ', 'SM', 'ST']
+
+
+def panel_dir(root=None):
+    return store_root(root) / '_panel'
+
+
+def build_panel(root=None, symbols=None, series='EQ', out=None):
+    """
+    Scatter the whole store into a fresh panel in one vectorised pass.
+    With series=None a (symbol, day) printed in several series keeps one
+    row, by SERIES_PRIORITY (other series last). Returns the opened Panel.
+    """
+    out = Path(out) if out is not None else panel_dir(root)
+    out.mkdir(parents=True, exist_ok=True)
+    uni = load_universe(symbols, root, series)
+    if series is None:
+        rank = uni['Series'].map({s: i for i, s in enumerate(SERIES_PRIORITY)}).fillna(len(SERIES_PRIORITY))
+        uni = (uni.assign(_rank=rank.to_numpy())
+                  .sort_values(['Symbol', 'Date', '_rank'], kind='mergesort')
+                  .drop_duplicates(['Symbol', 'Date']))
+
+    syms = pd.Index(np.sort(uni['Symbol'].unique()))
+    dates = pd.DatetimeIndex(np.sort(uni['Date'].unique()))
+    si = syms.get_indexer(uni['Symbol'])
+    di = dates.get_indexer(uni['Date'])
+    shape = (len(syms), len(dates))
+
+    prices = np.memmap(out / 'prices.f32', dtype=np.float32, mode='w+',
+                       shape=shape + (len(PRICE_FIELDS),))
+    prices[:] = np.nan
+    prices[si, di, :] = uni[PRICE_FIELDS].to_numpy(np.float32)
+    prices.flush()
+
+    qty = uni[QTY_FIELDS].copy()
+    qty['Turnover'] = (qty['Turnover'] * TURNOVER_SCALE).round()
+    qty = qty.fillna(QTY_MISSING)           # e.g. Turnover on rows from Yahoo
+    quantities = np.memmap(out / 'quantities.i64', dtype=np.int64, mode='w+',
+                           shape=shape + (len(QTY_FIELDS),))
+    quantities[:] = QTY_MISSING
+    quantities[si, di, :] = qty.to_numpy(np.int64)
+    quantities.flush()
+
+    meta = {
+        'symbols':        list(syms),
+        'dates':          [d.strftime('%Y-%m-%d') for d in dates],
+        'price_fields':   PRICE_FIELDS,
+        'qty_fields':     QTY_FIELDS,
+        'series':         series,
+        'turnover_scale': TURNOVER_SCALE,
+        'qty_missing':    QTY_MISSING,
+    }
+    (out / 'meta.json').write_text(json.dumps(meta, indent=1))
+    del prices, quantities
+    return Panel(out)
+
+
+class Panel:
+    """Read-only view over a panel directory; arrays are np.memmap."""
+
+    def __init__(self, path, mode='r'):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / 'meta.json').read_text())
+        self.symbols = pd.Index(self.meta['symbols'])
+        self.dates = pd.DatetimeIndex(self.meta['dates'])
+        shape = (len(self.symbols), len(self.dates))
+        self.prices = np.memmap(self.path / 'prices.f32', dtype=np.float32, mode=mode,
+                                shape=shape + (len(self.meta['price_fields']),))
+        self.quantities = np.memmap(self.path / 'quantities.i64', dtype=np.int64, mode=mode,
+                                    shape=shape + (len(self.meta['qty_fields']),))
+
+    @property
+    def shape(self):
+        return len(self.symbols), len(self.dates)
+
+    def field(self, name):
+        """[symbols x days] strided view of one field."""
+        if name in self.meta['price_fields']:
+            return self.prices[:, :, self.meta['price_fields'].index(name)]
+        if name in self.meta['qty_fields']:
+            return self.quantities[:, :, self.meta['qty_fields'].index(name)]
+        raise KeyError(name)
+
+    def rows(self, symbols):
+        """Row numbers for `symbols`; raises KeyError on unknown ones."""
+        idx = self.symbols.get_indexer(list(symbols))
+        if (idx < 0).any():
+            missing = [s for s, i in zip(symbols, idx) if i < 0]
+            raise KeyError(f'not in panel: {missing}')
+        return idx
+
+    def cols(self, start=None, end=None):
+        """Column slice covering [start, end] (inclusive, dates or strings)."""
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), 'left')
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), 'right')
+        return slice(lo, hi)
+
+    def frame(self, symbol, start=None, end=None):
+        """One symbol as a Date-indexed DataFrame (missing days dropped)."""
+        r, c = self.rows([symbol])[0], self.cols(start, end)
+        df = pd.DataFrame(self.prices[r, c], index=self.dates[c], columns=self.meta['price_fields'])
+        q = pd.DataFrame(self.quantities[r, c], index=self.dates[c], columns=self.meta['qty_fields'])
+        q['Turnover'] = q['Turnover'] / self.meta['turnover_scale']
+        df = df.join(q)
+        df.index.name = 'Date'
+        return df[df['Close'].notna()]
+
+
+def open_panel(root=None, mode='r'):
+    return Panel(panel_dir(root), mode)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Build or inspect the memory-mapped price panel")
+    p.add_argument('--root', default=None, help="Store directory")
+    sub = p.add_subparsers(dest='cmd', required=True)
+    b = sub.add_parser('build', help="Rebuild the panel from the store")
+    b.add_argument('--series', default='EQ', help="Series to keep (default EQ)")
+    sub.add_parser('info', help="Print panel shape and range")
+    args = p.parse_args()
+
+    panel = build_panel(args.root, series=args.series) if args.cmd == 'build' else open_panel(args.root)
+    n_sym, n_day = panel.shape
+    print(f"{n_sym} symbols x {n_day} days "
+          f"({panel.dates[0].date()} .. {panel.dates[-1].date()}) in {panel.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Columnar OHLCV store for NSE price/volume data.
+
+Layout (one hive-style directory per symbol, Parquet parts named by the
+date range they cover so lexical order == chronological order):
+
+    <root>/symbol=TRENT/20240624-20250623.parquet
+    <root>/symbol=BSE/20240624-20250623.parquet
+
+Ingest once:
+
+    python -m helpers.nse_store ingest scrip.csv trent.csv bse.csv
+
+append each new trading day without rewriting history:
+
+    python -m helpers.nse_store append today.csv --on-duplicate replace
+
+then every script loads typed frames without touching the CSVs again:
+
+    from helpers.nse_store import load_data
+    df = load_data('TRENT')        # or load_data('scrip.csv')
+
+Loaders take `fields=` (a list of columns, or a strategy/module with a
+FIELDS attribute); only those columns plus Symbol/Series/Date are read
+from Parquet, the CSV cache or the CSV itself:
+
+    df = load_data('TRENT', fields=['Close', 'Volume'])
+
+and `compact=True` for the compact schema (float32 prices, categorical
+Symbol/Series, int32 'Day' instead of 'Date'; see nse_csv):
+
+    uni = load_universe(series='EQ', compact=True)
+"""
+import argparse
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .load_cache import cached_read
+from .nse_csv import (CATEGORY_FIELDS, DTYPES, NSE_COLUMNS, compact_frame, compact_table,
+                      read_nse_csv, select_fields)
+
+DEFAULT_ROOT = Path(os.environ.get(
+    'NSE_STORE', Path(__file__).resolve().parent.parent / 'data' / 'store'
+))
+
+# a row is identified by (Symbol, Series, Date); Symbol is the partition
+ROW_KEY = ['Series', 'Date']
+ON_DUPLICATE = ('reject', 'skip', 'replace')
+COLUMNS = list(dict.fromkeys(NSE_COLUMNS.values()))
+
+
+def store_root(root=None):
+    return Path(root) if root is not None else DEFAULT_ROOT
+
+
+def symbol_dir(symbol, root=None):
+    return store_root(root) / f'symbol={symbol}'
+
+
+def part_name(dates):
+    """File name for a part covering `dates` (already sorted)."""
+    return f'{dates.iloc[0]:%Y%m%d}-{dates.iloc[-1]:%Y%m%d}.parquet'
+
+
+def part_range(path):
+    """(first, last) dates covered by a part, read from its file name."""
+    first, last = Path(path).stem.split('-')
+    return pd.Timestamp(first), pd.Timestamp(last)
+
+
+def list_parts(symbol, root=None):
+    """Parquet parts of one symbol, oldest first."""
+    d = symbol_dir(symbol, root)
+    return sorted(d.glob('*.parquet')) if d.is_dir() else []
+
+
+def list_symbols(root=None):
+    root = store_root(root)
+    if not root.is_dir():
+        return []
+    return sorted(p.name.split('=', 1)[1] for p in root.glob('symbol=*') if p.is_dir())
+
+
+def _coerce(df):
+    """
+    Fix columns and dtypes so every part shares one Parquet schema.
+    Columns a source doesn't provide (e.g. delivery data from Yahoo) are
+    added as NaN, or 0 for the integer counts.
+    """
+    df = df.copy()
+    df['Date'] = df['Date'].astype('datetime64[ns]')
+    for col, dtype in DTYPES.items():
+        if col not in df.columns:
+            df[col] = 0 if dtype == 'int64' else (None if dtype == 'object' else float('nan'))
+        if dtype != 'object':
+            df[col] = df[col].fillna(0).astype(dtype) if dtype == 'int64' else df[col].astype(dtype)
+    return df[COLUMNS]
+
+
+def _write_part(df, d):
+    """Write `df` (sorted by Date) as one part under directory `d`, atomically."""
+    df = _coerce(df).reset_index(drop=True)
+    p = d / part_name(df['Date'])
+    tmp = p.with_suffix('.tmp')
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, p)
+    return p
+
+
+def write_symbol(df, symbol, root=None):
+    """
+    Replace everything stored for `symbol` with `df` (long format with a
+    'Date' column). Rows are sorted by Date and duplicate dates dropped
+    (last one wins) before writing a single part.
+    """
+    df = (df.sort_values('Date', kind='mergesort')
+            .drop_duplicates(ROW_KEY, keep='last'))
+    d = symbol_dir(symbol, root)
+    if d.exists():
+        shutil.rmtree(d)
+    d.mkdir(parents=True)
+    _write_part(df, d)
+    return d
+
+
+def _merge_into_history(rows, parts, on_duplicate):
+    """
+    Fold rows dated at or before the last stored day into history. Only
+    the parts whose date range covers one of the rows are rewritten; rows
+    falling in gaps between parts become parts of their own. Returns the
+    writes as (frame, part it replaces or None) without touching the
+    store, so a 'reject' raised for any part leaves every part as it was.
+    """
+    starts = pd.DatetimeIndex([part_range(p)[0] for p in parts])
+    ends = pd.DatetimeIndex([part_range(p)[1] for p in parts])
+    pos = starts.searchsorted(rows['Date'], 'right') - 1
+    covered = (pos >= 0) & (rows['Date'].to_numpy() <= ends[pos.clip(0)].to_numpy())
+
+    writes = []
+    for i, new in rows[covered].groupby(pos[covered]):
+        old = pd.read_parquet(parts[i])
+        clash = old.set_index(ROW_KEY).index.isin(new.set_index(ROW_KEY).index)
+        if clash.any():
+            if on_duplicate == 'reject':
+                dates = old.loc[clash, 'Date'].dt.date.tolist()
+                raise ValueError(f'{parts[i].parent.name}: rows already stored for {dates}')
+            if on_duplicate == 'skip':
+                new = new[~new.set_index(ROW_KEY).index.isin(old.set_index(ROW_KEY).index)]
+            else:
+                old = old[~clash]
+        if len(new):
+            merged = pd.concat([old, new], ignore_index=True).sort_values('Date', kind='mergesort')
+            writes.append((merged, parts[i]))
+
+    # rows in a gap before/between parts: one new part per gap
+    gaps = rows[~covered]
+    writes += [(g, None) for _, g in gaps.groupby(pos[~covered])]
+    return writes
+
+
+def _plan_append(g, symbol, root, on_duplicate):
+    """(symbol directory, writes) appending `g` to one symbol; raises before any write."""
+    g = g.sort_values('Date', kind='mergesort')
+    d = symbol_dir(symbol, root)
+    parts = list_parts(symbol, root)
+    if not parts:
+        return d, [(g, None)]
+    last = part_range(parts[-1])[1]
+    tail = g[g['Date'] > last]
+    writes = _merge_into_history(g[g['Date'] <= last], parts, on_duplicate) if len(tail) < len(g) else []
+    if len(tail):
+        writes.append((tail, None))
+    return d, writes
+
+
+def _commit(d, writes):
+    """Write planned parts, each through a temp file and os.replace."""
+    d.mkdir(parents=True, exist_ok=True)
+    for df, replaces in writes:
+        written = _write_part(df, d)
+        if replaces is not None and written != replaces:
+            replaces.unlink()
+
+
+def append_rows(df, root=None, on_duplicate='reject'):
+    """
+    Append new rows (long format, any number of symbols) to the store.
+
+    Rows after a symbol's last stored day are written as a new part and
+    nothing else is touched, so a nightly run costs O(new rows). Rows on
+    or before the last stored day are merged into the part covering them.
+    `on_duplicate` decides what happens when (Symbol, Series, Date) is
+    already stored or repeated in `df`: 'reject' raises ValueError,
+    'skip' keeps the stored row, 'replace' keeps the new one.
+    Returns {symbol: rows received}.
+    """
+    if on_duplicate not in ON_DUPLICATE:
+        raise ValueError(f'on_duplicate must be one of {ON_DUPLICATE}')
+    dup = df.duplicated(['Symbol'] + ROW_KEY, keep='last')
+    if dup.any():
+        if on_duplicate == 'reject':
+            raise ValueError(f'duplicate rows in input: {df.loc[dup, ["Symbol", "Date"]].values.tolist()}')
+        df = df[~dup] if on_duplicate == 'replace' else df[~df.duplicated(['Symbol'] + ROW_KEY, keep='first')]
+
+    # plan every symbol first: a rejected row anywhere means nothing is written
+    plans, written = [], {}
+    for symbol, g in df.groupby('Symbol', sort=True):
+        plans.append(_plan_append(g, symbol, root, on_duplicate))
+        written[symbol] = len(g)
+    for d, writes in plans:
+        _commit(d, writes)
+    return written
+
+
+def append_symbol(g, symbol, root=None, on_duplicate='reject'):
+    """append_rows() for rows of a single symbol with no repeated keys."""
+    _commit(*_plan_append(g, symbol, root, on_duplicate))
+
+
+def append_csv(paths, root=None, on_duplicate='reject'):
+    """Parse NSE CSV exports and append their rows (see append_rows)."""
+    df = pd.concat([read_nse_csv(p) for p in paths], ignore_index=True)
+    return append_rows(df, root, on_duplicate)
+
+
+def compact_symbol(symbol, root=None):
+    """Merge a symbol's daily parts back into a single part."""
+    return write_symbol(load_symbol(symbol, root).reset_index(), symbol, root)
+
+
+def ingest_csv(paths, root=None):
+    """
+    Parse NSE CSV exports and (re)write one partition per symbol found in
+    them. Several files for the same symbol are merged. Returns the list
+    of symbols written.
+    """
+    frames = [read_nse_csv(p) for p in paths]
+    df = pd.concat(frames, ignore_index=True)
+    written = []
+    for symbol, g in df.groupby('Symbol', sort=True):
+        write_symbol(g, symbol, root)
+        written.append(symbol)
+    return written
+
+
+def _date_key(df):
+    return 'Date' if 'Date' in df.columns else 'Day'
+
+
+def _to_frame(table):
+    df = table.to_pandas()
+    for c in CATEGORY_FIELDS:
+        if isinstance(df.get(c), pd.Series) and isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].cat.set_categories(sorted(df[c].cat.categories))
+    key = _date_key(df)
+    if not df[key].is_monotonic_increasing:
+        df = df.sort_values(['Symbol', key], kind='mergesort')
+    return df.reset_index(drop=True)
+
+
+def _scan(files, fields, series, compact):
+    """Read store parts, casting batch by batch when compact so no float64 copy of the whole scan is held."""
+    dataset = ds.dataset(files, format='parquet')
+    flt = ds.field('Series') == series if series is not None else None
+    if not compact:
+        return dataset.to_table(columns=select_fields(fields), filter=flt, use_threads=True)
+    batches = [compact_table(pa.Table.from_batches([b]))
+               for b in dataset.to_batches(columns=select_fields(fields), filter=flt) if b.num_rows]
+    if not batches:
+        return compact_table(dataset.schema.empty_table().select(select_fields(fields) or dataset.schema.names))
+    return pa.concat_tables(batches, promote_options='permissive').unify_dictionaries()
+
+
+def load_symbol(symbol, root=None, series=None, fields=None, compact=False):
+    """Load one symbol from the store, indexed by Date (Day when compact)."""
+    parts = list_parts(symbol, root)
+    if not parts:
+        raise KeyError(f'{symbol} not found in store {store_root(root)}')
+    df = _to_frame(_scan([str(p) for p in parts], fields, series, compact))
+    return df.set_index(_date_key(df))
+
+
+def load_universe(symbols=None, root=None, series=None, fields=None, compact=False):
+    """
+    Load many symbols in one multi-threaded scan. Returns a long frame
+    with 'Symbol' and 'Date' (or 'Day') columns, sorted by (Symbol, Date).
+    """
+    symbols = list_symbols(root) if symbols is None else symbols
+    files = [str(p) for s in symbols for p in list_parts(s, root)]
+    if not files:
+        raise KeyError(f'no symbols found in store {store_root(root)}')
+    df = _to_frame(_scan(files, fields, series, compact))
+    return df.sort_values(['Symbol', _date_key(df)], kind='mergesort').reset_index(drop=True)
+
+
+def load_data(source, root=None, series=None, cache=True, fields=None, compact=False):
+    """
+    Drop-in replacement for the per-script load_data(): `source` is either
+    a path to an NSE CSV export or a symbol already in the store. CSVs go
+    through the parsed-file cache (helpers/load_cache.py) unless
+    cache=False. `fields` limits the columns read (see
+    nse_csv.select_fields); `compact` switches to the compact schema.
+    """
+    if str(source).lower().endswith('.csv') or Path(source).is_file():
+        df = cached_read(source, fields=fields) if cache else read_nse_csv(source, fields)
+        if series is not None:
+            df = df[df['Series'] == series]
+        if compact:
+            df = compact_frame(df)
+        return df.set_index(_date_key(df))
+    return load_symbol(source, root, series, fields, compact)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Ingest NSE CSV exports into the columnar store")
+    p.add_argument('--root', default=None, help=f"Store directory (default {DEFAULT_ROOT})")
+    sub = p.add_subparsers(dest='cmd', required=True)
+    ing = sub.add_parser('ingest', help="Parse CSVs and write one partition per symbol")
+    ing.add_argument('csv', nargs='+', help="NSE CSV exports")
+    app = sub.add_parser('append', help="Append new trading days from CSVs")
+    app.add_argument('csv', nargs='+', help="NSE CSV exports with the new rows")
+    app.add_argument('--on-duplicate', choices=ON_DUPLICATE, default='reject',
+                     help="What to do with (symbol, series, date) rows already stored")
+    comp = sub.add_parser('compact', help="Merge daily parts into one part per symbol")
+    comp.add_argument('symbol', nargs='*', help="Symbols to compact (default: all)")
+    sub.add_parser('ls', help="List symbols in the store")
+    show = sub.add_parser('show', help="Print the tail of one symbol")
+    show.add_argument('symbol')
+    args = p.parse_args()
+
+    if args.cmd == 'ingest':
+        symbols = ingest_csv(args.csv, args.root)
+        print(f"Wrote {len(symbols)} symbols to {store_root(args.root)}: {', '.join(symbols)}")
+    elif args.cmd == 'append':
+        written = append_csv(args.csv, args.root, args.on_duplicate)
+        print(f"Appended {sum(written.values())} rows across {len(written)} symbols")
+    elif args.cmd == 'compact':
+        for s in args.symbol or list_symbols(args.root):
+            compact_symbol(s, args.root)
+    elif args.cmd == 'ls':
+        for s in list_symbols(args.root):
+            print(s)
+    else:
+        print(load_symbol(args.symbol, args.root).tail(10).to_string())
+
+
+if __name__ == '__main__':
+    main()
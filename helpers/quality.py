@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Vectorized data-quality scan over the store (or any long OHLCV frame).
+
+All checks run as whole-column array operations over the concatenated
+universe. Each row is compared with the previous row of the same
+(Symbol, Series) by date, even where the store interleaves EQ and BL
+rows; no per-symbol loop. The result is one compact issues table:
+
+    Symbol  Series  Date        check                value
+    TRENT   EQ      2025-03-04  prev_close_mismatch  0.5
+    BSE     EQ      2025-01-27  missing_days         2
+
+Checks (value column in brackets):
+
+    duplicate_date        (Symbol, Series, Date) stored more than once     [count]
+    non_monotonic         Date earlier than the row before it             [days back]
+    high_below_low        High < Low                                      [High - Low]
+    close_outside_range   Close outside [Low, High]                       [Close]
+    nonpositive_volume    Volume <= 0                                     [Volume]
+    prev_close_mismatch   Prev Close != previous row's Close              [Prev Close / Close - 1]
+    missing_days          sessions absent between two rows                [sessions missing]
+    extreme_gap           |Open / previous Close - 1| > gap threshold     [gap]
+
+Sessions come from the union of dates seen across the scanned series,
+so a day every symbol skipped (a holiday) is never flagged. Sparse
+series such as block deals (BL) only get the per-row checks. Prev Close
+mismatches on ex-dates are expected (NSE adjusts Prev Close for
+corporate actions); see helpers/adjust.py.
+
+    python -m helpers.quality                      # whole store
+    python -m helpers.quality --since 2025-06-20   # after the nightly append
+    python -m helpers.quality --csv scrip.csv --out issues.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from .nse_csv import read_nse_csv
+from .nse_store import list_parts, list_symbols, store_root
+
+CHECKS = ['duplicate_date', 'non_monotonic', 'high_below_low', 'close_outside_range',
+          'nonpositive_volume', 'prev_close_mismatch', 'missing_days', 'extreme_gap']
+SCAN_FIELDS = ['Symbol', 'Series', 'Date', 'Prev Close', 'Open', 'High', 'Low', 'Close', 'Volume']
+ISSUE_COLUMNS = ['Symbol', 'Series', 'Date', 'check', 'value']
+# series expected to print every session; block-deal (BL) and similar rows
+# are sparse, so gap/continuity checks skip them
+SESSION_SERIES = ('EQ', 'BE', 'BZ', 'SM', 'ST')
+
+
+def read_for_scan(symbols=None, root=None, series=None):
+    """
+    The scanned columns of the store in on-disk order (parts are named by
+    date range, so this is the order rows were stored in, not re-sorted).
+    """
+    symbols = list_symbols(root) if symbols is None else symbols
+    files = [str(p) for s in symbols for p in list_parts(s, root)]
+    if not files:
+        raise KeyError(f'no symbols found in store {store_root(root)}')
+    flt = ds.field('Series') == series if series is not None else None
+    table = ds.dataset(files, format='parquet').to_table(columns=SCAN_FIELDS, filter=flt)
+    return table.to_pandas()
+
+
+def _prev_in_group(group, order):
+    """Index of the row before each row within its group along `order`; -1 for the first."""
+    prev = np.full(len(group), -1)
+    same = group[order[1:]] == group[order[:-1]]
+    prev[order[1:][same]] = order[:-1][same]
+    return prev
+
+
+def scan(df, gap=0.2, tol=1e-4, calendar=None):
+    """
+    Run every check over a long frame in stored order. `gap` is the
+    extreme open-gap threshold, `tol` the relative tolerance for Prev
+    Close. `calendar` overrides the session dates used for missing_days.
+    Returns the issues table (ISSUE_COLUMNS), sorted by Symbol, Series, Date.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    df = df.reset_index(drop=True)
+    group = pd.MultiIndex.from_arrays([df['Symbol'], df['Series']]).factorize()[0] \
+        if 'Series' in df else pd.factorize(df['Symbol'])[0]
+    date = df['Date'].to_numpy(dtype='datetime64[ns]')
+    high, low = df['High'].to_numpy(float), df['Low'].to_numpy(float)
+    close, open_ = df['Close'].to_numpy(float), df['Open'].to_numpy(float)
+
+    # previous row of the same (Symbol, Series): by date for the continuity
+    # checks, in stored order for non_monotonic (EQ and BL rows interleave)
+    dated = _prev_in_group(group, np.lexsort((date, group)))
+    stored = _prev_in_group(group, np.argsort(group, kind='stable'))
+    cont = dated >= 0
+    if 'Series' in df:
+        cont &= df['Series'].isin(SESSION_SERIES).to_numpy()
+    prev_close = np.where(dated >= 0, close[dated], np.nan)
+    prev_date = date[stored]
+
+    found = []
+
+    def flag(check, mask, value):
+        idx = np.flatnonzero(mask)
+        if len(idx):
+            found.append(pd.DataFrame({'row': idx, 'check': check,
+                                       'value': np.broadcast_to(value, mask.shape)[idx].astype(float)}))
+
+    key = pd.DataFrame({'g': group, 'd': date})
+    dup = key.duplicated(keep=False).to_numpy()
+    counts = key.groupby(['g', 'd'])['g'].transform('size').to_numpy()
+    flag('duplicate_date', dup & ~key.duplicated(keep='first').to_numpy(), counts)
+
+    back = (stored >= 0) & (date < prev_date)
+    flag('non_monotonic', back, (prev_date - date) / np.timedelta64(1, 'D'))
+    flag('high_below_low', high < low, high - low)
+    flag('close_outside_range', (close < low) | (close > high), close)
+    if 'Volume' in df:
+        vol = df['Volume'].to_numpy()
+        flag('nonpositive_volume', vol <= 0, vol)
+    if 'Prev Close' in df:
+        pc = df['Prev Close'].to_numpy(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel = pc / prev_close - 1.0
+        flag('prev_close_mismatch', cont & (np.abs(rel) > tol), rel)
+
+    # sessions skipped since the previous dated row, counted on the calendar
+    cal = np.unique(date) if calendar is None else np.sort(pd.DatetimeIndex(calendar).to_numpy('datetime64[ns]'))
+    pos = np.searchsorted(cal, date)
+    step = pos - pos[dated] - 1
+    flag('missing_days', cont & (step > 0), step)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        jump = open_ / prev_close - 1.0
+    flag('extreme_gap', cont & (np.abs(jump) > gap), jump)
+
+    if not found:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    hits = pd.concat(found, ignore_index=True)
+    rows = df.loc[hits['row'], ['Symbol', 'Series', 'Date']].reset_index(drop=True)
+    out = pd.concat([rows, hits[['check', 'value']]], axis=1)
+    out['check'] = pd.Categorical(out['check'], categories=CHECKS)
+    return out.sort_values(['Symbol', 'Series', 'Date', 'check'], kind='mergesort').reset_index(drop=True)
+
+
+def scan_store(symbols=None, root=None, series=None, since=None, gap=0.2, tol=1e-4):
+    """scan() over the store; `since` keeps only issues dated on or after it."""
+    issues = scan(read_for_scan(symbols, root, series), gap, tol)
+    if since is not None:
+        issues = issues[issues['Date'] >= pd.Timestamp(since)].reset_index(drop=True)
+    return issues
+
+
+def main():
+    p = argparse.ArgumentParser(description="Scan OHLCV data for duplicate, inconsistent or missing rows")
+    p.add_argument('symbols', nargs='*', help="Symbols to scan (default: whole store)")
+    p.add_argument('--csv', nargs='+', help="Scan NSE CSV exports instead of the store")
+    p.add_argument('--series', default=None, help="Only this series (e.g. EQ)")
+    p.add_argument('--since', default=None, help="Report issues on/after this date")
+    p.add_argument('--gap', type=float, default=0.2, help="Extreme open gap threshold (0.2 = 20%%)")
+    p.add_argument('--tol', type=float, default=1e-4, help="Relative tolerance for Prev Close")
+    p.add_argument('--out', default=None, help="Write the issues table to CSV")
+    p.add_argument('--root', default=None, help="Store directory")
+    args = p.parse_args()
+
+    if args.csv:
+        df = pd.concat([read_nse_csv(c, SCAN_FIELDS) for c in args.csv], ignore_index=True)
+        if args.series:
+            df = df[df['Series'] == args.series]
+        issues = scan(df, args.gap, args.tol)
+        if args.since:
+            issues = issues[issues['Date'] >= pd.Timestamp(args.since)]
+    else:
+        issues = scan_store(args.symbols or None, args.root, args.series, args.since, args.gap, args.tol)
+
+    if args.out:
+        issues.to_csv(args.out, index=False)
+    if issues.empty:
+        print("No issues found.")
+        return
+    counts = issues['check'].value_counts(sort=False)
+    print(counts[counts > 0].to_string())
+    print()
+    print(issues.head(50).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Streaming indicators: warm up once from history, then one bar per update.
+
+Each object keeps only the state it needs (a running sum, the last EMA
+value, a ring of the last n bars) so a new bar costs the same whatever
+the history length. Feed a scalar for one symbol or a vector with one
+entry per symbol; every update is a handful of NumPy ops over that
+vector, so an end-of-day pass over the whole panel is one call.
+
+    from helpers.streaming import RSI, ATR
+    from helpers.nse_panel import open_panel
+
+    p = open_panel()
+    rsi = RSI(14).warm(p.field('Close'))              # [symbols x days] history
+    atr = ATR(14).warm(p.field('High'), p.field('Low'), p.field('Close'))
+    ...
+    rsi.update(today_close)                           # [symbols] -> [symbols]
+    atr.update(today_high, today_low, today_close)
+
+State is plain arrays, so it can be saved and brought back:
+
+    state = rsi.snapshot()       # picklable
+    rsi.restore(state)
+
+Results match the batch kernels in helpers/indicators.py bar for bar
+(same seeding, NaN bars skipped by averages and counted as empty slots
+by windows).
+"""
+import copy
+
+import numpy as np
+
+from .indicators import RSI_METHODS, rsi_from_averages
+
+
+class Indicator:
+    """Base class: snapshot/restore and warm-up by replaying bars."""
+
+    value = None
+
+    def snapshot(self):
+        """Deep copy of the state (plain dict of arrays and numbers)."""
+        return copy.deepcopy(vars(self))
+
+    def restore(self, state):
+        self.__dict__.clear()
+        self.__dict__.update(copy.deepcopy(state))
+        return self
+
+    def warm(self, *history):
+        """
+        Replay history, one array per input, shaped [bars] (one symbol)
+        or [symbols x bars]. Returns self.
+        """
+        cols = [np.asarray(h) for h in history]
+        for t in range(cols[0].shape[-1]):
+            self.update(*(c[..., t] for c in cols))
+        return self
+
+    def update(self, *x):
+        raise NotImplementedError
+
+
+def _vec(x):
+    return np.asarray(x, dtype=np.float64)
+
+
+class EMA(Indicator):
+    """pandas ewm(span|alpha, adjust=False): seeded with the first value, NaN holds."""
+
+    def __init__(self, span=None, alpha=None):
+        self.alpha = 2.0 / (span + 1.0) if alpha is None else alpha
+        self.value = None
+
+    def update(self, x):
+        x = _vec(x)
+        if self.value is None:
+            self.value = np.full(x.shape, np.nan)
+        v = self.value
+        upd = self.alpha * x + (1.0 - self.alpha) * v
+        self.value = np.where(np.isnan(x), v, np.where(np.isnan(v), x, upd))
+        return self.value
+
+
+class EMAAlpha(EMA):
+    """indicators.ema_alpha(): EMA with alpha = 1/n seeded with the first value."""
+
+    def __init__(self, n):
+        super().__init__(alpha=1.0 / n)
+
+
+class _Window(Indicator):
+    """Ring of the last n bars plus the count of non-NaN values in it."""
+
+    def __init__(self, n, min_periods):
+        self.n = n
+        self.min_periods = n if min_periods is None else min_periods
+        self.pos = 0
+        self.ring = None
+        self.count = None
+        self.value = None
+
+    def _push(self, x):
+        """Store x, return the bar it replaced."""
+        if self.ring is None:
+            self.ring = np.full((self.n,) + x.shape, np.nan)
+            self.count = np.zeros(x.shape, dtype=np.int64)
+        old = self.ring[self.pos].copy()
+        self.ring[self.pos] = x
+        self.count += ~np.isnan(x)
+        self.count -= ~np.isnan(old)
+        return old
+
+    def _advance(self):
+        self.pos = (self.pos + 1) % self.n
+        return self.pos == 0
+
+
+class SMA(_Window):
+    """rolling(n, min_periods).mean() with a running sum."""
+
+    def __init__(self, n, min_periods=None):
+        super().__init__(n, min_periods)
+        self.total = None
+
+    def update(self, x):
+        x = _vec(x)
+        old = self._push(x)
+        if self.total is None:
+            self.total = np.zeros(x.shape)
+        self.total += np.nan_to_num(x) - np.nan_to_num(old)
+        if self._advance():
+            # re-sum once per n bars so rounding in the running sum cannot drift
+            self.total = np.nansum(self.ring, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.value = np.where(self.count >= self.min_periods, self.total / self.count, np.nan)
+        return self.value
+
+
+class RMA(Indicator):
+    """indicators.rma(): Wilder's smoothing seeded with the n-bar SMA."""
+
+    def __init__(self, n):
+        self.alpha = 1.0 / n
+        self.seed = SMA(n)
+        self.value = None
+
+    def update(self, x):
+        x = _vec(x)
+        seed = self.seed.update(x)
+        if self.value is None:
+            self.value = np.full(x.shape, np.nan)
+        v = self.value
+        upd = self.alpha * x + (1.0 - self.alpha) * v
+        self.value = np.where(np.isnan(x), v, np.where(np.isnan(v), seed, upd))
+        return self.value
+
+
+class _Extreme(_Window):
+    """
+    Rolling max/min over the last n bars, amortized O(1): the window is
+    the tail of the previous n-bar block (suffix extremes, computed once
+    per block) joined with the running extreme of the current block.
+    """
+
+    op = None
+
+    def __init__(self, n, min_periods=1):
+        super().__init__(n, min_periods)
+        self.suffix = None
+        self.run = None
+
+    def update(self, x):
+        x = _vec(x)
+        self._push(x)
+        if self.suffix is None:
+            self.suffix = np.full((self.n + 1,) + x.shape, np.nan)
+            self.run = np.full(x.shape, np.nan)
+        j = self.pos
+        self.run = self.op(self.run, x)
+        out = self.op(self.suffix[j + 1], self.run)
+        if self._advance():
+            # block complete: its suffix extremes serve the next n bars
+            self.suffix[:self.n] = self.op.accumulate(self.ring[::-1], axis=0)[::-1]
+            self.run = np.full(x.shape, np.nan)
+        self.value = np.where(self.count >= self.min_periods, out, np.nan)
+        return self.value
+
+
+class RollingMax(_Extreme):
+    """rolling(n, min_periods).max(), NaNs ignored."""
+    op = np.fmax
+
+
+class RollingMin(_Extreme):
+    """rolling(n, min_periods).min(), NaNs ignored."""
+    op = np.fmin
+
+
+class RollingQuantile(_Window):
+    """
+    rolling(n, min_periods).quantile(q) kept as a sorted window per
+    symbol: each bar removes the value leaving the window and inserts the
+    new one (NaNs are kept as +inf at the end). A list of q gives one row
+    per quantile.
+    """
+
+    def __init__(self, n, q, min_periods=1):
+        super().__init__(n, min_periods)
+        self.q = q
+        self.sorted = None
+
+    def update(self, x):
+        x = _vec(x)
+        old = self._push(x)
+        self._advance()
+        if self.sorted is None:
+            self.sorted = np.full(x.shape + (self.n,), np.inf)
+        s, ar = self.sorted, np.arange(self.n)
+        # drop the outgoing value, then insert the new one at its rank
+        gone = np.argmax(s == np.where(np.isnan(old), np.inf, old)[..., None], axis=-1)
+        rest = np.where(ar[:-1] < gone[..., None], s[..., :-1], s[..., 1:])
+        key = np.where(np.isnan(x), np.inf, x)
+        at = (rest < key[..., None]).sum(axis=-1)[..., None]
+        inf = np.full(rest.shape[:-1] + (1,), np.inf)
+        self.sorted = np.where(ar < at, np.concatenate([rest, inf], axis=-1),
+                               np.where(ar == at, key[..., None], np.concatenate([inf, rest], axis=-1)))
+
+        qs = np.asarray(self.q, dtype=np.float64)
+        pos = qs.reshape(qs.shape + (1,) * x.ndim) * np.maximum(self.count - 1, 0)
+        below = np.floor(pos).astype(np.int64)
+        frac = pos - below
+        srt = np.broadcast_to(self.sorted, qs.shape + self.sorted.shape)
+        v0 = np.take_along_axis(srt, below[..., None], axis=-1)[..., 0]
+        v1 = np.take_along_axis(srt, np.minimum(below + 1, self.n - 1)[..., None], axis=-1)[..., 0]
+        with np.errstate(invalid='ignore'):
+            val = np.where(frac > 0, v0 + (v1 - v0) * frac, v0)
+        self.value = np.where(self.count >= max(self.min_periods, 1), val, np.nan)
+        return self.value
+
+
+class RSI(Indicator):
+    """indicators.rsi() for any method; O(1) per bar."""
+
+    def __init__(self, n=14, method='wilder'):
+        if method not in RSI_METHODS:
+            raise ValueError(f"method must be one of {RSI_METHODS}, not {method!r}")
+        avg = {'wilder': RMA, 'tradingview': RMA, 'cutler': SMA, 'sma': SMA, 'ema': EMAAlpha}[method]
+        self.method = method
+        self.prev = None
+        self.up, self.down = avg(n), avg(n)
+        self.value = None
+
+    def update(self, close):
+        close = _vec(close)
+        delta = close - self.prev if self.prev is not None else np.full(close.shape, np.nan)
+        self.prev = close
+        up = self.up.update(np.clip(delta, 0, None))
+        down = self.down.update(np.clip(-delta, 0, None))
+        self.value = np.where(np.isnan(delta), np.nan, rsi_from_averages(up, down, self.method))
+        return self.value
+
+
+class TrueRange(Indicator):
+    """max(H-L, |H-prevC|, |L-prevC|); the first bar is H-L."""
+
+    def __init__(self):
+        self.prev = None
+        self.value = None
+
+    def update(self, high, low, close):
+        high, low, close = _vec(high), _vec(low), _vec(close)
+        pc = self.prev if self.prev is not None else np.full(close.shape, np.nan)
+        with np.errstate(invalid='ignore'):
+            tr = np.fmax(high - low, np.fmax(np.abs(high - pc), np.abs(low - pc)))
+        self.value = np.where(np.isnan(high - low), np.nan, tr)
+        self.prev = close
+        return self.value
+
+
+class ATR(Indicator):
+    """indicators.atr(): SMA of true range (min_periods=1) or Wilder's smoothing (RMA)."""
+
+    def __init__(self, n=14, method='sma', min_periods=1):
+        if method not in ('sma', 'wilder'):
+            raise ValueError(f"method must be 'sma' or 'wilder', not {method!r}")
+        self.tr = TrueRange()
+        self.avg = SMA(n, min_periods) if method == 'sma' else RMA(n)
+        self.value = None
+
+    def update(self, high, low, close):
+        self.value = self.avg.update(self.tr.update(high, low, close))
+        return self.value
+
+
+class MACD(Indicator):
+    """value is (MACD line, signal line, histogram)."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast, self.slow, self.signal = EMA(fast), EMA(slow), EMA(signal)
+        self.value = None
+
+    def update(self, close):
+        line = self.fast.update(close) - self.slow.update(close)
+        sig = self.signal.update(line)
+        self.value = (line, sig, line - sig)
+        return self.value
+
+
+class VIDYA(Indicator):
+    """indicators.vidya(): volatility-scaled EMA seeded once avg(vol) exists."""
+
+    def __init__(self, period=20, vol_period=10):
+        self.kc = 2.0 / (period + 1.0)
+        self.mean, self.meansq = SMA(vol_period), SMA(vol_period)
+        self.avol = SMA(vol_period)
+        self.value = None
+
+    def update(self, close):
+        x = _vec(close)
+        m, msq = self.mean.update(x), self.meansq.update(x * x)
+        vol = np.sqrt(np.abs(msq - m * m))
+        avol = self.avol.update(vol)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            k = np.clip(np.where(avol != 0, vol / avol, 0.0) * self.kc, 0.0, 1.0)
+        v = np.full(x.shape, np.nan) if self.value is None else self.value
+        upd = k * x + (1.0 - k) * v
+        self.value = np.where(np.isnan(x) | np.isnan(k), v, np.where(np.isnan(v), x, upd))
+        return self.value
+
+
+class KAMA(Indicator):
+    """indicators.kama() (backtrader's KAMA), one bar at a time."""
+
+    def __init__(self, period=10, fast=2, slow=30):
+        self.period = period
+        self.fast, self.slow = 2.0 / (fast + 1.0), 2.0 / (slow + 1.0)
+        self.prev = None
+        self.lag = None                 # last `period` closes, oldest at pos
+        self.pos = 0
+        self.noise = SMA(period)        # mean |bar change|; x period = the ER denominator
+        self.seed = SMA(period)
+        self.er = None
+        self.value = None
+
+    def update(self, close):
+        x = _vec(close)
+        if self.prev is None:
+            self.prev = np.full(x.shape, np.nan)
+            self.lag = np.full((self.period,) + x.shape, np.nan)
+            self.value = np.full(x.shape, np.nan)
+        noise = self.noise.update(np.abs(x - self.prev)) * self.period
+        old = self.lag[self.pos].copy()
+        self.lag[self.pos] = x
+        self.pos = (self.pos + 1) % self.period
+        self.prev = x
+        with np.errstate(invalid='ignore', divide='ignore'):
+            er = np.where(noise > 0, np.abs(x - old) / noise, 0.0)
+        self.er = np.where(np.isnan(noise) | np.isnan(x - old), np.nan, er)
+        sc = (self.er * (self.fast - self.slow) + self.slow) ** 2
+        seed = self.seed.update(x)
+        v = self.value
+        self.value = np.where(np.isnan(sc), v, np.where(np.isnan(v), seed, v * (1.0 - sc) + x * sc))
+        return self.value
+
+
+class Stochastic(Indicator):
+    """value is (%K, %D), as indicators.stochastic()."""
+
+    def __init__(self, k=14, d=3, min_periods=1):
+        self.hh, self.ll = RollingMax(k, min_periods), RollingMin(k, min_periods)
+        self.d = SMA(d, min_periods)
+        self.value = None
+
+    def update(self, high, low, close):
+        hh, ll = self.hh.update(high), self.ll.update(low)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            k = (_vec(close) - ll) / (hh - ll) * 100.0
+        self.value = (k, self.d.update(k))
+        return self.value
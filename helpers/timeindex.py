@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Positional time index with as-of lookups over plain NumPy columns.
+
+The scripts take "the n bars before entry" with
+`df.loc[:date].iloc[-n-1:-1]` and "the k bars after a signal" with
+`df.loc[dt:].iloc[1:k+1]`. Both build a new DataFrame per call. Here
+the dates are one sorted int64 array, so a lookup is one binary search
+and the result is a slice of the column, a view with no copy.
+
+    from helpers.timeindex import TimeIndex
+
+    ti = TimeIndex.from_frame(df)                   # or TimeIndex.from_store('TRENT')
+    lows = ti.before(entry_date, 20, 'Low')         # == df.loc[:entry_date].iloc[-21:-1]['Low']
+    nxt = ti.after(dt, 5, 'Close')                  # == df.loc[dt:].iloc[1:6]['Close']
+
+Many timestamps at once give a [timestamps x n] block, NaN-padded where
+the history runs out:
+
+    w = ti.windows_after(signal_dates, 5, 'Close')  # one row per signal
+    held = (w > res[:, None]).all(axis=1)
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .nse_csv import day_to_date
+from .nse_store import load_symbol
+
+
+class TimeIndex:
+    """Sorted dates plus column arrays; every lookup is a searchsorted."""
+
+    def __init__(self, dates, columns):
+        if pd.api.types.is_integer_dtype(np.asarray(dates)):
+            dates = day_to_date(dates)      # compact schema 'Day' ordinals
+        self.dates = pd.DatetimeIndex(dates).as_unit('ns').asi8
+        if len(self.dates) and (np.diff(self.dates) < 0).any():
+            raise ValueError('dates must be sorted ascending')
+        self.columns = {k: np.ascontiguousarray(v) for k, v in columns.items()}
+        self._padded = {}
+
+    @classmethod
+    def from_frame(cls, df, fields=None):
+        """From a Date-indexed frame (what load_data returns)."""
+        fields = df.columns if fields is None else fields
+        return cls(df.index, {c: df[c].to_numpy() for c in fields})
+
+    @classmethod
+    def from_store(cls, symbol, root=None, series='EQ', fields=None):
+        df = load_symbol(symbol, root, series, fields)
+        return cls.from_frame(df, [c for c in df.columns if c not in ('Symbol', 'Series')])
+
+    def __len__(self):
+        return len(self.dates)
+
+    @staticmethod
+    def _ns(t):
+        if pd.api.types.is_integer_dtype(np.asarray(t)):
+            t = day_to_date(np.atleast_1d(t)) if np.ndim(t) else day_to_date([t])[0]
+        if np.ndim(t) == 0:
+            return pd.Timestamp(t).as_unit('ns').value
+        return pd.DatetimeIndex(t).as_unit('ns').asi8
+
+    def asof(self, t):
+        """Position of the last bar at or before t (-1 if none). Vectorized over t."""
+        return np.searchsorted(self.dates, self._ns(t), side='right') - 1
+
+    def first_at(self, t):
+        """Position of the first bar at or after t (len if none). Vectorized over t."""
+        return np.searchsorted(self.dates, self._ns(t), side='left')
+
+    def before(self, t, n, field):
+        """
+        The n bars before the as-of bar of t, excluding it; a view.
+        Same rows as df.loc[:t].iloc[-n-1:-1].
+        """
+        p = int(self.asof(t))
+        return self.columns[field][max(p - n, 0):max(p, 0)]
+
+    def after(self, t, n, field):
+        """
+        The n bars after the first bar at or after t, excluding it; a view.
+        Same rows as df.loc[t:].iloc[1:n+1].
+        """
+        q = int(self.first_at(t))
+        return self.columns[field][q + 1:q + 1 + n]
+
+    def _windows(self, field, n):
+        """
+        Column padded with NaNs on both sides (built once per field, regrown
+        only for a longer n) and its length-n sliding view.
+        """
+        cached = self._padded.get(field)
+        if cached is None or cached[0] <= n:
+            col = self.columns[field]
+            col = col.astype(np.result_type(col.dtype, np.float32), copy=False)   # float32 stays float32
+            pad = np.full(n + 1, np.nan, dtype=col.dtype)
+            cached = (n + 1, np.concatenate([pad, col, pad]))
+            self._padded[field] = cached
+        width, padded = cached
+        return width, sliding_window_view(padded, n)
+
+    def windows_before(self, ts, n, field):
+        """[len(ts) x n] block; row i equals before(ts[i], n) left-padded with NaN."""
+        width, view = self._windows(field, n)
+        p = self.asof(ts)
+        return view[np.maximum(p, 0) - n + width]
+
+    def windows_after(self, ts, n, field):
+        """[len(ts) x n] block; row i equals after(ts[i], n) right-padded with NaN."""
+        width, view = self._windows(field, n)
+        q = self.first_at(ts)
+        return view[q + 1 + width]
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Concurrent Yahoo Finance OHLCV downloader that writes into the store.
+
+Replaces the one-ticker-at-a-time yfin-dnl.py for bulk refreshes:
+a bounded thread pool fetches the chart API for many symbols, a shared
+token bucket keeps the request rate polite, transient failures are
+retried with exponential backoff, and finished symbols are recorded in
+a progress file so an interrupted run picks up where it stopped.
+
+    python -m helpers.yf_bulk --symbols TRENT TCS BSE --range 10y
+    python -m helpers.yf_bulk --symbol-file EQUITY_L.csv --workers 8 --rate 4
+
+Point --base-url at a local stub server to test without the network.
+"""
+import argparse
+import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, urlencode
+
+import numpy as np
+import pandas as pd
+
+from .fetch import Progress, RateLimiter, get_json
+from .nse_store import ON_DUPLICATE, append_rows, list_parts, load_symbol, store_root
+
+YAHOO_BASE = 'https://query1.finance.yahoo.com'
+
+
+def read_symbol_list(path):
+    """
+    Symbols from a file: either the NSE symbol master (EQUITY_L.csv, a
+    'SYMBOL' column) or one symbol per line.
+    """
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    header = [c.strip().upper() for c in rows[0]] if rows else []
+    if 'SYMBOL' in header:
+        i = header.index('SYMBOL')
+        return [r[i].strip() for r in rows[1:] if len(r) > i and r[i].strip()]
+    return [r[0].strip() for r in rows if r and r[0].strip()]
+
+
+def chart_url(ticker, period='10y', interval='1d', base_url=YAHOO_BASE):
+    query = urlencode({'range': period, 'interval': interval, 'includePrePost': 'false',
+                       'events': 'split'})
+    return f'{base_url}/v8/finance/chart/{quote(ticker)}?{query}'
+
+
+def undo_splits(df, splits, offset=0):
+    """
+    Chart OHLCV is split-adjusted; the store holds exchange prints, which
+    helpers/adjust.py adjusts on read. Multiply prices before each split
+    in `splits` (the chart's events.splits) back by its ratio and divide
+    volume by it.
+    """
+    if not splits:
+        return df
+    cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+    df[cols] = df[cols].astype(float)
+    for ev in splits.values():
+        ratio = float(ev['numerator']) / float(ev['denominator'])
+        ex = pd.to_datetime(int(ev['date']) + offset, unit='s').normalize()
+        before = (df['Date'] < ex).to_numpy()
+        df.loc[before, ['Open', 'High', 'Low', 'Close']] *= ratio
+        df.loc[before, 'Volume'] = (df.loc[before, 'Volume'] / ratio).round()
+    return df
+
+
+def chart_to_frame(payload, symbol, daily=True):
+    """
+    Convert a v8 chart response to the store's long format. Daily bars are
+    stamped with the exchange-local calendar date and prices are unadjusted
+    for splits (undo_splits), so they match rows ingested from NSE exports.
+    """
+    chart = payload.get('chart') or {}
+    if not chart.get('result'):
+        raise ValueError(f'{symbol}: {chart.get("error") or "empty chart response"}')
+    res = chart['result'][0]
+    ts = np.asarray(res.get('timestamp') or [], dtype=np.int64)
+    quote_ = res['indicators']['quote'][0] if ts.size else {}
+    offset = int(res.get('meta', {}).get('gmtoffset') or 0)
+    when = pd.to_datetime(ts + offset, unit='s')
+    df = pd.DataFrame({
+        'Symbol': symbol,
+        'Series': 'EQ',
+        'Date':   when.normalize() if daily else when,
+        **{c: pd.to_numeric(pd.Series(quote_.get(c.lower(), [np.nan] * ts.size)), errors='coerce')
+           for c in ['Open', 'High', 'Low', 'Close', 'Volume']},
+    })
+    df = df[df['Close'].notna()].reset_index(drop=True)
+    df = undo_splits(df, (res.get('events') or {}).get('splits'), offset)
+    df['Prev Close'] = df['Close'].shift(1)
+    df['Last'] = df['Close']
+    return df
+
+
+def fill_first_prev_close(df, symbol, root=None):
+    """
+    The first fetched bar has no Prev Close in the chart response. Take
+    it from the store: the last stored Close before that bar, else the
+    Prev Close already stored for the same day, so a refresh with
+    on_duplicate='replace' never blanks a valid value.
+    """
+    if df.empty or not list_parts(symbol, root):
+        return df
+    stored = load_symbol(symbol, root, series='EQ', fields=['Prev Close', 'Close'])
+    first = df['Date'].iloc[0]
+    before = stored[stored.index < first]
+    if len(before):
+        df.loc[df.index[0], 'Prev Close'] = before['Close'].iloc[-1]
+    elif first in stored.index:
+        df.loc[df.index[0], 'Prev Close'] = stored.loc[first, 'Prev Close']
+    return df
+
+
+def download_universe(symbols, period='10y', interval='1d', suffix='.NS', workers=8,
+                      rate=4.0, retries=4, backoff=1.0, root=None, progress=None,
+                      base_url=YAHOO_BASE, on_duplicate='skip', resume=True):
+    """
+    Fetch daily history for `symbols` concurrently and append it to the
+    store. Days already stored are kept by default: Yahoo has no turnover
+    or delivery columns, so on_duplicate='replace' would blank them on
+    rows ingested from NSE exports. Returns {'ok': [...], 'failed': {symbol: error}}.
+    """
+    if interval != '1d':
+        raise ValueError('the store holds daily bars; use helpers/bars.py for intraday intervals')
+    progress = Progress(progress or store_root(root) / '_progress' / f'yahoo-{interval}.json')
+    todo = [s for s in dict.fromkeys(symbols) if not (resume and s in progress.done)]
+    limiter = RateLimiter(rate, burst=max(1, int(rate)))
+
+    def one(symbol):
+        payload = get_json(chart_url(symbol + suffix, period, interval, base_url),
+                           limiter=limiter, retries=retries, backoff=backoff)
+        df = fill_first_prev_close(chart_to_frame(payload, symbol), symbol, root)
+        if len(df):
+            append_rows(df, root, on_duplicate)
+        return len(df)
+
+    ok, failed = [], {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(one, s): s for s in todo}
+        for fut in as_completed(futures):
+            s = futures[fut]
+            try:
+                n = fut.result()
+            except Exception as e:
+                failed[s] = str(e)
+                progress.mark(s, e)
+                print(f"  {s:<12} FAILED: {e}")
+            else:
+                ok.append(s)
+                progress.mark(s)
+                print(f"  {s:<12} {n:>6} bars")
+    return {'ok': sorted(ok), 'failed': failed}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Bulk-download NSE daily OHLCV from Yahoo into the store")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument('--symbols', nargs='+', help="NSE symbols (without .NS)")
+    src.add_argument('--symbol-file', help="EQUITY_L.csv or a one-symbol-per-line file")
+    p.add_argument('--range',    default='10y',   help="Yahoo range: 1y,5y,10y,max ...")
+    p.add_argument('--suffix',   default='.NS',   help="Ticker suffix added to each symbol")
+    p.add_argument('--workers',  type=int, default=8,     help="Concurrent requests")
+    p.add_argument('--rate',     type=float, default=4.0, help="Max requests per second")
+    p.add_argument('--retries',  type=int, default=4,     help="Retries per symbol")
+    p.add_argument('--root',     default=None,    help="Store directory")
+    p.add_argument('--progress', default=None,    help="Progress file (default <store>/_progress/)")
+    p.add_argument('--restart',  action='store_true', help="Ignore the progress file")
+    p.add_argument('--on-duplicate', choices=ON_DUPLICATE, default='skip',
+                   help="Days already stored: skip (default) keeps them, replace overwrites with Yahoo's")
+    p.add_argument('--base-url', default=YAHOO_BASE, help="API base URL (point at a stub server for tests)")
+    args = p.parse_args()
+
+    symbols = args.symbols or read_symbol_list(args.symbol_file)
+    result = download_universe(symbols, args.range, suffix=args.suffix, workers=args.workers,
+                               rate=args.rate, retries=args.retries, root=args.root,
+                               progress=args.progress, base_url=args.base_url,
+                               on_duplicate=args.on_duplicate, resume=not args.restart)
+    print(f"\n{len(result['ok'])} ok, {len(result['failed'])} failed")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,13 @@
 #!/usr/bin/env python3
 import argparse
-import pandas as pd
+import sys
+from pathlib import Path
 
-def load_data(path):
-    """Load scrip.csv, parse dates, strip commas, rename OHLC columns."""
-    df = pd.read_csv(path, thousands=',')
-    df.columns = df.columns.str.strip()
-    df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%Y')
-    df.set_index('Date', inplace=True)
-    df.rename(columns={'Close Price':'Close'}, inplace=True)
-    return df
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicator_cache import cached_indicator
+from helpers.nse_store import load_data
 
-def compute_macd(df, fast=12, slow=26, signal=9):
-    """Compute MACD line and signal line."""
-    exp1 = df['Close'].ewm(span=fast, adjust=False).mean()
-    exp2 = df['Close'].ewm(span=slow, adjust=False).mean()
-    macd = exp1 - exp2
-    sig  = macd.ewm(span=signal, adjust=False).mean()
-    return macd, sig
+FIELDS = ['Close']
 
 def find_bullish_crossovers(macd, sig):
     """Return boolean Series where MACD crosses above Signal line."""
@@ -33,10 +23,10 @@ def main():
     args = parser.parse_args()
 
     # Load data
-    df = load_data(args.csv)
+    df = load_data(args.csv, fields=FIELDS)
 
-    # Compute MACD & signal
-    df['MACD'], df['MACD_SIG'] = compute_macd(df)
+    # MACD & signal, from the on-disk indicator cache when the data is unchanged
+    df['MACD'], df['MACD_SIG'], _ = cached_indicator(df, 'macd')
 
     # Compute histogram (distance between MACD and signal)
     df['HIST'] = df['MACD'] - df['MACD_SIG']
@@ -1,30 +1,13 @@
 #!/usr/bin/env python3
 import argparse
-import pandas as pd
+import sys
+from pathlib import Path
 
-def load_data(path):
-    """
-    Load scrip.csv, parse dates, strip commas, and rename OHLCV columns.
-    """
-    df = pd.read_csv(path, thousands=',')
-    df.columns = df.columns.str.strip()
-    df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%Y')
-    df.set_index('Date', inplace=True)
-    df.rename(columns={
-        'Close Price': 'Close',
-        'Total Traded Quantity': 'Volume'
-    }, inplace=True)
-    return df
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_macd
+from helpers.nse_store import load_data
 
-def compute_macd(df, fast=12, slow=26, signal=9):
-    """
-    Compute MACD line and signal line.
-    """
-    exp1 = df['Close'].ewm(span=fast, adjust=False).mean()
-    exp2 = df['Close'].ewm(span=slow, adjust=False).mean()
-    macd = exp1 - exp2
-    sig  = macd.ewm(span=signal, adjust=False).mean()
-    return macd, sig
+FIELDS = ['Close', 'Volume']
 
 def find_bullish_crossovers(macd, sig):
     """
@@ -42,10 +25,10 @@ def main():
     args = parser.parse_args()
 
     # Load data
-    df = load_data(args.csv)
+    df = load_data(args.csv, fields=FIELDS)
 
     # Compute MACD and signal line
-    df['MACD'], df['MACD_SIG'] = compute_macd(df)
+    df['MACD'], df['MACD_SIG'], _ = compute_macd(df['Close'])
 
     # Identify bullish MACD crossovers
     df['Bullish_XO'] = find_bullish_crossovers(df['MACD'], df['MACD_SIG'])
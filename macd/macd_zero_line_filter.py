@@ -1,37 +1,28 @@
 #!/usr/bin/env python3
-import pandas as pd
+import sys
+from pathlib import Path
 
-def load_data(path='scrip.csv'):
-    df = pd.read_csv(path, thousands=',')
-    df.columns = df.columns.str.strip()
-    df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%Y')
-    df.set_index('Date', inplace=True)
-    # we only need Close, High, Low, Open for MACD/SMA but ensure Close is present
-    df.rename(columns={'Close Price':'Close'}, inplace=True)
-    return df
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_macd
+from helpers.nse_store import load_data
+
+FIELDS = ['Close']
 
 def compute_sma(df, window=200):
     return df['Close'].rolling(window).mean()
 
-def compute_macd(df, fast=12, slow=26, signal=9):
-    exp1 = df['Close'].ewm(span=fast, adjust=False).mean()
-    exp2 = df['Close'].ewm(span=slow, adjust=False).mean()
-    macd = exp1 - exp2
-    sig  = macd.ewm(span=signal, adjust=False).mean()
-    return macd, sig
-
 def find_bullish_crossovers(macd, sig):
     prev_macd = macd.shift(1)
     prev_sig  = sig.shift(1)
     return (prev_macd < prev_sig) & (macd > sig)
 
 def main():
-    df = load_data()
+    df = load_data('scrip.csv', fields=FIELDS)
     # 1. Compute SMA200 (for trend filter if you want)
     df['SMA200'] = compute_sma(df, 200)
 
     # 2. Compute MACD & signal
-    df['MACD'], df['MACD_SIG'] = compute_macd(df)
+    df['MACD'], df['MACD_SIG'], _ = compute_macd(df['Close'])
 
     # 3. Identify bullish MACD crossovers
     df['Bullish_XO'] = find_bullish_crossovers(df['MACD'], df['MACD_SIG'])
@@ -1,33 +1,22 @@
 #!/usr/bin/env python3
-import pandas as pd
 import matplotlib.pyplot as plt
 
+from helpers.indicators import compute_rsi
+from helpers.nse_store import load_data
+
+FIELDS = ['Close', 'Volume']
+
 def compute_momentum(df, roc_period=14, rsi_period=14):
     # Rate of Change (ROC)
     df['ROC'] = df['Close'].diff(periods=roc_period) / df['Close'].shift(roc_period) * 100
 
-    # Relative Strength Index (RSI)
-    delta = df['Close'].diff()
-    gain  = delta.clip(lower=0)
-    loss  = -delta.clip(upper=0)
-
-    avg_gain = gain.rolling(window=rsi_period, min_periods=rsi_period).mean()
-    avg_loss = loss.rolling(window=rsi_period, min_periods=rsi_period).mean()
-
-    rs = avg_gain / avg_loss
-    df['RSI'] = 100 - (100 / (1 + rs))
+    # Relative Strength Index (RSI), Cutler's: plain mean of gains and losses
+    df['RSI'] = compute_rsi(df['Close'], rsi_period, method='cutler')
     return df
 
 def main():
     # 1. Load & clean
-    df = pd.read_csv('scrip.csv', thousands=',')
-    df.columns = df.columns.str.strip()
-    df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%Y')
-    df.set_index('Date', inplace=True)
-    df.rename(columns={
-        'Close Price':            'Close',
-        'Total Traded Quantity':  'Volume'
-    }, inplace=True)
+    df = load_data('scrip.csv', fields=FIELDS)
 
     # 2. Compute ROC & RSI
     roc_period = 14
@@ -11,6 +11,8 @@ console.log(details)
 })
 
 // To get equity historical data for specific symbol
+// (helpers/nse_client.py does this from Python, chunked and straight into the store)
+const symbol = 'IRCTC'
 const range = {
     start: new Date("2010-01-01"),
     end: new Date("2021-03-20")
@@ -5,19 +5,8 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from mplfinance.original_flavor import candlestick_ohlc
 
-def compute_rsi(series, period=14):
-    """Compute RSI given a price series."""
-    delta = series.diff()
-    gain  = delta.clip(lower=0)
-    loss  = -delta.clip(upper=0)
-    # first simple average
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
-    # then Wilder’s smoothing
-    avg_gain = avg_gain.shift(1).ewm(alpha=1/period, adjust=False).mean()
-    avg_loss = avg_loss.shift(1).ewm(alpha=1/period, adjust=False).mean()
-    rs  = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+from helpers.indicators import compute_rsi
+
 
 def main():
     # 1. Load CSV, handle thousands separators
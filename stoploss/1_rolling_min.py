@@ -1,14 +1,12 @@
 #!/usr/bin/env python3
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
-def compute_atr(df, period=14):
-    """Compute the Average True Range (ATR)."""
-    high_low = df['High'] - df['Low']
-    high_prev_close = (df['High'] - df['Close'].shift(1)).abs()
-    low_prev_close  = (df['Low']  - df['Close'].shift(1)).abs()
-    true_range = pd.concat([high_low, high_prev_close, low_prev_close], axis=1).max(axis=1)
-    return true_range.rolling(window=period).mean()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_atr
 
 def find_breakouts(df, lookback=20):
     """
@@ -38,7 +36,7 @@ def compute_stop_levels(df,
     """
     df = df.copy()
     # 1. ATR
-    df['ATR'] = compute_atr(df, period=atr_period)
+    df['ATR'] = compute_atr(df, atr_period, min_periods=atr_period)
 
     # 2. Breakout signals
     df['Breakout'] = find_breakouts(df, lookback=breakout_lookback)
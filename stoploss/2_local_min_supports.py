@@ -1,24 +1,27 @@
 #!/usr/bin/env python3
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
-def compute_atr(df, period=14):
-    high_low = df['High'] - df['Low']
-    high_prev = (df['High'] - df['Close'].shift(1)).abs()
-    low_prev  = (df['Low']  - df['Close'].shift(1)).abs()
-    tr = pd.concat([high_low, high_prev, low_prev], axis=1).max(axis=1)
-    return tr.rolling(window=period).mean()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_atr
+from helpers.timeindex import TimeIndex
 
 def find_breakouts(df, lookback=20):
     rolling_max = df['High'].shift(1).rolling(window=lookback).max()
     return df['Close'] > rolling_max
 
-def find_local_minima(series, order=2):
-    """Return a boolean series marking local minima over ±order bars."""
-    is_min = pd.Series(True, index=series.index)
+def find_local_minima(values, order=2):
+    """Return a boolean mask marking strict local minima over ±order bars."""
+    v = np.asarray(values, dtype=float)
+    is_min = np.ones(len(v), dtype=bool)
     for i in range(1, order+1):
-        is_min &= series < series.shift(i)
-        is_min &= series < series.shift(-i)
+        is_min[:i] = False
+        is_min[len(v)-i:] = False
+        is_min[i:] &= v[i:] < v[:-i]
+        is_min[:-i] &= v[:-i] < v[i:]
     return is_min
 
 def cluster_minima(values, tol_abs):
@@ -47,20 +50,20 @@ def compute_stop_levels_localmin(
     atr_period=14
 ):
     df = df.copy()
-    df['ATR'] = compute_atr(df, period=atr_period)
+    df['ATR'] = compute_atr(df, atr_period, min_periods=atr_period)
     df['Breakout'] = find_breakouts(df, lookback=breakout_lookback)
 
+    ti = TimeIndex.from_frame(df, ['Low'])
     records = []
     for date in df.index[df['Breakout']]:
         close = df.at[date, 'Close']
         atr   = df.at[date, 'ATR']
-        # window for support search
-        window = df.loc[:date].iloc[-support_window-1:-1]
-        minima_mask = find_local_minima(window['Low'], order=local_order)
-        minima_vals = window.loc[minima_mask, 'Low'].tolist()
+        # window for support search (a view of the Low column)
+        lows = ti.before(date, support_window, 'Low')
+        minima_vals = lows[find_local_minima(lows, order=local_order)].tolist()
         # fallback to simple rolling min if none found
         if not minima_vals:
-            support = window['Low'].min()
+            support = lows.min() if len(lows) else np.nan
             zmin = zmax = support
         else:
             tol_abs = tol_pct * close
@@ -1,27 +1,15 @@
 #!/usr/bin/env python3
 import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 
-def compute_atr(df, period=14):
-    df = df.copy()
-    df['H-L']  = df['High'] - df['Low']
-    df['H-PC'] = (df['High'] - df['Close'].shift(1)).abs()
-    df['L-PC'] = (df['Low']  - df['Close'].shift(1)).abs()
-    tr = df[['H-L','H-PC','L-PC']].max(axis=1)
-    return tr.rolling(window=period, min_periods=1).mean()
-
-def load_data(path):
-    df = pd.read_csv(path, thousands=',')
-    df.columns = df.columns.str.strip()
-    df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%Y')
-    df.set_index('Date', inplace=True)
-    df.rename(columns={
-        'Open Price':  'Open',
-        'High Price':  'High',
-        'Low Price':   'Low',
-        'Close Price': 'Close'
-    }, inplace=True)
-    return df
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_atr
+from helpers.nse_store import load_data
+
+FIELDS = ['High', 'Low', 'Close']
 
 def main():
     p = argparse.ArgumentParser(description="Compute ATR-based stop loss for TCS.")
@@ -30,7 +18,7 @@ def main():
     p.add_argument('--multiplier',  type=float, default=2.0,  help="ATR multiplier (e.g. 1.5 or 2.0)")
     args = p.parse_args()
 
-    df = load_data('scrip.csv')
+    df = load_data('scrip.csv', fields=FIELDS)
     df['ATR'] = compute_atr(df, period=14)
 
     entry_date  = pd.to_datetime(args.entry_date)
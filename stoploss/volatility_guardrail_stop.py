@@ -1,16 +1,11 @@
 #!/usr/bin/env python3
+import sys
+from pathlib import Path
+
 import pandas as pd
 
-def compute_atr(df, period=14):
-    """
-    Compute the Average True Range (ATR) over the given period.
-    """
-    high_low = df['High'] - df['Low']
-    high_prev_close = (df['High'] - df['Close'].shift(1)).abs()
-    low_prev_close  = (df['Low'] - df['Close'].shift(1)).abs()
-    tr = pd.concat([high_low, high_prev_close, low_prev_close], axis=1).max(axis=1)
-    atr = tr.rolling(window=period, min_periods=1).mean()
-    return atr
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import compute_atr
 
 def main():
     # 1. Load and prepare data
@@ -1,6 +1,6 @@
-import pandas as pd
 import backtrader as bt
 from backtrader.feeds import PandasData
+from helpers.nse_csv import read_nse_csv
 
 class RealisticBacktestStrategy(bt.Strategy):
     params = (
@@ -43,20 +43,15 @@ if __name__ == '__main__':
     cerebro = bt.Cerebro()
     
     # Load your specific data format
-    data = pd.read_csv('scrip.csv', parse_dates=['Date  '], index_col='Date  ')
-    
-    # Clean and convert numeric columns (handling commas in Indian number format)
-    numeric_cols = ['Open Price  ', 'High Price  ', 'Low Price  ', 'Close Price  ', 'Total Traded Quantity  ']
-    for col in numeric_cols:
-        data[col] = data[col].astype(str).str.replace(',', '').astype(float)
+    data = read_nse_csv('scrip.csv').set_index('Date')
     
     # Rename columns to Backtrader's expected names
     data = data.rename(columns={
-        'Open Price  ': 'open',
-        'High Price  ': 'high',
-        'Low Price  ': 'low',
-        'Close Price  ': 'close',
-        'Total Traded Quantity  ': 'volume'
+        'Open': 'open',
+        'High': 'high',
+        'Low': 'low',
+        'Close': 'close',
+        'Volume': 'volume'
     })
     
     # Add data feed
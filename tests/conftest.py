@@ -0,0 +1,100 @@
+import http.server
+import json
+import threading
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from helpers import fetch
+
+
+class StubServer:
+    """
+    Local HTTP/1.1 server for the downloaders. Handlers are registered per
+    path prefix and called as handler(query, headers) -> JSON-able object,
+    bytes, or (status, body, extra headers). Every request is recorded.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.throttled = Counter()
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._serve(self)
+
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def route(self, prefix, handler):
+        self.routes[prefix] = handler
+
+    def throttle(self, prefix, times):
+        """Answer the next `times` requests under `prefix` with 429."""
+        self.throttled[prefix] += times
+
+    def hits(self, prefix):
+        return [r for r in self.requests if r[0].startswith(prefix)]
+
+    def _serve(self, req):
+        u = urlsplit(req.path)
+        query = {k: v[0] for k, v in parse_qs(u.query).items()}
+        prefix = max((p for p in self.routes if u.path.startswith(p)), key=len, default=None)
+        with self.lock:
+            self.requests.append((u.path, query))
+            limited = prefix is not None and self.throttled[prefix] > 0
+            if limited:
+                self.throttled[prefix] -= 1
+        if prefix is None:
+            out = (404, b'', {})
+        elif limited:
+            out = (429, b'slow down', {})
+        else:
+            out = self.routes[prefix](query, req.headers)
+        status, body, headers = out if isinstance(out, tuple) else (200, out, {})
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        req.send_response(status)
+        for k, v in headers.items():
+            req.send_header(k, v)
+        req.send_header('Content-Length', str(len(body)))
+        req.end_headers()
+        req.wfile.write(body)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """Retry without sleeping; records the attempt number of every backoff."""
+    calls = []
+
+    def delay(attempt, backoff):
+        calls.append(attempt)
+        return 0.0
+
+    monkeypatch.setattr(fetch, 'backoff_delay', delay)
+    return calls
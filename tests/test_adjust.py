@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from helpers.adjust import read_factors, set_actions
+from helpers.nse_store import append_rows
+
+
+def _rows(dates, close):
+    return pd.DataFrame({'Symbol': 'AAA', 'Series': 'EQ', 'Date': pd.to_datetime(dates),
+                         'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 10})
+
+
+def test_dividend_factor_follows_new_prices(tmp_path):
+    append_rows(_rows(['2024-01-10', '2024-01-11'], 100.0), tmp_path)
+    set_actions('AAA', pd.DataFrame({'Date': ['2024-01-10'], 'kind': ['dividend'], 'value': [5.0]}), tmp_path)
+    assert read_factors('AAA', tmp_path)['price_factor'].tolist() == [1.0]     # no prior close yet
+
+    append_rows(_rows(['2024-01-09'], 100.0), tmp_path)                     # backfilled day
+    assert read_factors('AAA', tmp_path)['price_factor'].tolist() == pytest.approx([0.95])
+
+
+def test_split_only_factors_ignore_prices(tmp_path):
+    append_rows(_rows(['2024-01-10'], 100.0), tmp_path)
+    set_actions('AAA', pd.DataFrame({'Date': ['2024-01-11'], 'kind': ['split'], 'value': [2.0]}), tmp_path)
+    append_rows(_rows(['2024-01-11'], 50.0), tmp_path)
+    f = read_factors('AAA', tmp_path)
+    assert f['price_factor'].tolist() == [0.5] and f['volume_factor'].tolist() == [2.0]
@@ -0,0 +1,70 @@
+import pandas as pd
+
+from helpers.fundamentals import harvest, load_fundamentals, statement
+
+SUMMARY = '/v10/finance/quoteSummary/INFY.NS'
+CHART = '/v8/finance/chart/INFY.NS'
+
+
+def _summary(query, headers):
+    assert query['crumb'] == 'abc' and query['modules'] == 'incomeStatementHistory'
+    rows = [{'maxAge': 1, 'endDate': {'raw': 1711843200, 'fmt': '2024-03-31'},
+             'totalRevenue': {'raw': 1.5e11, 'fmt': '150B'}, 'netIncome': {'raw': 2.6e10}},
+            {'maxAge': 1, 'endDate': {'raw': 1680220800}, 'totalRevenue': {'raw': 1.4e11}}]
+    return {'quoteSummary': {'result': [{'incomeStatementHistory': {'incomeStatementHistory': rows}}],
+                             'error': None}}
+
+
+def _splits(query, headers):
+    assert query['events'] == 'splits'
+    return {'chart': {'result': [{'events': {'splits': {
+        '1530000000': {'date': 1530000000, 'numerator': 2, 'denominator': 1, 'splitRatio': '2:1'}}}}]}}
+
+
+def _serve(stub):
+    stub.route('/v1/test/getcrumb', lambda q, h: b'abc')
+    stub.route(SUMMARY, _summary)
+    stub.route(CHART, _splits)
+
+
+def _harvest(stub, tmp_path, **kw):
+    return harvest(['INFY.NS'], ['income_stmt', 'splits'], workers=2, rate=0, root=tmp_path,
+                   cache_dir=tmp_path / 'cache', base_url=stub.url, cookie_url=None, **kw)
+
+
+def test_rows_written_to_table(stub, tmp_path):
+    _serve(stub)
+    _harvest(stub, tmp_path)
+    t = load_fundamentals(tmp_path)
+    income = statement(t, 'INFY.NS', 'income_stmt')
+    assert income.loc['totalRevenue'].to_dict() == {'2023-03-31': 1.4e11, '2024-03-31': 1.5e11}
+    assert income.loc['netIncome', '2024-03-31'] == 2.6e10
+    split = t[t['dataset'] == 'splits'].set_index('field')
+    assert split.loc['numerator', 'value'] == 2 and split.loc['splitRatio', 'text'] == '2:1'
+    assert (split['period'] == pd.Timestamp(1530000000, unit='s').strftime('%Y-%m-%d')).all()
+
+
+def test_429_is_retried_with_backoff(stub, tmp_path, backoffs):
+    _serve(stub)
+    stub.throttle(SUMMARY, 2)
+    rows = _harvest(stub, tmp_path)
+    assert set(rows['dataset']) == {'income_stmt', 'splits'}
+    assert len(stub.hits(SUMMARY)) == 3 and sorted(backoffs) == [0, 1]
+
+
+def test_cached_datasets_are_not_refetched(stub, tmp_path):
+    _serve(stub)
+    stub.route(CHART, lambda q, h: (404, b'', {}))
+    first = _harvest(stub, tmp_path)
+    assert set(first['dataset']) == {'income_stmt'}
+
+    _serve(stub)
+    stub.requests.clear()
+    second = _harvest(stub, tmp_path)
+    assert [r[0] for r in stub.hits('/v')] == ['/v1/test/getcrumb', CHART]
+    assert set(second['dataset']) == {'income_stmt', 'splits'}
+    assert set(load_fundamentals(tmp_path)['dataset']) == {'income_stmt', 'splits'}
+
+    stub.requests.clear()
+    _harvest(stub, tmp_path, force=True)
+    assert len(stub.hits(SUMMARY)) == 1 and len(stub.hits(CHART)) == 1
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.indicator_cache import INDICATORS, IndicatorCache
+
+
+def _frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({'High': close * 1.01, 'Low': close * 0.99, 'Close': close},
+                        index=pd.bdate_range('2020-01-01', periods=n, name='Date'))
+
+
+def test_miss_saves_no_state(tmp_path):
+    cache = IndicatorCache(tmp_path)
+    cache.get('AAA', _frame(50), 'rsi', n=14)
+    assert not list(tmp_path.glob('*.state'))
+
+
+@pytest.mark.parametrize('name, params', [('rsi', {'n': 14}), ('atr', {'n': 14, 'method': 'wilder'}),
+                                          ('macd', {})])
+def test_extend_matches_batch(tmp_path, name, params):
+    df = _frame(120)
+    cache = IndicatorCache(tmp_path)
+    for rows in (80, 100, 120):         # first extension warms, second restores
+        out = cache.get('AAA', df.iloc[:rows], name, **params)
+    spec = INDICATORS[name]
+    want = spec.batch(*(df[f].to_numpy() for f in spec.inputs or ('Close',)), **params)
+    np.testing.assert_allclose(np.stack(out) if isinstance(out, tuple) else out,
+                               np.stack(want) if isinstance(want, tuple) else want,
+                               rtol=1e-9, equal_nan=True)
+    assert len(list(tmp_path.glob('*.state'))) == 1
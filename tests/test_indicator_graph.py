@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import indicators as ind
+from helpers.indicator_graph import IndicatorGraph
+
+
+@pytest.fixture
+def graph():
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60)))
+    close[20] = np.nan
+    df = pd.DataFrame({'High': close * 1.01, 'Low': close * 0.99, 'Close': close},
+                      index=pd.bdate_range('2020-01-01', periods=60, name='Date'))
+    return IndicatorGraph(df)
+
+
+def test_true_range_is_kernel(graph):
+    want = ind.true_range(graph.inputs['High'], graph.inputs['Low'], graph.inputs['Close'])
+    np.testing.assert_array_equal(graph.true_range(), want)
+
+
+def test_results_are_read_only(graph):
+    tr = graph.true_range()
+    with pytest.raises(ValueError):
+        tr[0] = 0.0
+    assert not any(a.flags.writeable for a in graph.macd())
+    assert graph.atr(14) is graph.atr(14)
@@ -0,0 +1,350 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import indicators as ind
+from helpers import streaming
+
+
+def _walk(n=400, seed=0, flat=True):
+    rng = np.random.default_rng(seed)
+    x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    if flat:
+        x[50:70] = x[50]                # flat stretch: zero gains and losses
+    return x
+
+
+def _pandas_rsi(x, n, mean):
+    d = pd.Series(x).diff()
+    gain, loss = d.clip(lower=0), -d.clip(upper=0)
+    return (100 - 100 / (1 + mean(gain) / mean(loss))).to_numpy()
+
+
+def _panel(rows=3, n=400):
+    """[symbols x bars] walks; one symbol lists late and one has a missing stretch."""
+    p = np.stack([_walk(n, seed=s) for s in range(rows)])
+    p[1, :40] = np.nan
+    p[2, 200:205] = np.nan
+    return p
+
+
+def _hlc(close):
+    return close * 1.01, close * 0.99, close
+
+
+@pytest.mark.parametrize('n, min_periods', [(1, None), (5, None), (20, None), (20, 1), (20, 7)])
+def test_sma_matches_pandas(n, min_periods):
+    x = _panel()
+    want = pd.DataFrame(x.T).rolling(n, min_periods=min_periods).mean().to_numpy().T
+    np.testing.assert_allclose(ind.sma(x, n, min_periods), want, rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('span', [2, 12, 26, 200])
+def test_ema_matches_pandas(span):
+    x = _panel()
+    want = pd.DataFrame(x.T).ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy().T
+    np.testing.assert_allclose(ind.ema(x, span), want, rtol=1e-10, equal_nan=True)
+    want = pd.DataFrame(x.T).ewm(com=span - 1, adjust=False, ignore_na=True).mean().to_numpy().T
+    np.testing.assert_allclose(ind.ema_alpha(x, span), want, rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('n', [1, 5, 14])
+def test_shift_and_roc_match_pandas(n):
+    x = pd.DataFrame(_panel().T)
+    np.testing.assert_array_equal(ind.shift(x.to_numpy().T, n), x.shift(n).to_numpy().T)
+    np.testing.assert_allclose(ind.roc(x.to_numpy().T, n), (x.pct_change(n, fill_method=None) * 100).to_numpy().T,
+                               rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('n', [5, 14])
+def test_atr_sma_matches_pandas(n):
+    high, low, close = (pd.Series(a) for a in _hlc(_walk()))
+    pc = close.shift(1)
+    tr = pd.concat([high - low, (high - pc).abs(), (low - pc).abs()], axis=1).max(axis=1)
+    want = tr.rolling(n, min_periods=1).mean().to_numpy()
+    np.testing.assert_allclose(ind.atr(high, low, close, n), want, rtol=1e-10)
+
+
+def _pine_rma(s, n):
+    """Pine's ta.rma: the n-bar SMA on the first full window, then alpha = 1/n."""
+    out, prev = np.full(len(s), np.nan), np.nan
+    seed = s.rolling(n).mean().to_numpy()
+    for i, v in enumerate(s.to_numpy()):
+        prev = seed[i] if np.isnan(prev) else v / n + (1 - 1 / n) * prev
+        out[i] = prev
+    return out
+
+
+@pytest.mark.parametrize('n', [5, 14])
+def test_atr_wilder_matches_tradingview(n):
+    high, low, close = (pd.Series(a) for a in _hlc(_walk()))
+    pc = close.shift(1)
+    tr = pd.concat([high - low, (high - pc).abs(), (low - pc).abs()], axis=1).max(axis=1)
+    np.testing.assert_allclose(ind.atr(high, low, close, n, method='wilder'), _pine_rma(tr, n),
+                               rtol=1e-10, equal_nan=True)
+
+
+def test_macd_matches_pandas():
+    c = pd.Series(_walk())
+    line = c.ewm(span=12, adjust=False).mean() - c.ewm(span=26, adjust=False).mean()
+    sig = line.ewm(span=9, adjust=False).mean()
+    for got, want in zip(ind.macd(c.to_numpy()), (line, sig, line - sig)):
+        np.testing.assert_allclose(got, want.to_numpy(), rtol=1e-10)
+
+
+def test_stochastic_matches_pandas():
+    high, low, close = (pd.Series(a) for a in _hlc(_walk()))
+    hh, ll = high.rolling(14, min_periods=1).max(), low.rolling(14, min_periods=1).min()
+    k = (close - ll) / (hh - ll) * 100
+    got_k, got_d = ind.stochastic(high.to_numpy(), low.to_numpy(), close.to_numpy(), 14, 3)
+    np.testing.assert_allclose(got_k, k.to_numpy(), rtol=1e-10)
+    np.testing.assert_allclose(got_d, k.rolling(3, min_periods=1).mean().to_numpy(), rtol=1e-10)
+
+
+@pytest.mark.parametrize('kernel', [
+    lambda x: ind.sma(x, 20), lambda x: ind.ema(x, 20), lambda x: ind.rma(x, 14),
+    lambda x: ind.roc(x, 10), lambda x: ind.atr(*_hlc(x), 14, 'wilder'),
+    lambda x: ind.macd(x)[2], lambda x: ind.stochastic(*_hlc(x))[0],
+])
+def test_panel_rows_match_single_symbol(kernel):
+    x = _panel()
+    out = kernel(x)
+    for s in range(len(x)):
+        np.testing.assert_allclose(out[s], kernel(x[s]), rtol=1e-12, equal_nan=True)
+    out32 = kernel(x.astype(np.float32))
+    assert out32.dtype == np.float32
+    np.testing.assert_allclose(out32, out, rtol=1e-4, atol=1e-3, equal_nan=True)
+
+
+@pytest.mark.parametrize('min_periods', [None, 1, 10])
+def test_sma_grid_matches_sma(min_periods):
+    x = _panel()
+    windows = [1, 2, 5, 20, 50, 200, 500]
+    grid = ind.sma_grid(x, windows, min_periods)
+    assert grid.shape == (len(windows),) + x.shape and grid.flags.c_contiguous
+    for i, n in enumerate(windows):
+        np.testing.assert_allclose(grid[i], ind.sma(x, n, min_periods), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(ind.sma_grid(x[0], windows, min_periods)[3], ind.sma(x[0], 20, min_periods),
+                               rtol=1e-12, equal_nan=True)
+    assert ind.sma_grid(x.astype(np.float32), windows).dtype == np.float32
+
+
+def test_ema_grid_matches_ema():
+    x = _panel()
+    spans = [2, 5, 12, 26, 50, 200]
+    grid = ind.ema_grid(x, spans)
+    assert grid.shape == (len(spans),) + x.shape
+    for i, span in enumerate(spans):
+        np.testing.assert_allclose(grid[i], ind.ema(x, span), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(ind.ema_grid(x[0], spans)[2], ind.ema(x[0], 12), rtol=1e-12, equal_nan=True)
+    assert ind.ema_grid(x.astype(np.float32), spans).dtype == np.float32
+
+
+LOOKBACKS = [1, 2, 3, 5, 10, 20, 55, 252, 500]
+
+
+@pytest.mark.parametrize('how', ['max', 'min'])
+@pytest.mark.parametrize('min_periods', [1, 10])
+def test_rolling_extremes_match_pandas(how, min_periods):
+    x = np.round(_panel(), 0)            # rounded: plenty of ties
+    got = ind.rolling_extremes(x, LOOKBACKS, how, min_periods)
+    frame = pd.DataFrame(x.T)
+    for j, n in enumerate(LOOKBACKS):
+        if min_periods > n:
+            assert np.isnan(got[j]).all()
+            continue
+        want = getattr(frame.rolling(n, min_periods=min_periods), how)().to_numpy().T
+        np.testing.assert_array_equal(got[j], want)
+    single = ind.rolling_max if how == 'max' else ind.rolling_min
+    np.testing.assert_array_equal(single(x[0], 20, min_periods), got[LOOKBACKS.index(20), 0])
+
+
+@pytest.mark.parametrize('how', ['max', 'min'])
+def test_rolling_extremes_index_is_earliest_extreme(how):
+    x = np.round(_panel(n=120), 0)
+    vals, idx = ind.rolling_extremes(x, [1, 7, 20], how, min_periods=3, index=True)
+    arg = np.nanargmax if how == 'max' else np.nanargmin
+    for j, n in enumerate([1, 7, 20]):
+        for s in range(len(x)):
+            for t in range(x.shape[1]):
+                lo = max(0, t - n + 1)
+                w = x[s, lo:t + 1]
+                if (~np.isnan(w)).sum() < 3:
+                    assert idx[j, s, t] == -1 and np.isnan(vals[j, s, t])
+                    continue
+                assert idx[j, s, t] == lo + arg(w)
+                assert x[s, idx[j, s, t]] == vals[j, s, t]
+
+
+def test_rolling_extremes_float32_is_exact():
+    x = _panel().astype(np.float32)
+    got = ind.rolling_extremes(x, [5, 20], 'max')
+    assert got.dtype == np.float32
+    np.testing.assert_array_equal(got[1], pd.DataFrame(x.T).rolling(20, min_periods=1).max().to_numpy().T)
+
+
+def test_donchian_excludes_today():
+    high, low, _ = _hlc(_panel())
+    upper, lower = ind.donchian(high, low, [10, 20])
+    for j, n in enumerate([10, 20]):
+        np.testing.assert_array_equal(upper[j], pd.DataFrame(high.T).shift(1).rolling(n, min_periods=1).max().to_numpy().T)
+        np.testing.assert_array_equal(lower[j], pd.DataFrame(low.T).shift(1).rolling(n, min_periods=1).min().to_numpy().T)
+
+
+@pytest.mark.parametrize('n, min_periods', [(1, 1), (5, 1), (20, 1), (20, 20), (60, 10)])
+@pytest.mark.parametrize('q', [0.0, 0.1, 0.25, 0.5, 0.9, 1.0])
+def test_rolling_quantile_matches_pandas(n, min_periods, q):
+    x = _panel()
+    want = pd.DataFrame(x.T).rolling(n, min_periods=min_periods).quantile(q).to_numpy().T
+    np.testing.assert_allclose(ind.rolling_quantile(x, n, q, min_periods), want, rtol=1e-12, equal_nan=True)
+
+
+def test_rolling_quantile_many_q_share_one_sort():
+    x = _panel()
+    qs = [0.1, 0.5, 0.9]
+    got = ind.rolling_quantile(x, 20, qs)
+    assert got.shape == (len(qs),) + x.shape
+    for j, q in enumerate(qs):
+        np.testing.assert_array_equal(got[j], ind.rolling_quantile(x, 20, q))
+    assert ind.rolling_quantile(x[0], 20, qs).shape == (len(qs), x.shape[1])
+    with pytest.raises(ValueError):
+        ind.rolling_quantile(x, 20, 1.5)
+
+
+def _run_backtrader(close, make):
+    """Lines of the indicators make(bt, data) builds, run bar by bar and in runonce mode."""
+    bt = pytest.importorskip('backtrader')
+    df = pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close, 'volume': 0.0},
+                      index=pd.bdate_range('2015-01-01', periods=len(close)))
+    runs = []
+    for runonce in (False, True):
+        class Probe(bt.Strategy):
+            def __init__(self):
+                self.lines_ = make(bt, self.data.close)
+
+        cerebro = bt.Cerebro(stdstats=False)
+        cerebro.adddata(bt.feeds.PandasData(dataname=df))
+        cerebro.addstrategy(Probe)
+        strat = cerebro.run(runonce=runonce)[0]
+        runs.append(np.stack([np.asarray(line.array) for line in strat.lines_]))
+    return runs
+
+
+def _bt_vidya(bt, data, period, vol_period):
+    """The per-bar bt.Indicator trend-following/adapative_ema_vidya.py used to run."""
+    class Vidya(bt.Indicator):
+        lines = ('vidya',)
+        params = dict(period=20, vol_period=10)
+
+        def __init__(self):
+            self.vol = bt.ind.StdDev(self.data, period=self.p.vol_period)
+            self.avol = bt.ind.SMA(self.vol, period=self.p.vol_period)
+            self.kc = 2.0 / (self.p.period + 1)
+
+        def next(self):
+            if np.isnan(self.l.vidya[-1]):
+                self.l.vidya[0] = self.data[0]
+                return
+            ratio = (self.vol[0] / self.avol[0]) if self.avol[0] else 0
+            alpha = max(0.0, min(1.0, ratio * self.kc))
+            self.l.vidya[0] = alpha * self.data[0] + (1 - alpha) * self.l.vidya[-1]
+
+    return Vidya(data, period=period, vol_period=vol_period).vidya
+
+
+@pytest.mark.parametrize('period, vol_period', [(20, 10), (9, 5), (50, 20)])
+def test_vidya_matches_backtrader(period, vol_period):
+    x = _walk()
+    for ref in _run_backtrader(x, lambda bt, d: [_bt_vidya(bt, d, period, vol_period)]):
+        np.testing.assert_allclose(ind.vidya(x, period, vol_period), ref[0], rtol=1e-8, equal_nan=True)
+
+
+def test_vidya_panel_and_gaps():
+    x = _panel()
+    out = ind.vidya(x, 20, 10)
+    for s in range(len(x)):
+        np.testing.assert_allclose(out[s], ind.vidya(x[s], 20, 10), rtol=1e-12, equal_nan=True)
+    gap = np.isnan(x[2])
+    held = np.flatnonzero(gap)
+    np.testing.assert_array_equal(out[2, held], out[2, held[0] - 1])      # NaN bars hold the value
+
+
+KAMA_PARAMS = [(10, 2, 30), (20, 2, 30), (10, 3, 40), (5, 2, 20)]
+
+
+def test_kama_matches_backtrader():
+    x = _walk(flat=False)               # backtrader's ER divides by zero on a flat window
+    make = lambda bt, d: [bt.ind.KAMA(d, period=n, fast=f, slow=sl).kama for n, f, sl in KAMA_PARAMS]
+    for ref in _run_backtrader(x, make):
+        np.testing.assert_allclose(ind.kama_grid(x, KAMA_PARAMS), ref, rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('n', [1, 5, 10])
+def test_efficiency_ratio_matches_pandas(n):
+    c = pd.DataFrame(_panel().T)
+    direction, noise = c.diff(n).abs(), c.diff().abs().rolling(n).sum()
+    want = (direction / noise).mask(noise == 0, 0.0).where(direction.notna() & noise.notna())
+    got = ind.efficiency_ratio(c.to_numpy().T, n)
+    np.testing.assert_allclose(got, want.to_numpy().T, rtol=1e-10, equal_nan=True)
+
+
+def test_kama_grid_matches_kama():
+    x = _panel()
+    grid = ind.kama_grid(x, KAMA_PARAMS)
+    assert grid.shape == (len(KAMA_PARAMS),) + x.shape
+    for j, p in enumerate(KAMA_PARAMS):
+        np.testing.assert_array_equal(grid[j], ind.kama(x, *p))
+        for s in range(len(x)):
+            np.testing.assert_allclose(grid[j, s], ind.kama(x[s], *p), rtol=1e-12, equal_nan=True)
+    assert ind.kama_grid(x.astype(np.float32), KAMA_PARAMS).dtype == np.float32
+
+
+PANDAS_RSI = {
+    'cutler': lambda x, n: _pandas_rsi(x, n, lambda s: s.rolling(n, min_periods=n).mean()),
+    'sma':    lambda x, n: _pandas_rsi(x, n, lambda s: s.rolling(n, min_periods=n).mean()),
+    'ema':    lambda x, n: _pandas_rsi(x, n, lambda s: s.ewm(com=n - 1, adjust=False).mean()),
+}
+
+
+@pytest.mark.parametrize('n', [2, 5, 14, 30])
+def test_rsi_wilder_matches_talib(n):
+    talib = pytest.importorskip('talib')
+    x = _walk()
+    np.testing.assert_allclose(ind.rsi(x, n, 'wilder'), talib.RSI(x, n), atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('method', sorted(PANDAS_RSI))
+@pytest.mark.parametrize('n', [2, 5, 14, 30])
+def test_rsi_matches_pandas(method, n):
+    x = _walk()
+    np.testing.assert_allclose(ind.rsi(x, n, method), PANDAS_RSI[method](x, n), atol=1e-9, equal_nan=True)
+
+
+def test_rsi_tradingview_is_wilder_with_100_on_zero_loss():
+    x = np.r_[np.full(20, 5.0), np.arange(5.0, 25.0)]
+    wilder, tv = ind.rsi(x, 5, 'wilder'), ind.rsi(x, 5, 'tradingview')
+    assert wilder[5] == 0.0 and tv[5] == 100.0 and tv[-1] == 100.0
+    np.testing.assert_array_equal(np.isnan(wilder), np.isnan(tv))
+
+
+@pytest.mark.parametrize('method', ind.RSI_METHODS)
+def test_rsi_grid_matches_rsi(method):
+    panel = np.stack([_walk(seed=s) for s in range(3)])
+    panel[1, 100:105] = np.nan
+    periods = [3, 14, 21]
+    grid = ind.rsi_grid(panel, periods, method)
+    assert grid.shape == (len(periods),) + panel.shape
+    for i, n in enumerate(periods):
+        for s in range(len(panel)):
+            np.testing.assert_allclose(grid[i, s], ind.rsi(panel[s], n, method), atol=1e-9, equal_nan=True)
+    assert ind.rsi_grid(panel.astype(np.float32), periods, method).dtype == np.float32
+
+
+@pytest.mark.parametrize('method', ind.RSI_METHODS)
+def test_streaming_rsi_matches_batch(method):
+    panel = np.stack([_walk(seed=s) for s in range(3)])
+    want = ind.rsi(panel, 14, method)
+    snap = streaming.RSI(14, method).warm(panel[:, :300]).snapshot()
+    live = streaming.RSI(14, method).restore(snap)
+    tail = np.stack([live.update(panel[:, t]) for t in range(300, panel.shape[1])], axis=1)
+    np.testing.assert_allclose(tail, want[:, 300:], atol=1e-9, equal_nan=True)
@@ -0,0 +1,28 @@
+import os
+
+from helpers import load_cache
+from helpers.load_cache import LoadCache
+
+CSV = os.path.join(os.path.dirname(__file__), '..', 'scrip.csv')
+
+
+def test_hit_returns_same_frame(tmp_path):
+    cache = LoadCache(tmp_path)
+    first = cache.get(CSV)
+    again = LoadCache(tmp_path).get(CSV, columns=['Date', 'Close'])
+    assert again.equals(first[['Date', 'Close']])
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_version_bump_misses(tmp_path, monkeypatch):
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return load_cache.read_nse_csv(path)
+
+    LoadCache(tmp_path).get(CSV, loader=loader)
+    LoadCache(tmp_path).get(CSV, loader=loader)
+    monkeypatch.setattr(load_cache, 'VERSION', load_cache.VERSION + 1)
+    LoadCache(tmp_path).get(CSV, loader=loader)
+    assert len(calls) == 2
@@ -0,0 +1,65 @@
+import json
+
+import pandas as pd
+
+from helpers.nse_client import HISTORY_PATH, SEED_PATH, backfill, date_chunks
+from helpers.nse_store import load_symbol
+
+START, END = '2024-01-01', '2024-03-31'
+
+
+def _history(query, headers):
+    if 'nsit=abc' not in (headers.get('Cookie') or ''):
+        return 401, b'', {}
+    days = pd.bdate_range(pd.to_datetime(query['from'], format='%d-%m-%Y'),
+                          pd.to_datetime(query['to'], format='%d-%m-%Y'))
+    data = [{'CH_SYMBOL': query['symbol'], 'CH_SERIES': 'EQ', 'CH_TIMESTAMP': d.strftime('%Y-%m-%dT00:00:00'),
+             'CH_OPENING_PRICE': d.day, 'CH_TRADE_HIGH_PRICE': d.day, 'CH_TRADE_LOW_PRICE': d.day,
+             'CH_CLOSING_PRICE': d.day + 0.5, 'CH_TOT_TRADED_QTY': 1000, 'CH_TOT_TRADED_VAL': 123456.5}
+            for d in reversed(days)]           # NSE lists newest first
+    return {'data': data}
+
+
+def _serve(stub):
+    stub.route(SEED_PATH, lambda q, h: (200, b'ok', {'Set-Cookie': 'nsit=abc; Path=/'}))
+    stub.route(HISTORY_PATH, _history)
+
+
+def _run(stub, tmp_path, symbols, **kw):
+    return backfill(symbols, START, END, chunk_days=30, workers=3, root=tmp_path,
+                    base_url=stub.url, rate=0, progress=tmp_path / 'progress.json', **kw)
+
+
+def test_chunks_written_in_date_order(stub, tmp_path):
+    _serve(stub)
+    assert _run(stub, tmp_path, ['TRENT']) == {'ok': {'TRENT': 65}, 'failed': {}}
+    assert len(stub.hits(HISTORY_PATH)) == len(date_chunks(START, END, 30)) == 4
+    df = load_symbol('TRENT', tmp_path)
+    assert list(df.index) == list(pd.bdate_range(START, END))
+    assert df['Close'].tolist() == [d.day + 0.5 for d in df.index]
+    assert df['Turnover'].iloc[0] == 123456.5
+
+
+def test_429_is_retried_with_backoff(stub, tmp_path, backoffs):
+    _serve(stub)
+    stub.throttle(HISTORY_PATH, 2)
+    assert _run(stub, tmp_path, ['TRENT'])['ok'] == {'TRENT': 65}
+    assert len(stub.hits(HISTORY_PATH)) == 4 + 2 and len(backoffs) == 2
+    assert len(load_symbol('TRENT', tmp_path)) == 65
+
+
+def test_resume_from_progress(stub, tmp_path):
+    _serve(stub)
+    stub.route(HISTORY_PATH, lambda q, h: (404, b'', {}) if q['symbol'] == 'TCS' else _history(q, h))
+    first = _run(stub, tmp_path, ['TRENT', 'TCS'])
+    assert first['ok'] == {'TRENT': 65} and '404' in first['failed']['TCS']
+    assert not list((tmp_path).glob('symbol=TCS'))
+    state = json.loads((tmp_path / 'progress.json').read_text())
+    assert state['done'] == ['TRENT'] and 'TCS' in state['failed']
+
+    _serve(stub)
+    stub.requests.clear()
+    assert _run(stub, tmp_path, ['TRENT', 'TCS'])['ok'] == {'TCS': 65}
+    assert {q['symbol'] for _, q in stub.hits(HISTORY_PATH)} == {'TCS'}
+    assert json.loads((tmp_path / 'progress.json').read_text()) == {'done': ['TCS', 'TRENT'], 'failed': {}}
+    assert len(load_symbol('TCS', tmp_path)) == 65
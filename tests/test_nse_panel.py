@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from helpers.nse_panel import QTY_MISSING, build_panel
+from helpers.nse_store import append_rows
+
+
+def _rows(series, dates, close, **extra):
+    return pd.DataFrame({'Symbol': 'AAA', 'Series': series, 'Date': pd.to_datetime(dates),
+                         'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 10, **extra})
+
+
+def test_missing_turnover_is_qty_missing(tmp_path):
+    append_rows(_rows('EQ', ['2024-01-01'], 100.0, Turnover=1000.0), tmp_path)
+    append_rows(_rows('EQ', ['2024-01-02'], 101.0), tmp_path)        # no Turnover, as from Yahoo
+    p = build_panel(tmp_path)
+    assert p.field('Turnover')[0].tolist() == [100000, QTY_MISSING]
+
+
+def test_series_none_keeps_one_row_per_day(tmp_path):
+    append_rows(pd.concat([_rows('EQ', ['2024-01-01', '2024-01-02'], 100.0),
+                           _rows('BL', ['2024-01-02'], 500.0),
+                           _rows('BL', ['2024-01-03'], 600.0)]), tmp_path)
+    p = build_panel(tmp_path, series=None)
+    assert np.array_equal(p.field('Close')[0], [100.0, 100.0, 600.0])
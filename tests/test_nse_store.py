@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from helpers.nse_store import append_rows, list_parts, load_symbol
+
+
+def _rows(symbol, dates, close=100.0):
+    return pd.DataFrame({'Symbol': symbol, 'Series': 'EQ', 'Date': pd.to_datetime(dates),
+                         'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 10})
+
+
+def _snapshot(root, symbols):
+    return {p: p.read_bytes() for s in symbols for p in list_parts(s, root)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    append_rows(_rows('AAA', ['2024-01-01', '2024-01-02']), tmp_path)
+    append_rows(_rows('AAA', ['2024-01-04', '2024-01-05']), tmp_path)
+    append_rows(_rows('BBB', ['2024-01-02']), tmp_path)
+    return tmp_path
+
+
+def test_reject_in_later_part_writes_nothing(store):
+    before = _snapshot(store, ['AAA', 'BBB'])
+    # a new key inside AAA's first part, then a clash in its second
+    new = pd.concat([_rows('AAA', ['2024-01-02'], 1.0).assign(Series='BL'),
+                     _rows('AAA', ['2024-01-05'], 1.0)])
+    with pytest.raises(ValueError):
+        append_rows(new, store, on_duplicate='reject')
+    assert _snapshot(store, ['AAA', 'BBB']) == before
+
+
+def test_reject_in_later_symbol_writes_nothing(store):
+    before = _snapshot(store, ['AAA', 'BBB'])
+    new = pd.concat([_rows('AAA', ['2024-01-08'], 1.0), _rows('BBB', ['2024-01-02'], 1.0)])
+    with pytest.raises(ValueError):
+        append_rows(new, store, on_duplicate='reject')
+    assert _snapshot(store, ['AAA', 'BBB']) == before
+    assert len(list_parts('AAA', store)) == 2
+
+
+def test_replace_rewrites_covering_parts(store):
+    append_rows(_rows('AAA', ['2024-01-02', '2024-01-05'], 1.0), store, on_duplicate='replace')
+    df = load_symbol('AAA', store)
+    assert df['Close'].tolist() == [100.0, 1.0, 100.0, 1.0]
+    assert len(list_parts('AAA', store)) == 2
+    assert not list(store.rglob('*.tmp'))
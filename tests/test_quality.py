@@ -0,0 +1,46 @@
+import pandas as pd
+
+from helpers.quality import scan
+
+
+def _rows(series, dates, closes):
+    return pd.DataFrame({'Symbol': 'TRENT', 'Series': series, 'Date': pd.to_datetime(dates),
+                         'Prev Close': closes, 'Open': closes, 'High': closes, 'Low': closes,
+                         'Close': closes, 'Volume': 100})
+
+
+def _interleaved():
+    """EQ every session with a BL print stored between two EQ rows."""
+    eq = _rows('EQ', ['2024-08-06', '2024-08-07', '2024-08-08', '2024-08-09'], [100.0, 101.0, 102.0, 103.0])
+    eq['Prev Close'] = [99.0, 100.0, 101.0, 102.0]
+    bl = _rows('BL', ['2024-08-07'], [500.0])
+    return pd.concat([eq.iloc[:2], bl, eq.iloc[2:]], ignore_index=True)
+
+
+def test_interleaved_series_clean():
+    assert scan(_interleaved()).empty
+
+
+def test_corrupt_row_after_other_series_is_flagged():
+    df = _interleaved()
+    row = df.index[(df['Series'] == 'EQ') & (df['Date'] == '2024-08-08')][0]
+    df.loc[row, ['Prev Close', 'Open', 'High']] = [151.5, 153.0, 153.0]
+    issues = scan(df)
+    assert set(issues['check']) == {'prev_close_mismatch', 'extreme_gap'}
+    assert (issues['Date'] == pd.Timestamp('2024-08-08')).all()
+
+
+def test_missing_day_after_other_series():
+    df = _interleaved()
+    df = df[~((df['Series'] == 'EQ') & (df['Date'] == '2024-08-08'))]
+    df.loc[df['Date'] == '2024-08-09', 'Prev Close'] = 101.0
+    issues = scan(df, calendar=pd.bdate_range('2024-08-06', '2024-08-09'))
+    assert issues[['Series', 'check', 'value']].values.tolist() == [['EQ', 'missing_days', 1.0]]
+
+
+def test_non_monotonic_uses_stored_order():
+    df = _interleaved()
+    eq = df[df['Series'] == 'EQ']
+    df = pd.concat([eq.iloc[[0, 2, 1, 3]], df[df['Series'] == 'BL']], ignore_index=True)
+    issues = scan(df)
+    assert issues[['Date', 'check']].values.tolist() == [[pd.Timestamp('2024-08-07'), 'non_monotonic']]
@@ -0,0 +1,83 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from helpers import indicators as ind
+from helpers import streaming
+
+
+def _panel(rows=3, n=300, seed=0):
+    """Close walks for several symbols: one lists late, one has a missing stretch."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (rows, n)), axis=1))
+    close[1, :40] = np.nan
+    close[2, 150:155] = np.nan
+    return close
+
+
+def _hlc(close):
+    return close * 1.01, close * 0.99, close
+
+
+CASES = {
+    'ema':        (lambda: streaming.EMA(12), lambda c: ind.ema(c, 12), False),
+    'ema_alpha':  (lambda: streaming.EMAAlpha(14), lambda c: ind.ema_alpha(c, 14), False),
+    'sma':        (lambda: streaming.SMA(20), lambda c: ind.sma(c, 20), False),
+    'sma_min1':   (lambda: streaming.SMA(20, 1), lambda c: ind.sma(c, 20, 1), False),
+    'rma':        (lambda: streaming.RMA(14), lambda c: ind.rma(c, 14), False),
+    'max':        (lambda: streaming.RollingMax(20), lambda c: ind.rolling_max(c, 20), False),
+    'min':        (lambda: streaming.RollingMin(20, 5), lambda c: ind.rolling_min(c, 20, 5), False),
+    'quantile':   (lambda: streaming.RollingQuantile(20, 0.25), lambda c: ind.rolling_quantile(c, 20, 0.25), False),
+    'rsi':        (lambda: streaming.RSI(14), lambda c: ind.rsi(c, 14), False),
+    'macd':       (lambda: streaming.MACD(), lambda c: ind.macd(c), False),
+    'vidya':      (lambda: streaming.VIDYA(20, 10), lambda c: ind.vidya(c, 20, 10), False),
+    'kama':       (lambda: streaming.KAMA(10, 2, 30), lambda c: ind.kama(c, 10, 2, 30), False),
+    'true_range': (lambda: streaming.TrueRange(), lambda c: ind.true_range(*_hlc(c)), True),
+    'atr':        (lambda: streaming.ATR(14), lambda c: ind.atr(*_hlc(c), 14), True),
+    'atr_wilder': (lambda: streaming.ATR(14, 'wilder'), lambda c: ind.atr(*_hlc(c), 14, 'wilder'), True),
+    'stochastic': (lambda: streaming.Stochastic(14, 3), lambda c: ind.stochastic(*_hlc(c), 14, 3), True),
+}
+
+
+def _stack(v):
+    return np.stack(v) if isinstance(v, tuple) else np.asarray(v)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_streaming_matches_batch(name):
+    make, batch, hlc = CASES[name]
+    close = _panel()
+    cols = _hlc(close) if hlc else (close,)
+    want = _stack(batch(close))
+
+    split = 200
+    first = make().warm(*(c[:, :split] for c in cols))
+    np.testing.assert_allclose(_stack(first.value), want[..., split - 1], rtol=1e-9, equal_nan=True)
+
+    state = pickle.loads(pickle.dumps(first.snapshot()))
+    resumed = make().restore(state)
+    tail = [_stack(resumed.update(*(c[:, t] for c in cols))) for t in range(split, close.shape[1])]
+    np.testing.assert_allclose(np.stack(tail, axis=-1), want[..., split:], rtol=1e-9, equal_nan=True)
+
+    # restoring is a copy: the original object carries on unaffected
+    np.testing.assert_allclose(_stack(first.update(*(c[:, split] for c in cols))), want[..., split],
+                               rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('name', ['sma', 'rsi', 'macd', 'stochastic'])
+def test_scalar_updates_match_batch(name):
+    make, batch, hlc = CASES[name]
+    close = _panel()[0]
+    cols = _hlc(close) if hlc else (close,)
+    live = make()
+    got = np.stack([_stack(live.update(*(c[t] for c in cols))) for t in range(len(close))], axis=-1)
+    np.testing.assert_allclose(got, _stack(batch(close)), rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('n, q, min_periods', [(5, 0.5, 1), (20, 0.1, 20), (20, 0.9, 5), (60, [0.25, 0.75], 1)])
+def test_rolling_quantile_stream(n, q, min_periods):
+    close = _panel()
+    live = streaming.RollingQuantile(n, q, min_periods)
+    got = np.stack([live.update(close[:, t]) for t in range(close.shape[1])], axis=-1)
+    np.testing.assert_allclose(got, ind.rolling_quantile(close, n, q, min_periods), rtol=1e-12, equal_nan=True)
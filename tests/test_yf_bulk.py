@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from helpers.nse_store import load_symbol
+from helpers.yf_bulk import download_universe
+
+DAYS = pd.bdate_range('2024-01-01', periods=5)
+IST = 19800
+
+
+def _chart(closes):
+    ts = [int((d + pd.Timedelta(hours=9, minutes=15)).timestamp()) - IST for d in DAYS]
+    quote = {'open': closes, 'high': closes, 'low': closes, 'close': closes, 'volume': [1000] * len(closes)}
+    return {'chart': {'result': [{'meta': {'gmtoffset': IST}, 'timestamp': ts,
+                                  'indicators': {'quote': [quote]}}], 'error': None}}
+
+
+CLOSES = {'TRENT': [100.0, 101.0, 102.0, 103.0, 104.0], 'TCS': [50.0, 51.0, 52.0, 53.0, 54.0]}
+
+
+def _serve(stub, symbols):
+    for s in symbols:
+        stub.route(f'/v8/finance/chart/{s}.NS', lambda q, h, s=s: _chart(CLOSES[s]))
+
+
+def _run(stub, tmp_path, symbols, **kw):
+    return download_universe(symbols, root=tmp_path, base_url=stub.url, rate=0, workers=2, **kw)
+
+
+def test_rows_written_to_store(stub, tmp_path):
+    _serve(stub, CLOSES)
+    assert _run(stub, tmp_path, ['TRENT', 'TCS']) == {'ok': ['TCS', 'TRENT'], 'failed': {}}
+    for s, closes in CLOSES.items():
+        df = load_symbol(s, tmp_path)
+        assert list(df.index) == list(DAYS)
+        assert df['Close'].tolist() == closes
+        assert np.isnan(df['Prev Close'].iloc[0]) and df['Prev Close'].tolist()[1:] == closes[:-1]
+
+
+def test_429_is_retried_with_backoff(stub, tmp_path, backoffs):
+    _serve(stub, ['TRENT'])
+    stub.throttle('/v8/finance/chart/TRENT.NS', 2)
+    assert _run(stub, tmp_path, ['TRENT'])['ok'] == ['TRENT']
+    assert len(stub.hits('/v8/finance/chart/TRENT.NS')) == 3
+    assert backoffs == [0, 1]
+    assert load_symbol('TRENT', tmp_path)['Close'].tolist() == CLOSES['TRENT']
+
+
+def test_429_past_retries_fails_the_symbol(stub, tmp_path, backoffs):
+    _serve(stub, ['TRENT'])
+    stub.throttle('/v8/finance/chart/TRENT.NS', 10)
+    result = _run(stub, tmp_path, ['TRENT'], retries=2)
+    assert result['ok'] == [] and '429' in result['failed']['TRENT']
+    assert len(stub.hits('/v8/finance/chart/TRENT.NS')) == 3
+
+
+def test_resume_from_progress(stub, tmp_path):
+    _serve(stub, ['TRENT'])                 # TCS answers 404
+    progress = tmp_path / 'progress.json'
+    first = _run(stub, tmp_path, ['TRENT', 'TCS'], progress=progress)
+    assert first['ok'] == ['TRENT'] and '404' in first['failed']['TCS']
+    state = json.loads(progress.read_text())
+    assert state['done'] == ['TRENT'] and 'TCS' in state['failed']
+
+    _serve(stub, ['TCS'])
+    stub.requests.clear()
+    assert _run(stub, tmp_path, ['TRENT', 'TCS'], progress=progress)['ok'] == ['TCS']
+    assert [r[0] for r in stub.requests] == ['/v8/finance/chart/TCS.NS']
+    assert json.loads(progress.read_text()) == {'done': ['TCS', 'TRENT'], 'failed': {}}
+
+    stub.requests.clear()
+    assert _run(stub, tmp_path, ['TRENT', 'TCS'], progress=progress)['ok'] == []
+    assert stub.requests == []
@@ -1,17 +1,14 @@
 import backtrader as bt
 import pandas as pd
 import matplotlib.pyplot as plt
+import sys
+from pathlib import Path
 
-# 1) Load & preprocess CSV
-df = pd.read_csv('scrip.csv', dtype=str)
-df['Date  '] = pd.to_datetime(df['Date  '].str.strip(), format='%d-%b-%Y')
-df.set_index('Date  ', inplace=True)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.nse_csv import read_nse_csv
 
-for col in [
-    'Open Price  ', 'High Price  ', 'Low Price  ',
-    'Close Price  ', 'Total Traded Quantity  '
-]:
-    df[col] = df[col].str.replace(',', '').astype(float)
+# 1) Load & preprocess CSV
+df = read_nse_csv('scrip.csv').set_index('Date')
 
 
 # 2) Strategy: Fast EMA vs. Kaufman’s AMA (KAMA)
@@ -73,11 +70,11 @@ cerebro.addstrategy(AdaptiveEMACrossover)
 
 datafeed = bt.feeds.PandasData(
     dataname=df,
-    open='Open Price  ',
-    high='High Price  ',
-    low='Low Price  ',
-    close='Close Price  ',
-    volume='Total Traded Quantity  '
+    open='Open',
+    high='High',
+    low='Low',
+    close='Close',
+    volume='Volume'
 )
 cerebro.adddata(datafeed)
 cerebro.broker.setcash(100000)
@@ -105,7 +102,7 @@ print(f" Avg hold duration : {trades_df['hold_days'].mean():.0f} days")
 
 # 5) Plot price, EMA, KAMA & buy/sell markers
 plt.figure(figsize=(14,6))
-plt.plot(df.index, df['Close Price  '], label='Close Price')
+plt.plot(df.index, df['Close'], label='Close Price')
 plt.plot(df.index, strat.ema.array, label=f'EMA({strat.p.ema_period})')
 plt.plot(df.index, strat.kama.array,
          label=f'KAMA(er={strat.p.er_period},fast={strat.p.kama_fast_len},slow={strat.p.kama_slow_len})')
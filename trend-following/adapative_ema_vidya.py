@@ -1,39 +1,48 @@
 import backtrader as bt
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+import sys
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers import streaming
+from helpers.indicators import vidya
+from helpers.nse_csv import read_nse_csv
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 1) LOAD & CLEAN YOUR DATA
 # ──────────────────────────────────────────────────────────────────────────────
-df = pd.read_csv('scrip.csv', dtype=str)
-df['Date  '] = pd.to_datetime(df['Date  '].str.strip(), format='%d-%b-%Y')
-df.set_index('Date  ', inplace=True)
-
-for col in ['Open Price  ', 'High Price  ', 'Low Price  ',
-            'Close Price  ', 'Total Traded Quantity  ']:
-    df[col] = df[col].str.replace(',', '').astype(float)
+df = read_nse_csv('scrip.csv').set_index('Date')
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 2) CUSTOM VIDYA INDICATOR
 # ──────────────────────────────────────────────────────────────────────────────
 class VIDYA(bt.Indicator):
+    """
+    VIDYA from helpers.indicators.vidya(). In cerebro's default runonce
+    mode once() fills the whole line with one array call; bar-by-bar runs
+    (runonce=False, live feeds) go through the streaming form.
+    """
     lines = ('vidya',)
     params = dict(period=20, vol_period=10)
 
     def __init__(self):
-        self.vol   = bt.ind.StdDev(self.data, period=self.p.vol_period)
-        self.avol  = bt.ind.SMA(self.vol, period=self.p.vol_period)
-        self.kc    = 2.0 / (self.p.period + 1)
-        self.addminperiod(self.p.vol_period)
+        # first value once the SMA of the vol_period StdDev exists
+        self.addminperiod(2 * self.p.vol_period - 1)
+        self._stream = streaming.VIDYA(self.p.period, self.p.vol_period)
+
+    def prenext(self):
+        self._stream.update(self.data[0])
 
     def next(self):
-        if len(self) == 1:  # seed first value
-            self.l.vidya[0] = self.data[0]
-            return
-        ratio = (self.vol[0] / self.avol[0]) if self.avol[0] else 0
-        alpha = max(0.0, min(1.0, ratio * self.kc))
-        self.l.vidya[0] = alpha * self.data[0] + (1 - alpha) * self.l.vidya[-1]
+        self.l.vidya[0] = float(self._stream.update(self.data[0]))
+
+    def once(self, start, end):
+        out = vidya(np.asarray(self.data.array[:end]), self.p.period, self.p.vol_period)
+        self.l.vidya.array[start:end] = array('d', out[start:end])
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -83,11 +92,11 @@ cerebro.addstrategy(VidyaStrategy)
 
 data = bt.feeds.PandasData(
     dataname=df,
-    open='Open Price  ',
-    high='High Price  ',
-    low='Low Price  ',
-    close='Close Price  ',
-    volume='Total Traded Quantity  ',
+    open='Open',
+    high='High',
+    low='Low',
+    close='Close',
+    volume='Volume',
 )
 cerebro.adddata(data)
 cerebro.broker.setcash(100000)
@@ -135,7 +144,7 @@ print(f" Avg hold duration : {avg_hold:.0f} days")
 # 7) PLOT PRICE, EMA, VIDYA & SIGNALS
 # ──────────────────────────────────────────────────────────────────────────────
 plt.figure(figsize=(14,6))
-plt.plot(df.index, df['Close Price  '], label='Close Price')
+plt.plot(df.index, df['Close'], label='Close Price')
 plt.plot(df.index, strat.ema.array, label=f'EMA({strat.p.ema_period})')
 plt.plot(df.index, strat.vidya.vidya.array,
          label=f'VIDYA(period={strat.p.vidya_period},vol={strat.p.vol_period})')
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Universe-wide EMA / KAMA crossover screen on the daily panel.
+
+Same signal as adapative_ema_kama.py (fast EMA crossing Kaufman's KAMA),
+computed for every symbol and every (er_period, fast, slow) triple at
+once instead of one cerebro run per symbol and setting.
+
+    python trend-following/kama_crossover_scan.py
+    python trend-following/kama_crossover_scan.py --er 10 20 --fast 2 3 --slow 30 --days 3
+"""
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.indicators import ema, kama_grid
+from helpers.nse_panel import open_panel
+
+
+def scan(close, symbols, dates, ema_period, params, days):
+    """Crossovers within the last `days` bars, one row per (symbol, params)."""
+    e = ema(close, ema_period)
+    k = kama_grid(close, params)                    # [params x symbols x days]
+    above = np.where(np.isnan(k), np.nan, e > k)
+    cross = np.diff(above, axis=-1)[..., -days:]    # +1 up, -1 down
+    rows = []
+    for p, s, t in zip(*np.nonzero(np.nan_to_num(cross))):
+        pos = close.shape[1] - days + t
+        rows.append({'Symbol': symbols[s], 'Date': dates[pos],
+                     'er': params[p][0], 'fast': params[p][1], 'slow': params[p][2],
+                     'signal': 'buy' if cross[p, s, t] > 0 else 'sell',
+                     'Close': close[s, pos], 'EMA': e[s, pos], 'KAMA': k[p, s, pos]})
+    return pd.DataFrame(rows)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Scan the panel for EMA/KAMA crossovers")
+    ap.add_argument('--ema', type=int, default=20, help="Fast EMA period")
+    ap.add_argument('--er', type=int, nargs='+', default=[10], help="Efficiency ratio period(s)")
+    ap.add_argument('--fast', type=int, nargs='+', default=[2], help="KAMA fast constant(s)")
+    ap.add_argument('--slow', type=int, nargs='+', default=[30], help="KAMA slow constant(s)")
+    ap.add_argument('--days', type=int, default=1, help="Report crossovers in the last N bars")
+    ap.add_argument('--root', default=None, help="Store directory")
+    args = ap.parse_args()
+
+    panel = open_panel(args.root)
+    params = list(itertools.product(args.er, args.fast, args.slow))
+    hits = scan(panel.field('Close'), panel.symbols, panel.dates, args.ema, params, args.days)
+    if hits.empty:
+        print("No crossovers.")
+        return
+    print(hits.sort_values(['Date', 'signal', 'Symbol']).to_string(index=False, float_format='{:,.2f}'.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,14 @@
 import backtrader as bt
 import pandas as pd
 import matplotlib.pyplot as plt
+import sys
+from pathlib import Path
 
-# 1. Load & preprocess CSV
-df = pd.read_csv('scrip.csv', dtype=str)
-df['Date  '] = pd.to_datetime(df['Date  '].str.strip(), format='%d-%b-%Y')
-df.set_index('Date  ', inplace=True)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.nse_csv import read_nse_csv
 
-num_cols = [
-    'Prev Close  ', 'Open Price  ', 'High Price  ',
-    'Low Price  ',  'Last Price  ', 'Close Price  ',
-    'Average Price ', 'Total Traded Quantity  '
-]
-for col in num_cols:
-    df[col] = df[col].str.replace(',', '').astype(float)
+# 1. Load & preprocess CSV
+df = read_nse_csv('scrip.csv').set_index('Date')
 
 # 2. Strategy using notify_order
 class RocMomentum(bt.Strategy):
@@ -52,11 +47,11 @@ cerebro = bt.Cerebro()
 cerebro.addstrategy(RocMomentum, roc_period=20)
 data = bt.feeds.PandasData(
     dataname=df,
-    open='Open Price  ',
-    high='High Price  ',
-    low='Low Price  ',
-    close='Close Price  ',
-    volume='Total Traded Quantity  ',
+    open='Open',
+    high='High',
+    low='Low',
+    close='Close',
+    volume='Volume',
 )
 cerebro.adddata(data)
 cerebro.broker.setcash(100000)
@@ -87,16 +82,16 @@ print(f" Avg hold duration: {avg_hold:.0f} days")
 fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(12, 8))
 
 # Price & volume
-ax1.plot(df.index, df['Close Price  '], label='Close Price')
+ax1.plot(df.index, df['Close'], label='Close Price')
 ax1_t = ax1.twinx()
-ax1_t.bar(df.index, df['Total Traded Quantity  '], alpha=0.3)
+ax1_t.bar(df.index, df['Volume'], alpha=0.3)
 for _, r in trades_df.iterrows():
     ax1.plot(r['entry_date'], r['entry_price'], '^', color='green')
     ax1.plot(r['exit_date'],  r['exit_price'],  'v', color='red')
 ax1.set_title("Price & Volume with Buy/Sell Signals")
 
 # ROC
-roc = df['Close Price  '].pct_change(periods=20) * 100
+roc = df['Close'].pct_change(periods=20) * 100
 ax2.plot(df.index, roc, label='20-Day ROC')
 ax2.axhline(0, color='black', lw=0.5)
 ax2.set_title("20-Day Rate of Change (ROC)")
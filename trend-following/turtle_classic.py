@@ -1,15 +1,14 @@
 import backtrader as bt
 import pandas as pd
 import matplotlib.pyplot as plt
+import sys
+from pathlib import Path
 
-# 1) Load & clean data
-df = pd.read_csv('scrip.csv', dtype=str)
-df['Date  '] = pd.to_datetime(df['Date  '].str.strip(), format='%d-%b-%Y')
-df.set_index('Date  ', inplace=True)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.nse_csv import read_nse_csv
 
-for col in ['Open Price  ', 'High Price  ', 'Low Price  ',
-            'Close Price  ', 'Total Traded Quantity  ']:
-    df[col] = df[col].str.replace(',', '').astype(float)
+# 1) Load & clean data
+df = read_nse_csv('scrip.csv').set_index('Date')
 
 # 2) Long-only Turtle Strategy (20-day entry, 10-day exit)
 class LongTurtle(bt.Strategy):
@@ -66,11 +65,11 @@ cerebro.addstrategy(LongTurtle)
 
 data = bt.feeds.PandasData(
     dataname=df,
-    open='Open Price  ',
-    high='High Price  ',
-    low='Low Price  ',
-    close='Close Price  ',
-    volume='Total Traded Quantity  ',
+    open='Open',
+    high='High',
+    low='Low',
+    close='Close',
+    volume='Volume',
     openinterest=None
 )
 cerebro.adddata(data)
@@ -109,7 +108,7 @@ print(f" Avg hold duration : {avg_h:.0f} days")
 
 # 6) (Optional) plot close price with long entry/exit markers
 plt.figure(figsize=(12, 6))
-plt.plot(df.index, df['Close Price  '], label='Close Price')
+plt.plot(df.index, df['Close'], label='Close Price')
 for _, r in trades_df.iterrows():
     plt.scatter(r['entry_date'], r['entry_price'], marker='^', color='green', label='Entry')
     plt.scatter(r['exit_date'],  r['exit_price'],  marker='v', color='red',   label='Exit')
@@ -20,7 +20,7 @@ def download_nse_ohlcv_to_csv():
         # Download data
         print(f"Downloading {PERIOD} of {INTERVAL} data for {TICKER_SYMBOL}...")
         stock = yf.Ticker(full_ticker)
-        df = stock.history(period=PERIOD)
+        df = stock.history(period=PERIOD, interval=INTERVAL)
         
         if df.empty:
             print(f"No data found for {TICKER_SYMBOL}. Please check the ticker symbol.")